@@ -0,0 +1,42 @@
+-- ============================================================================
+-- Migration 014: Covering Index for Unassigned Orphan Devices
+-- ============================================================================
+-- Description: Partial covering index for the orphan device provisioning list
+-- Author: Smart Parking Platform Team
+-- Created: 2025-10-23
+-- Version: v5.8.1
+--
+-- Impact: Orphan listing becomes an index-only scan, minimal write overhead
+-- Estimated Time: < 1 minute (uses CONCURRENTLY to avoid blocking)
+-- Note: CONCURRENTLY cannot be used inside a transaction block
+-- ============================================================================
+
+-- ============================================================================
+-- 1. ORPHAN_DEVICES TABLE - Provisioning list (get_orphan_devices)
+-- ============================================================================
+
+-- Unassigned orphans, newest first, with every listed column in the index
+-- so the planner never has to visit the heap
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orphan_devices_unassigned_last_seen
+  ON orphan_devices(last_seen DESC)
+  INCLUDE (id, dev_eui, first_seen, uplink_count, last_rssi, last_snr, assigned_at)
+  WHERE assigned_to_space_id IS NULL;
+
+-- ============================================================================
+-- VERIFICATION QUERIES
+-- ============================================================================
+
+-- EXPLAIN ANALYZE
+-- SELECT id, dev_eui, first_seen, last_seen, uplink_count, last_rssi, last_snr
+-- FROM orphan_devices
+-- WHERE assigned_to_space_id IS NULL
+--   AND last_seen > NOW() - 24 * INTERVAL '1 hour'
+-- ORDER BY last_seen DESC;
+-- Expected: Index Only Scan using idx_orphan_devices_unassigned_last_seen
+
+-- ============================================================================
+-- POST-MIGRATION STATISTICS UPDATE
+-- ============================================================================
+
+-- Update table statistics (and the visibility map) for query planner
+VACUUM ANALYZE orphan_devices;
@@ -0,0 +1,62 @@
+-- ============================================================================
+-- Migration 016: Covering Indexes for Space Listing Filters
+-- ============================================================================
+-- Description: Partial covering indexes for get_spaces_with_devices filters
+-- Author: Smart Parking Platform Team
+-- Created: 2025-10-23
+-- Version: v5.8.2
+--
+-- Impact: Filtered space listings use index scans instead of seq scan + sort
+-- Estimated Time: < 5 minutes (uses CONCURRENTLY to avoid blocking)
+-- Note: CONCURRENTLY cannot be used inside a transaction block
+-- ============================================================================
+
+-- ============================================================================
+-- 1. SPACES TABLE - Listing filters (get_spaces_with_devices)
+-- ============================================================================
+
+-- Tenant + state (+ site) filters, with the listing's light columns included
+-- so the filter and the ORDER BY code, name keys come from the index alone.
+-- The full listing still reads the heap for metadata/GPS/timestamps.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_spaces_tenant_state_site
+  ON spaces(tenant_id, state, site_id)
+  INCLUDE (code, name, building, floor, zone, sensor_eui, display_eui)
+  WHERE deleted_at IS NULL;
+
+-- Building / floor dashboard filter
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_spaces_tenant_building_floor
+  ON spaces(tenant_id, building, floor)
+  WHERE deleted_at IS NULL;
+
+-- ============================================================================
+-- VERIFICATION QUERIES
+-- ============================================================================
+
+-- Through the app: src/queries.explain_query(db_pool, SPACES_WITH_DEVICES_SQL, params)
+-- The partial predicate only matches when include_deleted ($7) is a known
+-- false, i.e. under a custom plan; check plan_cache_mode if a generic plan
+-- is chosen after repeated executions.
+
+-- EXPLAIN ANALYZE
+-- SELECT code, name, building, floor, zone, sensor_eui, display_eui
+-- FROM spaces
+-- WHERE tenant_id = '00000000-0000-0000-0000-000000000000'
+--   AND state = 'FREE'
+--   AND deleted_at IS NULL
+-- ORDER BY code, name;
+-- Expected: Index Only Scan using idx_spaces_tenant_state_site
+
+-- EXPLAIN ANALYZE
+-- SELECT id, code, name
+-- FROM spaces
+-- WHERE tenant_id = '00000000-0000-0000-0000-000000000000'
+--   AND building = 'A' AND floor = '1'
+--   AND deleted_at IS NULL;
+-- Expected: Index Scan using idx_spaces_tenant_building_floor
+
+-- ============================================================================
+-- POST-MIGRATION STATISTICS UPDATE
+-- ============================================================================
+
+-- Update table statistics (and the visibility map) for query planner
+VACUUM ANALYZE spaces;
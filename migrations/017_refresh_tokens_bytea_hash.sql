@@ -0,0 +1,33 @@
+-- Migration 017: Store Refresh Token Hashes as Raw Bytes
+-- Description: token_hash becomes the raw 32-byte SHA-256 digest (BYTEA)
+--              instead of its 64-char hex encoding
+-- Date: 2025-10-23
+-- Related: src/refresh_token_service.py (hash_token)
+
+BEGIN;
+
+-- ============================================================
+-- Convert token_hash to BYTEA
+-- ============================================================
+
+-- Redundant with the UNIQUE constraint's index, which ALTER TYPE rebuilds
+DROP INDEX IF EXISTS idx_refresh_tokens_token_hash;
+DROP INDEX IF EXISTS idx_refresh_tokens_hash;
+
+ALTER TABLE refresh_tokens
+    ALTER COLUMN token_hash TYPE BYTEA USING decode(token_hash, 'hex');
+
+COMMENT ON COLUMN refresh_tokens.token_hash IS 'Raw SHA-256 digest (32 bytes) of refresh token (never store plaintext)';
+
+-- ============================================================
+-- Migration Verification
+-- ============================================================
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM refresh_tokens WHERE octet_length(token_hash) <> 32) THEN
+        RAISE EXCEPTION 'Migration failed: refresh_tokens.token_hash contains non SHA-256 values';
+    END IF;
+END $$;
+
+COMMIT;
@@ -0,0 +1,62 @@
+-- ============================================================================
+-- Migration 018: Refresh Token Lookup Indexes
+-- ============================================================================
+-- Description: Indexes for reuse detection and expired-token cleanup
+-- Author: Smart Parking Platform Team
+-- Created: 2025-10-23
+-- Version: v5.8.2
+--
+-- Impact: Token family revokes and cleanup stop scanning token history
+-- Estimated Time: < 1 minute (uses CONCURRENTLY to avoid blocking)
+-- Note: CONCURRENTLY cannot be used inside a transaction block
+-- ============================================================================
+
+-- ============================================================================
+-- 1. TOKEN HASH LOOKUP (validate_and_rotate)
+-- ============================================================================
+
+-- Served by the UNIQUE constraint's btree on token_hash (32-byte BYTEA since
+-- migration 017). Postgres hash indexes cannot enforce uniqueness, and a
+-- second index on the same column would only add write overhead.
+
+-- ============================================================================
+-- 2. ACTIVE TOKENS PER USER/DEVICE (revoke_token_family)
+-- ============================================================================
+
+-- Only active tokens, so the index stays small and cache-resident.
+-- (Already created by migration 010; repeated for databases that got
+-- refresh_tokens from migration 007.)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_refresh_tokens_user_device
+  ON refresh_tokens(user_id, device_fingerprint)
+  WHERE revoked_at IS NULL;
+
+-- ============================================================================
+-- 3. EXPIRY RANGE (cleanup_expired_tokens)
+-- ============================================================================
+
+-- Cleanup deletes revoked tokens too, which the existing
+-- WHERE revoked_at IS NULL expiry indexes cannot find. A predicate on NOW()
+-- is not allowed in an index, so this one covers every row.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_refresh_tokens_expires_at
+  ON refresh_tokens(expires_at);
+
+-- ============================================================================
+-- VERIFICATION QUERIES
+-- ============================================================================
+
+-- EXPLAIN ANALYZE
+-- SELECT id FROM refresh_tokens
+-- WHERE user_id = '00000000-0000-0000-0000-000000000000'
+--   AND device_fingerprint = 'fp'
+--   AND revoked_at IS NULL;
+-- Expected: Index Scan using idx_refresh_tokens_user_device
+
+-- EXPLAIN ANALYZE
+-- SELECT ctid FROM refresh_tokens WHERE expires_at < NOW() LIMIT 10000;
+-- Expected: Index Scan using idx_refresh_tokens_expires_at
+
+-- ============================================================================
+-- POST-MIGRATION STATISTICS UPDATE
+-- ============================================================================
+
+ANALYZE refresh_tokens;
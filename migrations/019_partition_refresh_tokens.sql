@@ -0,0 +1,170 @@
+-- Migration 019: Partition Refresh Tokens by Expiry Month
+-- Description: refresh_tokens becomes PARTITION BY RANGE (expires_at) with
+--              monthly partitions, so expired tokens are removed by dropping
+--              whole partitions instead of row-by-row DELETEs
+-- Date: 2025-10-23
+-- Related: src/refresh_token_service.py (cleanup_expired_tokens)
+--
+-- Notes:
+--   - Uniqueness of token_hash can no longer be enforced by an index (unique
+--     indexes on a partitioned table must include the partition key). The
+--     hash is a SHA-256 of 32 random bytes; the lookup index stays, as a
+--     plain index.
+--   - Only unexpired tokens are copied over; expired ones were due for
+--     cleanup anyway.
+--   - refresh_tokens_default catches tokens expiring past the pre-created
+--     months, so logins keep working if maintenance falls behind; the next
+--     maintenance run moves them into their monthly partition.
+
+BEGIN;
+
+-- ============================================================
+-- Partitioned Table
+-- ============================================================
+
+ALTER TABLE refresh_tokens RENAME TO refresh_tokens_unpartitioned;
+
+-- Columns, defaults and CHECKs of whichever refresh_tokens version exists
+-- (migration 007 or 010)
+CREATE TABLE refresh_tokens (
+    LIKE refresh_tokens_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS,
+    PRIMARY KEY (id, expires_at),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) PARTITION BY RANGE (expires_at);
+
+-- Keep the id sequence when the old table is dropped
+DO $$
+DECLARE
+    id_seq TEXT := pg_get_serial_sequence('refresh_tokens_unpartitioned', 'id');
+BEGIN
+    IF id_seq IS NOT NULL THEN
+        EXECUTE format('ALTER SEQUENCE %s OWNED BY refresh_tokens.id', id_seq);
+    END IF;
+END $$;
+
+-- tenant_id only exists in the migration 007 layout
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'refresh_tokens' AND column_name = 'tenant_id'
+    ) THEN
+        ALTER TABLE refresh_tokens
+            ADD FOREIGN KEY (tenant_id) REFERENCES tenants(id) ON DELETE CASCADE;
+    END IF;
+END $$;
+
+-- ============================================================
+-- Partition Maintenance
+-- ============================================================
+
+-- Catch-all for expiries outside the monthly partitions
+CREATE TABLE refresh_tokens_default PARTITION OF refresh_tokens DEFAULT;
+
+-- Creates monthly partitions from the current month to months_ahead months
+-- out, then detaches and drops partitions whose whole range has expired.
+-- A new month's rows may already sit in the default partition (ATTACH
+-- refuses to leave them there), so they are moved into the new table
+-- before it is attached.
+-- SECURITY DEFINER: the application role may not run DDL itself.
+CREATE OR REPLACE FUNCTION maintain_refresh_token_partitions(months_ahead INT DEFAULT 2)
+RETURNS TABLE (created INT, dropped INT) AS $$
+DECLARE
+    month_start DATE;
+    month_end DATE;
+    partition_name TEXT;
+    expired RECORD;
+BEGIN
+    created := 0;
+    dropped := 0;
+
+    FOR i IN 0..months_ahead LOOP
+        month_start := (date_trunc('month', NOW()) + make_interval(months => i))::date;
+        month_end := (month_start + INTERVAL '1 month')::date;
+        partition_name := format('refresh_tokens_%s', to_char(month_start, 'YYYY_MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I (LIKE refresh_tokens INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                partition_name
+            );
+            EXECUTE format(
+                'WITH moved AS (
+                     DELETE FROM refresh_tokens_default
+                     WHERE expires_at >= %L AND expires_at < %L
+                     RETURNING *
+                 )
+                 INSERT INTO %I SELECT * FROM moved',
+                month_start, month_end, partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE refresh_tokens ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, month_end
+            );
+            created := created + 1;
+        END IF;
+    END LOOP;
+
+    -- Partitions are named by month: refresh_tokens_YYYY_MM covers
+    -- [YYYY-MM-01, next month)
+    FOR expired IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'refresh_tokens'::regclass
+          AND c.relname ~ '^refresh_tokens_\d{4}_\d{2}$'
+          AND to_date(substring(c.relname FROM '\d{4}_\d{2}$'), 'YYYY_MM') + INTERVAL '1 month' <= NOW()
+    LOOP
+        EXECUTE format('ALTER TABLE refresh_tokens DETACH PARTITION %I', expired.relname);
+        EXECUTE format('DROP TABLE %I', expired.relname);
+        dropped := dropped + 1;
+    END LOOP;
+
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+COMMENT ON FUNCTION maintain_refresh_token_partitions(INT) IS
+'Creates upcoming monthly refresh_tokens partitions (moving their rows out of the default partition) and drops fully expired ones. Called by cleanup_expired_tokens.';
+
+SELECT * FROM maintain_refresh_token_partitions();
+
+-- ============================================================
+-- Data Copy
+-- ============================================================
+
+INSERT INTO refresh_tokens
+SELECT * FROM refresh_tokens_unpartitioned
+WHERE expires_at > NOW();
+
+DROP TABLE refresh_tokens_unpartitioned;
+
+-- ============================================================
+-- Indexes (created on every partition)
+-- ============================================================
+
+-- Token lookup (validate_and_rotate)
+CREATE INDEX idx_refresh_tokens_token_hash ON refresh_tokens(token_hash);
+
+-- Active tokens per user/device (revoke_token_family)
+CREATE INDEX idx_refresh_tokens_user_device ON refresh_tokens(user_id, device_fingerprint)
+    WHERE revoked_at IS NULL;
+
+-- User's tokens (get_user_tokens)
+CREATE INDEX idx_refresh_tokens_user ON refresh_tokens(user_id, created_at DESC);
+
+-- Expired rows of the current month (cleanup_expired_tokens batches)
+CREATE INDEX idx_refresh_tokens_expires_at ON refresh_tokens(expires_at);
+
+COMMENT ON TABLE refresh_tokens IS
+'Refresh tokens for JWT authentication with rotation and reuse detection. Partitioned monthly by expires_at.';
+
+-- Application role (migration 009)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'parking_app') THEN
+        GRANT SELECT, INSERT, UPDATE, DELETE ON refresh_tokens TO parking_app;
+        GRANT EXECUTE ON FUNCTION maintain_refresh_token_partitions(INT) TO parking_app;
+    END IF;
+END $$;
+
+COMMIT;
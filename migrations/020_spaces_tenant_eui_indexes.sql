@@ -0,0 +1,49 @@
+-- ============================================================================
+-- Migration 020: Tenant + Device EUI Indexes on Spaces
+-- ============================================================================
+-- Description: Support the tenant-scoped spaces join in list_devices
+-- Author: Smart Parking Platform Team
+-- Created: 2025-10-23
+-- Version: v5.8.2
+--
+-- Impact: The tenant's assigned EUIs come from an index-only scan
+-- Estimated Time: < 1 minute (uses CONCURRENTLY to avoid blocking)
+-- Note: CONCURRENTLY cannot be used inside a transaction block
+-- ============================================================================
+
+-- ============================================================================
+-- 1. SPACES TABLE - Device scoping (routers/devices.py list_devices)
+-- ============================================================================
+
+-- LEFT JOIN spaces s ON s.sensor_eui = d.dev_eui AND s.tenant_id = $1
+--                   AND s.deleted_at IS NULL
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_spaces_tenant_sensor_eui
+  ON spaces(tenant_id, sensor_eui)
+  INCLUDE (id)
+  WHERE deleted_at IS NULL;
+
+-- Same join for display devices
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_spaces_tenant_display_eui
+  ON spaces(tenant_id, display_eui)
+  INCLUDE (id)
+  WHERE deleted_at IS NULL;
+
+-- ============================================================================
+-- VERIFICATION QUERIES
+-- ============================================================================
+
+-- EXPLAIN ANALYZE
+-- SELECT d.dev_eui
+-- FROM sensor_devices d
+-- LEFT JOIN spaces s
+--   ON s.sensor_eui = d.dev_eui
+--   AND s.tenant_id = '00000000-0000-0000-0000-000000000000'
+--   AND s.deleted_at IS NULL
+-- WHERE (d.status = 'orphan' OR s.id IS NOT NULL);
+-- Expected: Hash Right Join over Index Only Scan using idx_spaces_tenant_sensor_eui
+
+-- ============================================================================
+-- POST-MIGRATION STATISTICS UPDATE
+-- ============================================================================
+
+VACUUM ANALYZE spaces;
@@ -0,0 +1,35 @@
+-- Migration 021: Change Notification for Device Types
+-- Lets API processes drop their cached GET /api/v1/devices/device-types
+-- listings as soon as device_types is written
+-- Created: 2025-10-23
+
+BEGIN;
+
+-- ============================================================================
+-- Change Notification
+-- ============================================================================
+
+-- Statement-level, so bulk updates send one notification
+CREATE OR REPLACE FUNCTION notify_device_types_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('device_types_changed', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_device_types_notify ON device_types;
+CREATE TRIGGER trg_device_types_notify
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON device_types
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_device_types_changed();
+
+-- ============================================================================
+-- Listener Notes
+-- ============================================================================
+
+-- src/background_tasks.py listens on device_types_changed and clears the
+-- in-process cache (src/routers/devices.py, DEVICE_TYPES_CACHE_TTL_SECONDS
+-- bounds staleness if a notification is missed).
+
+COMMIT;
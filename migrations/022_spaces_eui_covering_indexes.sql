@@ -0,0 +1,68 @@
+-- ============================================================================
+-- Migration 022: Covering Device EUI Indexes on Spaces
+-- ============================================================================
+-- Description: Assigned-space lookups by device EUI (device metadata and
+--              device detail) answered from the index alone
+-- Author: Smart Parking Platform Team
+-- Created: 2025-10-23
+-- Version: v5.8.2
+--
+-- Impact: One index-only probe per device instead of heap fetches; replaces
+--         the plain EUI indexes from 001/012 so writes to spaces maintain
+--         one index per EUI column fewer than before
+-- Estimated Time: < 1 minute (uses CONCURRENTLY to avoid blocking)
+-- Note: CONCURRENTLY cannot be used inside a transaction block
+-- ============================================================================
+
+-- ============================================================================
+-- 1. SPACES TABLE - Assigned space by EUI (routers/devices.py)
+-- ============================================================================
+
+-- get_device_metadata: LEFT JOIN LATERAL (SELECT id, name FROM spaces
+--   WHERE sensor_eui = sd.dev_eui AND deleted_at IS NULL LIMIT 1)
+-- get_device: same probe, also reading code
+-- The uplink reverse lookups (sensor_eui = $1) use it the same way; the
+-- equality implies IS NOT NULL, so the predicate still matches
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_spaces_sensor_eui_assigned
+  ON spaces(sensor_eui)
+  INCLUDE (id, name, code)
+  WHERE sensor_eui IS NOT NULL AND deleted_at IS NULL;
+
+-- Same lookups for display devices (and actuation)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_spaces_display_eui_assigned
+  ON spaces(display_eui)
+  INCLUDE (id, name, code)
+  WHERE display_eui IS NOT NULL AND deleted_at IS NULL;
+
+-- ============================================================================
+-- 2. SPACES TABLE - Superseded indexes
+-- ============================================================================
+
+-- Same keys and predicates as the covering indexes above, minus INCLUDE.
+-- Uniqueness stays with unique_sensor_eui (001) and uq_spaces_display_eui
+-- (008); tenant-scoped lookups with the 020 indexes.
+DROP INDEX CONCURRENTLY IF EXISTS idx_spaces_sensor;        -- 001
+DROP INDEX CONCURRENTLY IF EXISTS idx_spaces_sensor_eui;    -- 012
+DROP INDEX CONCURRENTLY IF EXISTS idx_spaces_display_eui;   -- 012
+
+-- ============================================================================
+-- VERIFICATION QUERIES
+-- ============================================================================
+
+-- EXPLAIN ANALYZE
+-- SELECT sd.dev_eui, s.id, s.name
+-- FROM sensor_devices sd
+-- LEFT JOIN LATERAL (
+--     SELECT id, name FROM spaces
+--     WHERE sensor_eui = sd.dev_eui AND deleted_at IS NULL
+--     LIMIT 1
+-- ) s ON true
+-- WHERE sd.enabled = true;
+-- Expected: Nested Loop Left Join with Index Only Scan using idx_spaces_sensor_eui_assigned
+
+-- ============================================================================
+-- POST-MIGRATION STATISTICS UPDATE
+-- ============================================================================
+
+-- Update table statistics (and the visibility map) for query planner
+VACUUM ANALYZE spaces;
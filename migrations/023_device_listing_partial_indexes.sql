@@ -0,0 +1,66 @@
+-- ============================================================================
+-- Migration 023: Partial Indexes for Device Listings
+-- ============================================================================
+-- Description: Enabled-device ordering and orphan filter indexes on
+--              sensor_devices and display_devices
+-- Author: Smart Parking Platform Team
+-- Created: 2025-10-23
+-- Version: v5.8.2
+--
+-- Impact: Default device listings (enabled only, newest first) and their
+--         keyset pages read rows in index order instead of scan + sort
+-- Estimated Time: < 1 minute (uses CONCURRENTLY to avoid blocking)
+-- Note: CONCURRENTLY cannot be used inside a transaction block
+-- ============================================================================
+
+-- ============================================================================
+-- 1. SENSOR_DEVICES TABLE - Listings (routers/devices.py)
+-- ============================================================================
+
+-- list_devices / get_device_metadata default: WHERE enabled = true
+-- ORDER BY created_at DESC, id DESC, pages continue at
+-- (created_at, id) < ($n, $m)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sensor_devices_enabled_created
+  ON sensor_devices(created_at DESC, id DESC)
+  WHERE enabled = true;
+
+-- Orphan devices (status = 'orphan' filter, tenant scoping's orphan branch)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sensor_devices_orphan
+  ON sensor_devices(dev_eui)
+  WHERE status = 'orphan';
+
+-- ============================================================================
+-- 2. DISPLAY_DEVICES TABLE - Listings (routers/devices.py)
+-- ============================================================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_display_devices_enabled_created
+  ON display_devices(created_at DESC, id DESC)
+  WHERE enabled = true;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_display_devices_orphan
+  ON display_devices(dev_eui)
+  WHERE status = 'orphan';
+
+-- ============================================================================
+-- VERIFICATION QUERIES
+-- ============================================================================
+
+-- EXPLAIN ANALYZE
+-- SELECT id, dev_eui, created_at
+-- FROM sensor_devices
+-- WHERE enabled = true
+-- ORDER BY created_at DESC, id DESC
+-- LIMIT 101;
+-- Expected: Index Scan using idx_sensor_devices_enabled_created (no Sort)
+
+-- EXPLAIN ANALYZE
+-- SELECT dev_eui FROM display_devices WHERE status = 'orphan';
+-- Expected: Index Only Scan using idx_display_devices_orphan
+
+-- ============================================================================
+-- POST-MIGRATION STATISTICS UPDATE
+-- ============================================================================
+
+-- Update table statistics (and the visibility map) for query planner
+VACUUM ANALYZE sensor_devices;
+VACUUM ANALYZE display_devices;
@@ -83,7 +83,7 @@ def check_scopes(required: Set[str], tenant: TenantContext):
 
         # Expand scopes based on hierarchy
         expanded_required = expand_scopes(required)
-        expanded_available = expand_scopes(set(tenant.api_key_scopes))
+        expanded_available = expand_scopes(tenant.scopes_set)
 
         # Wildcard grants everything
         if "*" in expanded_available or "admin:*" in expanded_available:
@@ -15,12 +15,13 @@ from src.models import (
     Tenant, TenantCreate, TenantUpdate,
     Site, SiteCreate, SiteUpdate,
     User, UserCreate, UserUpdate, UserWithMemberships,
-    UserMembership, UserMembershipCreate, UserMembershipUpdate,
+    UserMembershipCreate, UserMembershipUpdate,
     LoginRequest, LoginResponse, RegistrationRequest,
     RefreshRequest, RefreshResponse,
     UserProfileResponse, UserLimitsResponse,
     APIKey, APIKeyCreate, APIKeyResponse,
-    TenantContext, UserRole
+    TenantContext, UserRole,
+    API_KEY_LIST_ADAPTER, USER_WITH_MEMBERSHIPS_LIST_ADAPTER
 )
 from src.tenant_auth import (
     get_current_tenant, require_owner, require_admin,
@@ -673,32 +674,34 @@ async def list_tenant_users(
         ORDER BY u.email
     """, tenant.tenant_id)
 
+    # Group raw rows per user, then validate the nested structure in one pass
     users_dict = {}
     for row in rows:
         user_id = row['id']
-        if user_id not in users_dict:
-            users_dict[user_id] = UserWithMemberships(
-                id=row['id'],
-                email=row['email'],
-                name=row['name'],
-                is_active=row['is_active'],
-                email_verified=row['email_verified'],
-                created_at=row['created_at'],
-                updated_at=row['updated_at'],
-                last_login_at=row['last_login_at'],
-                memberships=[]
-            )
+        user = users_dict.get(user_id)
+        if user is None:
+            user = users_dict[user_id] = {
+                "id": user_id,
+                "email": row['email'],
+                "name": row['name'],
+                "is_active": row['is_active'],
+                "email_verified": row['email_verified'],
+                "created_at": row['created_at'],
+                "updated_at": row['updated_at'],
+                "last_login_at": row['last_login_at'],
+                "memberships": []
+            }
 
-        users_dict[user_id].memberships.append(UserMembership(
-            id=row['membership_id'],
-            user_id=row['id'],
-            tenant_id=tenant.tenant_id,
-            role=UserRole(row['role']),
-            is_active=row['membership_active'],
-            created_at=row['membership_created_at']
-        ))
+        user["memberships"].append({
+            "id": row['membership_id'],
+            "user_id": user_id,
+            "tenant_id": tenant.tenant_id,
+            "role": row['role'],
+            "is_active": row['membership_active'],
+            "created_at": row['membership_created_at']
+        })
 
-    return list(users_dict.values())
+    return USER_WITH_MEMBERSHIPS_LIST_ADAPTER.validate_python(list(users_dict.values()))
 
 # ============================================================
 # API Key Management
@@ -717,7 +720,7 @@ async def list_api_keys(
         ORDER BY created_at DESC
     """, tenant.tenant_id)
 
-    return [APIKey(**dict(row)) for row in rows]
+    return API_KEY_LIST_ADAPTER.validate_python([dict(row) for row in rows])
 
 @router.post("/api-keys", response_model=APIKeyResponse, status_code=status.HTTP_201_CREATED, summary="Create API Key")
 async def create_api_key(
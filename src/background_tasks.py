@@ -10,9 +10,14 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 
 from .models import Reservation, SpaceState
+from .refresh_token_service import get_refresh_token_service
+from .routers.devices import invalidate_device_types_cache
 
 logger = logging.getLogger(__name__)
 
+# Writes to device_types clear the in-process listing cache
+DEVICE_TYPES_CHANNEL = "device_types_changed"
+
 @dataclass
 class ScheduledTask:
     """Represents a scheduled task"""
@@ -42,6 +47,8 @@ class BackgroundTaskManager:
         self._reconciliation_task: Optional[asyncio.Task] = None
         self._reservation_expiry_task: Optional[asyncio.Task] = None
         self._materialized_views_refresh_task: Optional[asyncio.Task] = None
+        self._device_types_listener_task: Optional[asyncio.Task] = None
+        self._refresh_tokens_task: Optional[asyncio.Task] = None
 
     async def start(self):
         """Start background task manager"""
@@ -72,6 +79,15 @@ class BackgroundTaskManager:
         self._materialized_views_refresh_task = asyncio.create_task(self._materialized_views_refresh_loop())
         logger.info("Started materialized views refresh task")
 
+        # Start refresh token partition maintenance and cleanup (first run now,
+        # so the upcoming monthly partitions exist before any login)
+        self._refresh_tokens_task = asyncio.create_task(self._refresh_tokens_loop())
+        logger.info("Started refresh token maintenance task")
+
+        # Start device types cache invalidation (driven by device_types change notifications)
+        self._device_types_listener_task = asyncio.create_task(self._device_types_listener_loop())
+        logger.info("Started device types cache listener")
+
         # Load and schedule active reservations
         await self._load_active_reservations()
 
@@ -105,6 +121,10 @@ class BackgroundTaskManager:
             self._reservation_expiry_task.cancel()
         if self._materialized_views_refresh_task:
             self._materialized_views_refresh_task.cancel()
+        if self._device_types_listener_task:
+            self._device_types_listener_task.cancel()
+        if self._refresh_tokens_task:
+            self._refresh_tokens_task.cancel()
 
         logger.info("Background task manager stopped")
 
@@ -271,6 +291,23 @@ class BackgroundTaskManager:
             except Exception as e:
                 logger.error(f"Cleanup loop error: {e}", exc_info=True)
 
+    async def _refresh_tokens_loop(self):
+        """Refresh token partition maintenance and expired-token cleanup"""
+        while self.running:
+            try:
+                # Drops expired partitions / rows and creates upcoming months
+                await get_refresh_token_service().cleanup_expired_tokens(self.db_pool)
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Refresh token maintenance loop error: {e}", exc_info=True)
+
+            try:
+                await asyncio.sleep(3600)  # Run every hour
+            except asyncio.CancelledError:
+                break
+
     async def _monitoring_loop(self):
         """Periodic monitoring and health checks"""
         while self.running:
@@ -629,3 +666,28 @@ class BackgroundTaskManager:
                 break
             except Exception as e:
                 logger.error(f"Materialized views refresh loop error: {e}", exc_info=True)
+
+    async def _device_types_listener_loop(self):
+        """Clear the cached device type listings after device_types changes"""
+        def on_notify(connection, pid, channel, payload):
+            invalidate_device_types_cache()
+
+        while self.running:
+            try:
+                # Dedicated connection: LISTEN only lasts as long as the session
+                async with self.db_pool.acquire() as conn:
+                    await conn.add_listener(DEVICE_TYPES_CHANNEL, on_notify)
+                    # Changes made while nobody was listening
+                    invalidate_device_types_cache()
+                    try:
+                        # Reconnect (and clear again) if the session drops
+                        while self.running and not conn.is_closed():
+                            await asyncio.sleep(60)
+                    finally:
+                        await conn.remove_listener(DEVICE_TYPES_CHANNEL, on_notify)
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Device types listener loop error: {e}", exc_info=True)
+                await asyncio.sleep(5)
@@ -101,10 +101,10 @@ class Settings(BaseSettings):
         description="Database connection recycle time in seconds"
     )
     db_pool_min_size: int = Field(
-        default=5,
+        default=10,
         ge=1,
-        le=20,
-        description="Minimum database pool size"
+        le=50,
+        description="Minimum database pool size (connections kept open, so request spikes up to this concurrency never wait on a new connection)"
     )
     db_pool_max_size: int = Field(
         default=20,
@@ -112,6 +112,12 @@ class Settings(BaseSettings):
         le=100,
         description="Maximum database pool size"
     )
+    db_statement_cache_size: int = Field(
+        default=1024,
+        ge=0,
+        le=10000,
+        description="Prepared statements cached per database connection (0 disables)"
+    )
 
     # ========================================================================
     # Redis
@@ -274,6 +280,15 @@ class Settings(BaseSettings):
         le=1.0,
         description="Sentry traces sample rate (0.0-1.0)"
     )
+    explain_slow_queries: bool = Field(
+        default=False,
+        description="Log EXPLAIN ANALYZE plans for slow read queries (debug only)"
+    )
+    explain_slow_query_threshold_ms: int = Field(
+        default=100,
+        ge=1,
+        description="Duration above which a query's plan is logged"
+    )
 
     # ========================================================================
     # CORS (Cross-Origin Resource Sharing)
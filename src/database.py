@@ -14,7 +14,8 @@ from .config import settings
 from .models import (
     Space, SpaceCreate, SpaceUpdate,
     Reservation, ReservationCreate,
-    SpaceState, ReservationStatus
+    SpaceState, ReservationStatus,
+    RESERVATION_LIST_ADAPTER
 )
 from .exceptions import (
     DatabaseError,
@@ -26,6 +27,22 @@ from .utils import utcnow
 
 logger = logging.getLogger(__name__)
 
+async def _init_connection(conn: asyncpg.Connection):
+    """Per-connection setup: decode NUMERIC straight to float
+
+    Our numeric columns (GPS coordinates, battery, SNR, temperature) are
+    measurements, not money, so Decimal precision buys nothing and every
+    consumer was calling float() on them anyway.
+    """
+    await conn.set_type_codec(
+        'numeric',
+        encoder=str,
+        decoder=float,
+        schema='pg_catalog',
+        format='text'
+    )
+
+
 class DatabasePool:
     """
     Async PostgreSQL connection pool
@@ -52,10 +69,14 @@ class DatabasePool:
                 max_queries=50000,
                 max_inactive_connection_lifetime=300,
                 command_timeout=60,
+                # Room for every filter shape of the dynamic router queries
+                # (asyncpg's default is 100 per connection)
+                statement_cache_size=settings.db_statement_cache_size,
                 server_settings={
                     'application_name': 'parking_v5',
                     'jit': 'off'
-                }
+                },
+                init=_init_connection
             )
 
             # Test connection
@@ -248,7 +269,7 @@ class DatabasePool:
                     space.name, space.code, space.building, space.floor, space.zone,
                     space.sensor_eui.upper() if space.sensor_eui else None,
                     space.display_eui.upper() if space.display_eui else None,
-                    space.state.value,
+                    space.state,
                     space.gps_latitude, space.gps_longitude,
                     json.dumps(space.metadata) if space.metadata else None
                 )
@@ -409,7 +430,7 @@ class DatabasePool:
         async with self.acquire() as conn:
             rows = await conn.fetch(query, *params)
 
-        return [Reservation(**dict(row)) for row in rows]
+        return RESERVATION_LIST_ADAPTER.validate_python([dict(row) for row in rows])
 
     async def get_reservation(self, reservation_id: str) -> Optional[Reservation]:
         """Get single reservation"""
@@ -443,16 +464,18 @@ class DatabasePool:
                 raise SpaceNotFoundError(str(reservation.space_id))
 
             # Check for overlapping reservations
+            # Same range expression as the uq_reservations_no_overlap GiST index,
+            # and EXISTS stops at the first conflict instead of counting them all
             overlap = await conn.fetchval("""
-                SELECT COUNT(*) FROM reservations
-                WHERE space_id = $1
-                AND status = 'active'
-                AND (
-                    (start_time, end_time) OVERLAPS ($2, $3)
+                SELECT EXISTS (
+                    SELECT 1 FROM reservations
+                    WHERE space_id = $1
+                    AND status = 'active'
+                    AND tstzrange(start_time, end_time, '[)') && tstzrange($2, $3, '[)')
                 )
             """, str(reservation.space_id), reservation.start_time, reservation.end_time)
 
-            if overlap > 0:
+            if overlap:
                 raise DuplicateResourceError(
                     "Reservation",
                     f"Overlapping reservation for space {reservation.space_id}"
@@ -513,7 +536,7 @@ class DatabasePool:
         async with self.acquire() as conn:
             rows = await conn.fetch(query, space_id)
 
-        return [Reservation(**dict(row)) for row in rows]
+        return RESERVATION_LIST_ADAPTER.validate_python([dict(row) for row in rows])
 
     # ============================================================
     # Device Discovery & Management (ORPHAN Pattern)
@@ -176,7 +176,6 @@ class DownlinkQueue:
 
         # Metrics
         await self._increment_metric("enqueued")
-        metrics.downlink_enqueued_total.labels(tenant_id=tenant_id).inc()
         metrics.track_downlink_enqueue(tenant_id=tenant_id)
 
         logger.info(
@@ -8,7 +8,8 @@ import os
 from contextlib import asynccontextmanager
 from datetime import datetime
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
@@ -28,11 +29,12 @@ from .downlink_queue import DownlinkQueue, DownlinkRateLimiter, DownlinkWorker
 from .webhook_spool import WebhookSpool, set_spool
 from .models import HealthStatus, ProcessingResult
 from .exceptions import ParkingException
+from .responses import FastJSONResponse
 
 # Webhook processing imports
 from .device_handlers import parse_chirpstack_webhook
 from .webhook_validation import verify_webhook_signature
-from .orphan_devices import handle_orphan_device
+from .orphan_queue import OrphanUplinkQueue
 from .utils import generate_request_id
 import json
 import base64
@@ -41,6 +43,7 @@ from typing import Dict, Any
 # Multi-tenancy imports
 from .tenant_auth import set_db_pool as set_tenant_auth_db_pool, set_jwt_secret
 from .auth import set_db_pool as set_auth_db_pool
+from .refresh_token_service import token_hash_backend
 
 # Routers
 from .api_tenants import router as tenants_router
@@ -119,7 +122,10 @@ async def lifespan(app: FastAPI):
     set_tenant_auth_db_pool(db_pool.pool)
     set_auth_db_pool(db_pool.pool)  # CRITICAL: Initialize auth.py db_pool for API key verification
     set_jwt_secret(jwt_secret)
-    logger.info("[OK] Multi-tenancy authentication initialized")
+    logger.info(
+        f"[OK] Multi-tenancy authentication initialized "
+        f"(refresh token hashing: {token_hash_backend()})"
+    )
 
     # Initialize Redis cache
     from .cache import init_cache
@@ -140,6 +146,12 @@ async def lifespan(app: FastAPI):
     app.state.webhook_spool = webhook_spool
     logger.info("[OK] Webhook spool initialized")
 
+    # Batch orphan device upserts off the webhook path
+    orphan_queue = OrphanUplinkQueue(db_pool.pool)
+    await orphan_queue.start_worker()
+    app.state.orphan_queue = orphan_queue
+    logger.info("[OK] Orphan uplink queue started")
+
     # Initialize downlink queue and worker (for Class-C displays)
     # Use cache Redis client for downlink operations
     downlink_queue = DownlinkQueue(cache_manager.redis)
@@ -206,6 +218,10 @@ async def lifespan(app: FastAPI):
     app.state.task_manager = task_manager
     logger.info("[OK] Background task manager started")
 
+    # Apply buffered downlink counter increments in batches
+    from .metrics import downlink_metrics_ring
+    app.state.downlink_metrics_flusher = asyncio.create_task(downlink_metrics_ring.run_flusher())
+
     logger.info(f">> {settings.app_name} v{settings.app_version} is ready with multi-tenancy and durable downlink queue!")
 
     yield
@@ -217,6 +233,13 @@ async def lifespan(app: FastAPI):
         await app.state.task_manager.stop()
         logger.info("[OK] Background tasks stopped")
 
+    if hasattr(app.state, 'downlink_metrics_flusher'):
+        app.state.downlink_metrics_flusher.cancel()
+        try:
+            await app.state.downlink_metrics_flusher
+        except asyncio.CancelledError:
+            pass
+
     if hasattr(app.state, 'downlink_worker'):
         await app.state.downlink_worker.stop()
         logger.info("[OK] Downlink worker stopped")
@@ -225,6 +248,10 @@ async def lifespan(app: FastAPI):
         await app.state.webhook_spool.stop_worker()
         logger.info("[OK] Webhook spool worker stopped")
 
+    if hasattr(app.state, 'orphan_queue'):
+        await app.state.orphan_queue.stop_worker()
+        logger.info("[OK] Orphan uplink queue stopped")
+
     if hasattr(app.state, 'gateway_monitor'):
         await app.state.gateway_monitor.disconnect()
         logger.info("[OK] Gateway monitor closed")
@@ -254,6 +281,7 @@ app = FastAPI(
     version=settings.app_version,
     description="Smart Parking Platform with ChirpStack integration and multi-tenancy",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,  # orjson serialization for all endpoints
     root_path="",  # Required for proper URL generation behind proxy
     root_path_in_servers=False
 )
@@ -302,6 +330,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset cursor of paged device listings (routers/devices.py)
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ============================================================
@@ -510,9 +540,8 @@ async def process_uplink(request: Request, webhook_data: Dict[str, Any]):
             # ORPHAN device - track in orphan_devices table
             logger.info(f"[{request_id}] ORPHAN device {device_eui} - tracking uplink")
 
-            # Track orphan device
-            orphan_info = await handle_orphan_device(
-                db=db_pool.pool,
+            # Track orphan device (batched, flushed by the orphan queue worker)
+            request.app.state.orphan_queue.put(
                 device_eui=device_eui,
                 payload=parsed_data.get("payload", "").encode() if parsed_data.get("payload") else None,
                 rssi=parsed_data.get("rssi"),
@@ -640,6 +669,28 @@ async def generic_exception_handler(request: Request, exc: Exception):
         }
     )
 
+# ============================================================
+# Root Endpoint
+# ============================================================
+
+# Content is immutable for the life of the process: encode once at import
+_ROOT_RESPONSE_BYTES = orjson.dumps({
+    "service": settings.app_name,
+    "version": settings.app_version,
+    "status": "running",
+    "docs": "/docs",
+    "health": "/health"
+})
+
+@app.get("/", tags=["System"])
+async def root():
+    """API root endpoint (pre-encoded, cacheable by upstream proxies)"""
+    return Response(
+        content=_ROOT_RESPONSE_BYTES,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=60"}
+    )
+
 # ============================================================
 # Health Checks
 # ============================================================
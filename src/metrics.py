@@ -10,8 +10,10 @@ Metrics Categories:
 - Tenancy: per-tenant rate limiting
 - Infrastructure: DB/Redis latency
 """
+import asyncio
 import time
-from typing import Optional
+from collections import deque
+from typing import Dict, Optional
 from prometheus_client import (
     Counter, Gauge, Histogram, Summary,
     CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
@@ -285,6 +287,60 @@ actuation_latency_seconds = Histogram(
     registry=registry
 )
 
+# ============================================================
+# Buffered Counter Increments
+# ============================================================
+
+class MetricsRing:
+    """
+    Ring buffer of counter events from the downlink hot path
+
+    Producers append (counter, label_values) tuples without touching
+    prometheus_client; drain() collapses them into one inc(n) per counter
+    and label set. A flush task wakes on the event and drains in batches.
+    """
+
+    def __init__(self, maxlen: int = 8192):
+        self._ring: deque = deque(maxlen=maxlen)
+        self._event = asyncio.Event()
+
+    def push(self, counter: Counter, *label_values: str):
+        """Queue a single increment of counter for the given label values"""
+        if len(self._ring) == self._ring.maxlen:
+            # Drain inline rather than let the deque drop the oldest events
+            self.drain()
+        self._ring.append((counter, label_values))
+        self._event.set()
+
+    def drain(self):
+        """Apply all queued increments as aggregated counter updates"""
+        if not self._ring:
+            return
+
+        events = list(self._ring)
+        self._ring.clear()
+
+        totals: Dict[tuple, int] = {}
+        for event in events:
+            totals[event] = totals.get(event, 0) + 1
+
+        for (counter, label_values), count in totals.items():
+            counter.labels(*label_values).inc(count)
+
+    async def run_flusher(self, coalesce_seconds: float = 0.25):
+        """Background task: drain after each wake-up, coalescing bursts"""
+        try:
+            while True:
+                await self._event.wait()
+                await asyncio.sleep(coalesce_seconds)
+                self._event.clear()
+                self.drain()
+        finally:
+            self.drain()
+
+
+downlink_metrics_ring = MetricsRing()
+
 # ============================================================
 # Helper Functions
 # ============================================================
@@ -295,18 +351,19 @@ class MetricsTimer:
     def __init__(self, histogram, labels: Optional[dict] = None):
         self.histogram = histogram
         self.labels = labels or {}
-        self.start_time = None
+        self._start_ns = None
 
     def __enter__(self):
-        self.start_time = time.time()
+        # Monotonic integer clock: no float drift, unaffected by NTP steps
+        self._start_ns = time.perf_counter_ns()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = time.time() - self.start_time
+        elapsed_ns = time.perf_counter_ns() - self._start_ns
         if self.labels:
-            self.histogram.labels(**self.labels).observe(duration)
+            self.histogram.labels(**self.labels).observe(elapsed_ns / 1e9)
         else:
-            self.histogram.observe(duration)
+            self.histogram.observe(elapsed_ns / 1e9)
 
 
 def track_uplink(status: str, tenant_id: str = "unknown"):
@@ -340,25 +397,25 @@ def update_orphan_count(count: int):
 
 
 def track_downlink_enqueue(tenant_id: str = "unknown"):
-    """Track downlink enqueue"""
-    downlink_enqueued_total.labels(tenant_id=tenant_id).inc()
+    """Track downlink enqueue (buffered, see MetricsRing)"""
+    downlink_metrics_ring.push(downlink_enqueued_total, tenant_id)
 
 
 def track_downlink_success(tenant_id: str = "unknown", latency_ms: Optional[float] = None):
-    """Track successful downlink"""
-    downlink_sent_total.labels(tenant_id=tenant_id).inc()
+    """Track successful downlink (buffered, see MetricsRing)"""
+    downlink_metrics_ring.push(downlink_sent_total, tenant_id)
     if latency_ms is not None:
         downlink_latency_seconds.observe(latency_ms / 1000.0)
 
 
 def track_downlink_failure(tenant_id: str = "unknown", reason: str = "unknown"):
-    """Track downlink failure"""
-    downlink_failed_total.labels(tenant_id=tenant_id, reason=reason).inc()
+    """Track downlink failure (buffered, see MetricsRing)"""
+    downlink_metrics_ring.push(downlink_failed_total, tenant_id, reason)
 
 
 def track_downlink_dead_letter(tenant_id: str = "unknown"):
-    """Track downlink moved to dead-letter queue"""
-    downlink_dead_letter_total.labels(tenant_id=tenant_id).inc()
+    """Track downlink moved to dead-letter queue (buffered, see MetricsRing)"""
+    downlink_metrics_ring.push(downlink_dead_letter_total, tenant_id)
 
 
 def update_downlink_queue_depth(pending: int, dead_letter: int):
@@ -367,18 +424,42 @@ def update_downlink_queue_depth(pending: int, dead_letter: int):
     downlink_queue_depth.labels(queue_type="dead_letter").set(dead_letter)
 
 
+# Cap on distinct tenant_id label values for the per-request counters; past
+# this, new tenants are folded into "_other" so series count stays bounded
+MAX_TENANTS_TRACKED = 1000
+_tracked_tenants: set = set()
+
+
+def bounded_tenant_label(tenant_id: str) -> str:
+    """Return tenant_id, or "_other" once MAX_TENANTS_TRACKED tenants have been seen"""
+    if tenant_id in _tracked_tenants:
+        return tenant_id
+    if len(_tracked_tenants) >= MAX_TENANTS_TRACKED:
+        return "_other"
+    _tracked_tenants.add(tenant_id)
+    return tenant_id
+
+
 def track_rate_limit_rejection(tenant_id: str, endpoint: str):
-    """Track rate limit rejection"""
-    rate_limit_rejections_total.labels(tenant_id=tenant_id, endpoint=endpoint).inc()
+    """Track rate limit rejection (endpoint should be the route template)"""
+    rate_limit_rejections_total.labels(
+        tenant_id=bounded_tenant_label(tenant_id),
+        endpoint=endpoint
+    ).inc()
 
 
 def track_api_request(method: str, endpoint: str, status_code: int, tenant_id: str = "unknown", duration: Optional[float] = None):
-    """Track API request"""
+    """
+    Track API request
+
+    endpoint must be the route template (e.g. /api/v1/devices/{deveui}), not
+    the concrete path. Duration is aggregated across tenants.
+    """
     api_requests_total.labels(
         method=method,
         endpoint=endpoint,
         status_code=str(status_code),
-        tenant_id=tenant_id
+        tenant_id=bounded_tenant_label(tenant_id)
     ).inc()
 
     if duration is not None:
@@ -402,9 +483,14 @@ def track_actuation_latency(latency_seconds: float, tenant_id: str = "unknown"):
 
 def get_metrics_text() -> bytes:
     """Get metrics in Prometheus text format"""
+    downlink_metrics_ring.drain()
     return generate_latest(registry)
 
 
+# Prometheus content type (constant, bind directly instead of calling a getter)
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
 def get_metrics_content_type() -> str:
     """Get Prometheus content type"""
-    return CONTENT_TYPE_LATEST
+    return METRICS_CONTENT_TYPE
@@ -10,8 +10,11 @@ from contextvars import ContextVar
 from typing import Optional
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
+from .metrics import track_api_request
+
 logger = structlog.get_logger()
 
 
@@ -69,7 +72,7 @@ def set_user_id(user_id: str) -> None:
 # Request Tracing Middleware
 # ============================================================================
 
-class RequestTracingMiddleware(BaseHTTPMiddleware):
+class RequestTracingMiddleware:
     """
     Middleware for request tracing with context propagation
 
@@ -79,13 +82,24 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
     - Adds response headers (X-Request-ID, X-Response-Time)
     - Binds context to structlog for automatic inclusion in logs
     - Stores request ID in context variable for access anywhere
+
+    Implemented as plain ASGI: tracing headers are appended as raw byte
+    tuples to the http.response.start message instead of going through
+    Starlette's MutableHeaders on every response.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        """Process request with tracing"""
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
 
         # Generate or extract request ID
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
         set_request_id(request_id)
 
         # Extract tenant ID if available (will be set by auth middleware)
@@ -100,7 +114,7 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
             path=request.url.path
         )
 
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         # Log request start
         logger.info("request_started",
@@ -109,43 +123,67 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
             query_params=dict(request.query_params) if request.query_params else None
         )
 
+        status_code = 500
+        tenant_id = None
+
+        async def send_with_tracing(message: Message):
+            nonlocal status_code, tenant_id
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration_ms = ((time.perf_counter_ns() - start_ns) // 1000) / 1000
+
+                # Add tracing headers to response (one extend on the raw list)
+                tracing_headers = [
+                    (b"x-request-id", request_id.encode("latin-1")),
+                    (b"x-response-time", b"%.2fms" % duration_ms),
+                ]
+
+                # Add tenant ID header if available
+                tenant_id = get_tenant_id()
+                if tenant_id:
+                    tracing_headers.append((b"x-tenant-id", tenant_id.encode("latin-1")))
+
+                message.setdefault("headers", []).extend(tracing_headers)
+            await send(message)
+
         # Process request
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_tracing)
         except Exception as e:
             # Log exception with context
-            duration_ms = (time.time() - start_time) * 1000
+            duration_us = (time.perf_counter_ns() - start_ns) // 1000
             logger.error("request_failed",
                 error=str(e),
                 error_type=type(e).__name__,
-                duration_ms=round(duration_ms, 2)
+                duration_ms=duration_us / 1000
             )
+            structlog.contextvars.unbind_contextvars("request_id", "method", "path")
             raise
 
-        # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
-
-        # Add tracing headers to response
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-
-        # Add tenant ID header if available
-        tenant_id = get_tenant_id()
-        if tenant_id:
-            response.headers["X-Tenant-ID"] = tenant_id
+        # Duration covers the full response body, not just headers
+        duration_ms = ((time.perf_counter_ns() - start_ns) // 1000) / 1000
 
         # Log request completion
         logger.info("request_completed",
-            status_code=response.status_code,
-            duration_ms=round(duration_ms, 2),
+            status_code=status_code,
+            duration_ms=duration_ms,
             tenant_id=tenant_id
         )
 
+        # Label by route template so per-ID paths don't create new series;
+        # unmatched paths (404 scans) share a single label
+        route = scope.get("route")
+        track_api_request(
+            method=request.method,
+            endpoint=route.path if route else "unmatched",
+            status_code=status_code,
+            tenant_id=tenant_id or "unknown",
+            duration=duration_ms / 1000
+        )
+
         # Clear context
         structlog.contextvars.unbind_contextvars("request_id", "method", "path")
 
-        return response
-
 
 # ============================================================================
 # Tenant Context Middleware
@@ -2,12 +2,52 @@
 Pydantic models for request/response validation
 All models in one place for simplicity
 """
-from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, SkipValidation, TypeAdapter, field_validator, model_validator
+from typing import Optional, List, Dict, Any, FrozenSet, Literal
+from datetime import datetime, timedelta
 from enum import Enum
+from functools import partial
 from uuid import UUID
-import re
+import string
+
+# Allowed bytes per email section; bytes.translate(None, chars) deletes them,
+# so a section is valid when nothing is left over (one C-level pass, no regex)
+_EMAIL_LOCAL_CHARS = (string.ascii_letters + string.digits + "._%+-").encode("ascii")
+_EMAIL_DOMAIN_CHARS = (string.ascii_letters + string.digits + ".-").encode("ascii")
+_EMAIL_TLD_CHARS = string.ascii_letters.encode("ascii")
+
+
+def _is_valid_email(v: str) -> bool:
+    """Equivalent to ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}$"""
+    # Shortest valid address is "a@b.cc"; the 255 cap is already enforced
+    # by Field(max_length=255) before this validator runs
+    if len(v) < 6 or not v.isascii():
+        return False
+    b = v.encode("ascii")
+    at = b.find(b"@")
+    if at < 1:
+        return False
+    domain = b[at + 1:]
+    # The TLD cannot contain dots, so it always follows the last one
+    dot = domain.rfind(b".")
+    return (
+        dot >= 1
+        and len(domain) - dot > 2
+        and not b[:at].translate(None, _EMAIL_LOCAL_CHARS)
+        and not domain[:dot].translate(None, _EMAIL_DOMAIN_CHARS)
+        and not domain[dot + 1:].translate(None, _EMAIL_TLD_CHARS)
+    )
+
+
+def _is_hex16(v: str) -> bool:
+    """True if v is exactly 16 hex characters (an 8-byte DevEUI)"""
+    if len(v) != 16:
+        return False
+    try:
+        # fromhex skips whitespace between pairs, so also check the byte count
+        return len(bytes.fromhex(v)) == 8
+    except ValueError:
+        return False
 
 # ============================================================
 # Enums
@@ -32,6 +72,15 @@ class ReservationStatus(str, Enum):
     COMPLETED = "completed"  # Deprecated: use EXPIRED
     NO_SHOW = "no_show"      # Deprecated: use EXPIRED
 
+# Literal mirrors of the enums above for model fields: validation is a single
+# membership check and the value stays a plain str (no enum round-trip).
+# Keep in sync with SpaceState / ReservationStatus.
+SpaceStateT = Literal["FREE", "OCCUPIED", "RESERVED", "MAINTENANCE"]
+ReservationStatusT = Literal[
+    "pending", "confirmed", "cancelled", "expired",
+    "active", "completed", "no_show"
+]
+
 class DeviceType(str, Enum):
     """Device types"""
     SENSOR = "sensor"
@@ -46,6 +95,11 @@ class UserRole(str, Enum):
     OPERATOR = "operator" # Manage reservations, view telemetry, trigger displays
     VIEWER = "viewer"     # Read-only access
 
+# Free-form JSON object read back from our own database (jsonb columns) or
+# built server-side: already a dict, so skip pydantic's per-key walk.
+# Request models keep Dict[str, Any] so client input is still checked.
+TrustedJSON = SkipValidation[Optional[Dict[str, Any]]]
+
 # ============================================================
 # Base Models
 # ============================================================
@@ -63,9 +117,10 @@ class DevEUIMixin(BaseModel):
     def validate_deveui(cls, v):
         """Validate DevEUI format (16 hex characters)"""
         if v is not None:
-            if not re.match(r"^[0-9a-fA-F]{16}$", v):
+            if not _is_hex16(v):
                 raise ValueError(f"Invalid DevEUI format: {v}")
-            return v.upper()  # Changed from .lower() to .upper() to match database triggers
+            # Uppercase to match database triggers; most EUIs already arrive that way
+            return v if v.isupper() else v.upper()
         return v
 
 # ============================================================
@@ -85,7 +140,10 @@ class SpaceBase(BaseModel):
     @model_validator(mode="after")
     def validate_gps_coordinates(self):
         """Both GPS coordinates must be provided or both null"""
-        if (self.gps_latitude is None) != (self.gps_longitude is None):
+        # Most spaces carry no GPS fix: return before the pairing check
+        if self.gps_latitude is None and self.gps_longitude is None:
+            return self
+        if (self.gps_latitude is None) ^ (self.gps_longitude is None):
             raise ValueError("Both latitude and longitude must be provided or both null")
         return self
 
@@ -93,7 +151,7 @@ class SpaceCreate(SpaceBase, DevEUIMixin):
     """Model for creating a space"""
     sensor_eui: Optional[str] = Field(None, description="16-character hex DevEUI")
     display_eui: Optional[str] = Field(None, description="16-character hex DevEUI")
-    state: SpaceState = Field(default=SpaceState.FREE)
+    state: SpaceStateT = Field(default="FREE")
     site_id: UUID = Field(..., description="Site ID this space belongs to")
     metadata: Optional[Dict[str, Any]] = None
 
@@ -106,7 +164,7 @@ class SpaceUpdate(DevEUIMixin):
     zone: Optional[str] = Field(None, max_length=50)
     sensor_eui: Optional[str] = None
     display_eui: Optional[str] = None
-    state: Optional[SpaceState] = None
+    state: Optional[SpaceStateT] = None
     metadata: Optional[Dict[str, Any]] = None
 
 class Space(SpaceBase, DevEUIMixin, TimestampMixin):
@@ -114,20 +172,21 @@ class Space(SpaceBase, DevEUIMixin, TimestampMixin):
     id: UUID
     sensor_eui: Optional[str] = None
     display_eui: Optional[str] = None
-    state: SpaceState
+    state: SpaceStateT
     site_id: Optional[UUID] = None
     tenant_id: Optional[UUID] = None  # Denormalized for fast lookups
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: TrustedJSON = None
     deleted_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
-        use_enum_values = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True, frozen=True, extra="ignore")
 
 # ============================================================
 # Reservation Models
 # ============================================================
 
+_ZERO_DELTA = timedelta(0)
+_MAX_RESERVATION_DELTA = timedelta(hours=24)
+
 class ReservationBase(BaseModel):
     """Base reservation model"""
     space_id: UUID
@@ -140,14 +199,14 @@ class ReservationBase(BaseModel):
     @model_validator(mode="after")
     def validate_times(self):
         """Validate reservation times"""
-        if self.start_time and self.end_time:
-            if self.end_time <= self.start_time:
-                raise ValueError("End time must be after start time")
+        # Both fields are required, so no None guard is needed
+        duration = self.end_time - self.start_time
+        if duration <= _ZERO_DELTA:
+            raise ValueError("End time must be after start time")
 
-            # Max 24 hour reservation
-            duration = self.end_time - self.start_time
-            if duration.total_seconds() > 86400:
-                raise ValueError("Maximum reservation duration is 24 hours")
+        # Max 24 hour reservation
+        if duration > _MAX_RESERVATION_DELTA:
+            raise ValueError("Maximum reservation duration is 24 hours")
 
         return self
 
@@ -161,11 +220,10 @@ class Reservation(ReservationBase, TimestampMixin):
     id: UUID
     request_id: UUID
     tenant_id: UUID
-    status: ReservationStatus
+    status: ReservationStatusT
+    metadata: TrustedJSON = None
 
-    class Config:
-        orm_mode = True
-        use_enum_values = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True, frozen=True, extra="ignore")
 
 class AvailabilitySlot(BaseModel):
     """Availability time slot"""
@@ -174,6 +232,8 @@ class AvailabilitySlot(BaseModel):
     available: bool
     reservation_id: Optional[UUID] = None
 
+    model_config = ConfigDict(frozen=True)
+
 class SpaceAvailability(BaseModel):
     """Space availability response"""
     space_id: UUID
@@ -183,7 +243,9 @@ class SpaceAvailability(BaseModel):
     query_end: datetime
     is_available: bool  # True if completely free during period
     reservations: List[Reservation] = []
-    current_state: SpaceState
+    current_state: SpaceStateT
+
+    model_config = ConfigDict(frozen=True)
 
 # ============================================================
 # Sensor/Device Models
@@ -229,7 +291,9 @@ class HealthStatus(BaseModel):
     version: str
     timestamp: datetime
     checks: Dict[str, str]
-    stats: Optional[Dict[str, Any]] = None
+    stats: TrustedJSON = None
+
+    model_config = ConfigDict(frozen=True)
 
 class ProcessingResult(BaseModel):
     """Uplink processing result"""
@@ -261,14 +325,14 @@ class SpaceFilters(PaginationParams):
     building: Optional[str] = None
     floor: Optional[str] = None
     zone: Optional[str] = None
-    state: Optional[SpaceState] = None
+    state: Optional[SpaceStateT] = None
     include_deleted: bool = False
 
 class ReservationFilters(PaginationParams):
     """Reservation query filters"""
     space_id: Optional[UUID] = None
     user_email: Optional[str] = None
-    status: Optional[ReservationStatus] = None
+    status: Optional[ReservationStatusT] = None
     date_from: Optional[datetime] = None
     date_to: Optional[datetime] = None
 
@@ -280,8 +344,8 @@ class TenantBase(BaseModel):
     """Base tenant model"""
     name: str = Field(..., min_length=1, max_length=255)
     slug: str = Field(..., min_length=1, max_length=100, pattern=r'^[a-z0-9-]+$')
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
-    settings: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
+    settings: Optional[Dict[str, Any]] = None
 
 class TenantCreate(TenantBase):
     """Model for creating a tenant"""
@@ -298,16 +362,17 @@ class Tenant(TenantBase, TimestampMixin):
     """Complete tenant model"""
     id: UUID
     is_active: bool = True
+    metadata: TrustedJSON = Field(default_factory=dict)
+    settings: TrustedJSON = Field(default_factory=dict)
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 class SiteBase(BaseModel):
     """Base site model"""
     name: str = Field(..., min_length=1, max_length=255)
     timezone: str = Field(default="UTC", max_length=50)
-    location: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Address, city, coordinates, etc")
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    location: Optional[Dict[str, Any]] = Field(None, description="Address, city, coordinates, etc")
+    metadata: Optional[Dict[str, Any]] = None
 
 class SiteCreate(SiteBase):
     """Model for creating a site"""
@@ -326,23 +391,24 @@ class Site(SiteBase, TimestampMixin):
     id: UUID
     tenant_id: UUID
     is_active: bool = True
+    location: TrustedJSON = Field(default_factory=dict, description="Address, city, coordinates, etc")
+    metadata: TrustedJSON = Field(default_factory=dict)
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 class UserBase(BaseModel):
     """Base user model"""
     email: str = Field(..., max_length=255)
     name: str = Field(..., min_length=1, max_length=255)
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
 
     @field_validator("email")
     @classmethod
     def validate_email(cls, v):
         """Basic email validation"""
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', v):
+        if not _is_valid_email(v):
             raise ValueError("Invalid email format")
-        return v.lower()
+        return v if v.islower() else v.lower()
 
 class UserCreate(UserBase):
     """Model for creating a user"""
@@ -365,14 +431,14 @@ class User(UserBase, TimestampMixin):
     is_active: bool = True
     email_verified: bool = False
     last_login_at: Optional[datetime] = None
+    metadata: TrustedJSON = Field(default_factory=dict)
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 class UserMembershipBase(BaseModel):
     """Base user membership model"""
     role: UserRole
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
 
 class UserMembershipCreate(UserMembershipBase):
     """Model for creating a user membership"""
@@ -391,15 +457,16 @@ class UserMembership(UserMembershipBase, TimestampMixin):
     user_id: UUID
     tenant_id: UUID
     is_active: bool = True
+    metadata: TrustedJSON = Field(default_factory=dict)
 
-    class Config:
-        orm_mode = True
-        use_enum_values = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True, frozen=True, extra="ignore")
 
 class UserWithMemberships(User):
     """User model with their tenant memberships"""
     memberships: List[UserMembership] = []
 
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True, frozen=True, extra="ignore")
+
 class TenantContext(BaseModel):
     """Current tenant context for authenticated requests"""
     tenant_id: UUID
@@ -413,6 +480,20 @@ class TenantContext(BaseModel):
     # Resolved from JWT or API key
     source: str  # 'jwt' or 'api_key'
 
+    _scopes_set: FrozenSet[str] = PrivateAttr(default=frozenset())
+
+    @model_validator(mode="after")
+    def build_scopes_set(self):
+        """Cache API key scopes as a frozenset for O(1) authorization checks"""
+        if self.api_key_scopes:
+            self._scopes_set = frozenset(self.api_key_scopes)
+        return self
+
+    @property
+    def scopes_set(self) -> FrozenSet[str]:
+        """API key scopes as a frozenset (empty for JWT users)"""
+        return self._scopes_set
+
 # ============================================================
 # Authentication Models
 # ============================================================
@@ -430,7 +511,7 @@ class LoginResponse(BaseModel):
     expires_in: int  # Access token expiry (15 minutes)
     refresh_expires_in: int = 2592000  # Refresh token expiry (30 days)
     user: User
-    tenants: List[Dict[str, Any]]  # Available tenants for this user
+    tenants: SkipValidation[List[Dict[str, Any]]]  # Available tenants for this user
 
 class TokenData(BaseModel):
     """JWT token payload"""
@@ -454,16 +535,16 @@ class RefreshResponse(BaseModel):
 class UserProfileResponse(BaseModel):
     """User profile response"""
     user: User
-    current_tenant: Dict[str, Any]  # Current tenant info with role
-    all_tenants: List[Dict[str, Any]]  # All accessible tenants
+    current_tenant: SkipValidation[Dict[str, Any]]  # Current tenant info with role
+    all_tenants: SkipValidation[List[Dict[str, Any]]]  # All accessible tenants
 
 class UserLimitsResponse(BaseModel):
     """User rate limits and quotas"""
     tenant_id: UUID
     tenant_name: str
-    rate_limits: Dict[str, Any]  # Per-tenant rate limits
-    quotas: Dict[str, Any]  # Resource quotas (spaces, devices, reservations)
-    usage: Dict[str, Any]  # Current usage counts
+    rate_limits: SkipValidation[Dict[str, Any]]  # Per-tenant rate limits
+    quotas: SkipValidation[Dict[str, Any]]  # Resource quotas (spaces, devices, reservations)
+    usage: SkipValidation[Dict[str, Any]]  # Current usage counts
 
 class UserInvite(BaseModel):
     """User invitation model"""
@@ -487,15 +568,17 @@ class RegistrationRequest(BaseModel):
 # API Key Models (Extended for Multi-Tenancy)
 # ============================================================
 
+_DEFAULT_API_KEY_SCOPES = ("spaces:read", "devices:read")
+
 class APIKeyCreate(BaseModel):
     """Model for creating an API key"""
     name: str = Field(..., min_length=1, max_length=100, description="Friendly name for the API key")
     tenant_id: UUID
     scopes: List[str] = Field(
-        default_factory=lambda: ["spaces:read", "devices:read"],
+        default_factory=partial(list, _DEFAULT_API_KEY_SCOPES),
         description="API key scopes (e.g., spaces:read, spaces:write, webhook:ingest)"
     )
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
 
 class APIKeyResponse(BaseModel):
     """Response when creating an API key (includes plain key once)"""
@@ -516,5 +599,28 @@ class APIKey(BaseModel):
     is_active: bool = True
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    _scopes_set: FrozenSet[str] = PrivateAttr(default=frozenset())
+
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
+
+    @model_validator(mode="after")
+    def build_scopes_set(self):
+        """Cache scopes as a frozenset for O(1) authorization checks"""
+        if self.scopes:
+            self._scopes_set = frozenset(self.scopes)
+        return self
+
+    @property
+    def scopes_set(self) -> FrozenSet[str]:
+        """Scopes as a frozenset"""
+        return self._scopes_set
+
+# ============================================================
+# Cached TypeAdapters
+# ============================================================
+
+# Built once at import; validate_python over a whole result set runs the
+# per-row loop inside pydantic-core instead of one Model(**row) call per row
+RESERVATION_LIST_ADAPTER = TypeAdapter(List[Reservation])
+API_KEY_LIST_ADAPTER = TypeAdapter(List[APIKey])
+USER_WITH_MEMBERSHIPS_LIST_ADAPTER = TypeAdapter(List[UserWithMemberships])
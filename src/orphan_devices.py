@@ -3,12 +3,34 @@ Orphan Device Handling
 Tracks uplinks from devices not yet assigned to spaces
 """
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
 
 logger = logging.getLogger(__name__)
 
 
+class OrphanDeviceRow(TypedDict):
+    """Row shape returned by get_orphan_devices"""
+    id: UUID
+    dev_eui: str
+    first_seen: Optional[datetime]
+    last_seen: Optional[datetime]
+    uplink_count: int
+    last_rssi: Optional[int]
+    last_snr: Optional[float]
+    assigned_to_space_id: Optional[UUID]
+    assigned_at: Optional[datetime]
+
+
+# Serializes datetime/UUID values to JSON-ready strings inside pydantic-core
+# (a TypedDict needs no validation pass, only the dump)
+_ORPHAN_LIST_ADAPTER = TypeAdapter(List[OrphanDeviceRow])
+
+
 async def handle_orphan_device(
     db,
     device_eui: str,
@@ -30,7 +52,7 @@ async def handle_orphan_device(
         snr: SNR value (optional)
 
     Returns:
-        Dictionary with orphan device info
+        Dictionary with orphan device info (first_seen/last_seen as datetimes)
     """
     try:
         # Insert or update orphan device record
@@ -59,8 +81,9 @@ async def handle_orphan_device(
             "status": "orphan",
             "device_eui": device_eui,
             "uplink_count": result['uplink_count'],
-            "first_seen": result['first_seen'].isoformat() if result['first_seen'] else None,
-            "last_seen": result['last_seen'].isoformat() if result['last_seen'] else None,
+            # Both set by NOW() above; left as datetimes for the orjson response
+            "first_seen": result['first_seen'],
+            "last_seen": result['last_seen'],
             "assigned": result['assigned_to_space_id'] is not None
         }
 
@@ -137,7 +160,9 @@ async def get_orphan_devices(
             conditions.append("assigned_to_space_id IS NULL")
 
         if since_hours:
-            conditions.append(f"last_seen > NOW() - INTERVAL '{since_hours} hours'")
+            # Bind the value so every since_hours shares one prepared statement
+            params.append(since_hours)
+            conditions.append(f"last_seen > NOW() - ${len(params)} * INTERVAL '1 hour'")
 
         where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
 
@@ -149,30 +174,17 @@ async def get_orphan_devices(
                 last_seen,
                 uplink_count,
                 last_rssi,
-                last_snr,
+                last_snr::float8 AS last_snr,
                 assigned_to_space_id,
                 assigned_at
-            FROM v_orphan_devices
+            FROM orphan_devices
             {where_clause}
             ORDER BY last_seen DESC
         """
 
         rows = await db.fetch(query, *params)
 
-        return [
-            {
-                "id": str(row['id']),
-                "dev_eui": row['dev_eui'],
-                "first_seen": row['first_seen'].isoformat() if row['first_seen'] else None,
-                "last_seen": row['last_seen'].isoformat() if row['last_seen'] else None,
-                "uplink_count": row['uplink_count'],
-                "last_rssi": row['last_rssi'],
-                "last_snr": float(row['last_snr']) if row['last_snr'] else None,
-                "assigned_to_space_id": str(row['assigned_to_space_id']) if row['assigned_to_space_id'] else None,
-                "assigned_at": row['assigned_at'].isoformat() if row['assigned_at'] else None
-            }
-            for row in rows
-        ]
+        return _ORPHAN_LIST_ADAPTER.dump_python([dict(row) for row in rows], mode="json")
 
     except Exception as e:
         logger.error(f"Error fetching orphan devices: {e}")
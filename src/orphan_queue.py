@@ -0,0 +1,134 @@
+"""
+Batched Orphan Device Tracking
+
+Uplinks from devices not assigned to a space are buffered in memory and
+upserted into orphan_devices in one statement per flush window, instead
+of one INSERT ... ON CONFLICT round-trip per uplink.
+"""
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = 0.1
+MAX_BATCH_SIZE = 500
+
+# One row per device: the batch is collapsed in Python first because a single
+# INSERT ... ON CONFLICT cannot update the same row twice
+UPSERT_ORPHANS_SQL = """
+    INSERT INTO orphan_devices (dev_eui, last_payload, last_rssi, last_snr, first_seen, last_seen, uplink_count)
+    SELECT u.dev_eui, u.payload, u.rssi, u.snr, NOW(), NOW(), u.uplinks
+    FROM unnest($1::varchar[], $2::bytea[], $3::int[], $4::float8[], $5::int[])
+        AS u(dev_eui, payload, rssi, snr, uplinks)
+    ON CONFLICT (dev_eui) DO UPDATE SET
+        last_seen = NOW(),
+        uplink_count = orphan_devices.uplink_count + EXCLUDED.uplink_count,
+        last_payload = EXCLUDED.last_payload,
+        last_rssi = EXCLUDED.last_rssi,
+        last_snr = EXCLUDED.last_snr
+    RETURNING dev_eui, uplink_count, first_seen, assigned_to_space_id
+"""
+
+
+class OrphanUplinkQueue:
+    """
+    In-memory batching queue for orphan device uplinks
+
+    Features:
+    - O(1) enqueue on the webhook path (no database latency)
+    - One upsert per flush window (every 100ms or MAX_BATCH_SIZE uplinks)
+    - Repeated uplinks from one device collapse into a single row update
+    - Pending uplinks are flushed on shutdown
+    """
+
+    def __init__(
+        self,
+        db,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        max_batch_size: int = MAX_BATCH_SIZE
+    ):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.running = False
+        self.worker_task: Optional[asyncio.Task] = None
+
+    def put(
+        self,
+        device_eui: str,
+        payload: Optional[bytes] = None,
+        rssi: Optional[int] = None,
+        snr: Optional[float] = None
+    ):
+        """Queue an orphan uplink for the next batch"""
+        self.queue.put_nowait((device_eui, payload, rssi, snr))
+
+    async def start_worker(self):
+        """Start background worker that flushes batches"""
+        if self.running:
+            logger.warning("Orphan queue worker already running")
+            return
+
+        self.running = True
+        self.worker_task = asyncio.create_task(self._worker_loop())
+        logger.info("Orphan queue worker started")
+
+    async def stop_worker(self):
+        """Stop background worker and flush what is left"""
+        if not self.running:
+            return
+
+        self.running = False
+        if self.worker_task:
+            await self.worker_task
+
+        await self.flush()
+        logger.info("Orphan queue worker stopped")
+
+    async def _worker_loop(self):
+        """Background worker that drains the queue every flush interval"""
+        while self.running:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Orphan queue worker error: {e}", exc_info=True)
+
+    async def flush(self):
+        """Upsert all queued uplinks, MAX_BATCH_SIZE uplinks per statement"""
+        while not self.queue.empty():
+            batch: Dict[str, Tuple[Optional[bytes], Optional[int], Optional[float], int]] = {}
+            taken = 0
+            while taken < self.max_batch_size and not self.queue.empty():
+                device_eui, payload, rssi, snr = self.queue.get_nowait()
+                previous = batch.get(device_eui)
+                # Latest uplink wins for last_* columns; count every uplink
+                batch[device_eui] = (payload, rssi, snr, previous[3] + 1 if previous else 1)
+                taken += 1
+
+            await self._upsert(batch)
+
+    async def _upsert(self, batch: Dict[str, Tuple[Optional[bytes], Optional[int], Optional[float], int]]):
+        """Write one collapsed batch and log newly discovered / chatty orphans"""
+        dev_euis = list(batch)
+        payloads, rssis, snrs, counts = (list(column) for column in zip(*batch.values()))
+
+        try:
+            rows = await self.db.fetch(UPSERT_ORPHANS_SQL, dev_euis, payloads, rssis, snrs, counts)
+        except Exception as e:
+            # Orphan tracking is best-effort: never fail ingest over it
+            logger.error(f"Error upserting {len(batch)} orphan devices: {e}")
+            return
+
+        for row in rows:
+            uplinks = batch[row['dev_eui']][3]
+            if row['uplink_count'] == uplinks:
+                logger.info(f"New orphan device discovered: {row['dev_eui']}")
+            elif row['uplink_count'] // 10 > (row['uplink_count'] - uplinks) // 10:
+                # Log every 10th uplink to track active orphans
+                logger.warning(
+                    f"Orphan device {row['dev_eui']} has sent {row['uplink_count']} uplinks "
+                    f"(first seen: {row['first_seen']}, assigned: {row['assigned_to_space_id']})"
+                )
@@ -3,270 +3,284 @@ Optimized database queries with JOINs to prevent N+1 problems
 
 This module contains reusable query functions that fetch related data
 in a single query using JOINs instead of making multiple queries.
+
+The space and reservation listings are async generators reading through a
+server-side cursor. Postgres builds each row's JSON object (json_build_object),
+and the generators yield it as an orjson.Fragment, so rows can be streamed
+straight into the response without any per-field Python work:
+
+    return StreamingResponse(
+        iter_json_array(get_spaces_with_devices(db_pool, tenant_id)),
+        media_type="application/json"
+    )
 """
-from typing import List, Dict, Any, Optional
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 
+import orjson
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per cursor round-trip
+CURSOR_PREFETCH = 256
+
 
 # ============================================================================
 # Spaces Queries (with eager loading)
 # ============================================================================
 
+# Optimized query with all related data fetched in single query; the
+# response object (including nested site/last_reading) is built in SQL
+SPACES_WITH_DEVICES_SQL = """
+    SELECT json_build_object(
+        'id', s.id,
+        'name', s.name,
+        'code', s.code,
+        'building', s.building,
+        'floor', s.floor,
+        'zone', s.zone,
+        'state', s.state,
+        'site_id', s.site_id,
+        'tenant_id', s.tenant_id,
+        'sensor_eui', s.sensor_eui,
+        'display_eui', s.display_eui,
+        'gps_latitude', s.gps_latitude,
+        'gps_longitude', s.gps_longitude,
+        'metadata', s.metadata,
+        'created_at', s.created_at,
+        'updated_at', s.updated_at,
+        'deleted_at', s.deleted_at,
+        -- Site details (LEFT JOIN)
+        'site', CASE WHEN sites.name IS NOT NULL THEN json_build_object(
+            'name', sites.name,
+            'timezone', sites.timezone
+        ) END,
+        -- Last sensor reading (LATERAL JOIN, see below)
+        'last_reading', CASE WHEN last_reading.timestamp IS NOT NULL THEN json_build_object(
+            'timestamp', last_reading.timestamp,
+            'occupied', last_reading.occupied
+        ) END
+    ) AS space
+    FROM spaces s
+    LEFT JOIN sites ON s.site_id = sites.id
+    -- One backward probe of idx_sensor_readings_space_time per space:
+    -- O(spaces * log readings), whereas DISTINCT ON (space_id) would have
+    -- to read every reading of every space before discarding all but one
+    LEFT JOIN LATERAL (
+        SELECT timestamp, occupancy_state = 'OCCUPIED' AS occupied
+        FROM sensor_readings
+        WHERE space_id = s.id
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ) last_reading ON true
+    WHERE s.tenant_id = $1
+      -- Optional filters: NULL disables the predicate, so every filter
+      -- combination shares one statement (parsed/planned once per connection)
+      AND ($2::text IS NULL OR s.building = $2)
+      AND ($3::text IS NULL OR s.floor = $3)
+      AND ($4::text IS NULL OR s.zone = $4)
+      AND ($5::text IS NULL OR s.state = $5)
+      AND ($6::uuid IS NULL OR s.site_id = $6)
+      AND ($7::bool OR s.deleted_at IS NULL)
+    ORDER BY s.code, s.name
+"""
+
+
 async def get_spaces_with_devices(
     db_pool,
     tenant_id: UUID,
     filters: Optional[Dict[str, Any]] = None,
     include_deleted: bool = False
-) -> List[Dict[str, Any]]:
+) -> AsyncIterator[orjson.Fragment]:
     """
-    Fetch spaces with sensor/display info in single query (N+1 prevention)
+    Stream spaces with sensor/display info from a single query (N+1 prevention)
 
     Args:
-        db_pool: Database connection pool
+        db_pool: DatabasePool (rows are read through a cursor in a transaction)
         tenant_id: Tenant ID for filtering
         filters: Optional dict with building, floor, zone, state, site_id
         include_deleted: Whether to include soft-deleted spaces
 
-    Returns:
-        List of space dicts with embedded device information
+    Yields:
+        orjson.Fragment per space (pre-encoded JSON object with embedded
+        site and last_reading details)
 
-    Performance: Single query with LEFT JOINs instead of N+1 pattern
+    Performance: Single query with LEFT JOINs instead of N+1 pattern;
+    rows are encoded by Postgres, so there is no per-field Python work
     """
-    conditions = ["s.tenant_id = $1"]
-    params = [tenant_id]
-    param_count = 2
-
-    if filters:
-        if filters.get("building"):
-            conditions.append(f"s.building = ${param_count}")
-            params.append(filters["building"])
-            param_count += 1
-
-        if filters.get("floor"):
-            conditions.append(f"s.floor = ${param_count}")
-            params.append(filters["floor"])
-            param_count += 1
-
-        if filters.get("zone"):
-            conditions.append(f"s.zone = ${param_count}")
-            params.append(filters["zone"])
-            param_count += 1
-
-        if filters.get("state"):
-            conditions.append(f"s.state = ${param_count}")
-            params.append(filters["state"])
-            param_count += 1
-
-        if filters.get("site_id"):
-            conditions.append(f"s.site_id = ${param_count}")
-            params.append(filters["site_id"])
-            param_count += 1
-
-    if not include_deleted:
-        conditions.append("s.deleted_at IS NULL")
-
-    where_clause = "WHERE " + " AND ".join(conditions)
-
-    # Optimized query with all related data fetched in single query
-    query = f"""
-        SELECT
-            s.id,
-            s.name,
-            s.code,
-            s.building,
-            s.floor,
-            s.zone,
-            s.state,
-            s.site_id,
-            s.tenant_id,
-            s.sensor_eui,
-            s.display_eui,
-            s.gps_latitude,
-            s.gps_longitude,
-            s.metadata,
-            s.created_at,
-            s.updated_at,
-            s.deleted_at,
-            -- Site details (LEFT JOIN)
-            sites.name AS site_name,
-            sites.timezone AS site_timezone,
-            -- Last sensor reading (using LATERAL JOIN for efficiency)
-            last_reading.timestamp AS last_reading_timestamp,
-            last_reading.occupied AS last_reading_occupied
-        FROM spaces s
-        LEFT JOIN sites ON s.site_id = sites.id
-        LEFT JOIN LATERAL (
-            SELECT timestamp, occupied
-            FROM sensor_readings
-            WHERE space_id = s.id
-            ORDER BY timestamp DESC
-            LIMIT 1
-        ) last_reading ON true
-        {where_clause}
-        ORDER BY s.code, s.name
-    """
-
-    results = await db_pool.fetch(query, *params)
-
-    spaces = []
-    for row in results:
-        space = {
-            "id": str(row["id"]),
-            "name": row["name"],
-            "code": row["code"],
-            "building": row["building"],
-            "floor": row["floor"],
-            "zone": row["zone"],
-            "state": row["state"],
-            "site_id": str(row["site_id"]) if row["site_id"] else None,
-            "tenant_id": str(row["tenant_id"]),
-            "sensor_eui": row["sensor_eui"],
-            "display_eui": row["display_eui"],
-            "gps_latitude": float(row["gps_latitude"]) if row["gps_latitude"] else None,
-            "gps_longitude": float(row["gps_longitude"]) if row["gps_longitude"] else None,
-            "metadata": row["metadata"],
-            "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-            "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
-            "deleted_at": row["deleted_at"].isoformat() if row["deleted_at"] else None,
-            # Embedded site details (no additional query needed)
-            "site": {
-                "name": row["site_name"],
-                "timezone": row["site_timezone"]
-            } if row["site_name"] else None,
-            # Last sensor reading (no additional query needed)
-            "last_reading": {
-                "timestamp": row["last_reading_timestamp"].isoformat() if row["last_reading_timestamp"] else None,
-                "occupied": row["last_reading_occupied"]
-            } if row["last_reading_timestamp"] else None
-        }
-        spaces.append(space)
-
-    return spaces
+    filters = filters or {}
+    params = (
+        tenant_id,
+        filters.get("building") or None,
+        filters.get("floor") or None,
+        filters.get("zone") or None,
+        filters.get("state") or None,
+        filters.get("site_id") or None,
+        include_deleted,
+    )
+
+    # Cursors need a transaction; rows arrive in CURSOR_PREFETCH batches so
+    # the caller encodes early rows while later ones are still being read
+    async with db_pool.transaction(tenant_id=tenant_id) as conn:
+        async for row in conn.cursor(SPACES_WITH_DEVICES_SQL, *params, prefetch=CURSOR_PREFETCH):
+            # asyncpg returns json columns as text: embed it as-is
+            yield orjson.Fragment(row["space"])
 
 
 # ============================================================================
 # Reservations Queries (with space details)
 # ============================================================================
 
+# Optimized query with space details in single query; the response
+# object (including the nested space) is built in SQL
+RESERVATIONS_WITH_SPACE_SQL = """
+    SELECT json_build_object(
+        'reservation_id', r.id,
+        'space_id', r.space_id,
+        'start_time', r.start_time,
+        'end_time', r.end_time,
+        'status', r.status,
+        'user_email', r.user_email,
+        'user_phone', r.user_phone,
+        'external_booking_id', r.external_booking_id,
+        'external_system', r.external_system,
+        'metadata', COALESCE(r.metadata, '{}'::jsonb),
+        'created_at', r.created_at,
+        'updated_at', r.updated_at,
+        -- Space details (JOIN) and site details (additional JOIN)
+        'space', json_build_object(
+            'code', s.code,
+            'name', s.name,
+            'building', s.building,
+            'floor', s.floor,
+            'zone', s.zone,
+            'state', s.state,
+            'site_name', sites.name
+        )
+    ) AS reservation
+    FROM reservations r
+    JOIN spaces s ON r.space_id = s.id
+    LEFT JOIN sites ON s.site_id = sites.id
+    WHERE r.tenant_id = $1
+      -- Optional filters: NULL disables the predicate (one shared statement)
+      AND ($2::timestamptz IS NULL OR r.start_time >= $2)
+      AND ($3::timestamptz IS NULL OR r.end_time <= $3)
+      AND ($4::text IS NULL OR r.status = $4)
+    ORDER BY r.start_time DESC
+"""
+
+
 async def get_reservations_with_space(
     db_pool,
     tenant_id: UUID,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
     status_filter: Optional[str] = None
-) -> List[Dict[str, Any]]:
+) -> AsyncIterator[orjson.Fragment]:
     """
-    Fetch reservations with space details in single query (N+1 prevention)
+    Stream reservations with space details from a single query (N+1 prevention)
 
     Args:
-        db_pool: Database connection pool
+        db_pool: DatabasePool (rows are read through a cursor in a transaction)
         tenant_id: Tenant ID for filtering
         date_from: Optional start date filter
         date_to: Optional end date filter
         status_filter: Optional status filter
 
-    Returns:
-        List of reservation dicts with embedded space information
+    Yields:
+        orjson.Fragment per reservation (pre-encoded JSON object with
+        embedded space details)
 
-    Performance: Single query with JOIN instead of N+1 pattern
+    Performance: Single query with JOIN instead of N+1 pattern;
+    rows are encoded by Postgres, so there is no per-field Python work
     """
-    conditions = ["r.tenant_id = $1"]
-    params = [tenant_id]
-    param_count = 2
-
-    if date_from:
-        conditions.append(f"r.start_time >= ${param_count}")
-        params.append(date_from)
-        param_count += 1
-
-    if date_to:
-        conditions.append(f"r.end_time <= ${param_count}")
-        params.append(date_to)
-        param_count += 1
-
-    if status_filter:
-        conditions.append(f"r.status = ${param_count}")
-        params.append(status_filter)
-        param_count += 1
-
-    where_clause = "WHERE " + " AND ".join(conditions)
-
-    # Optimized query with space details in single query
-    query = f"""
-        SELECT
-            r.id as reservation_id,
-            r.space_id,
-            r.start_time,
-            r.end_time,
-            r.status,
-            r.user_email,
-            r.user_phone,
-            r.external_booking_id,
-            r.external_system,
-            r.metadata,
-            r.created_at,
-            r.updated_at,
-            -- Space details (JOIN)
-            s.code as space_code,
-            s.name as space_name,
-            s.building,
-            s.floor,
-            s.zone,
-            s.state as space_state,
-            -- Site details (additional JOIN)
-            sites.name as site_name
-        FROM reservations r
-        JOIN spaces s ON r.space_id = s.id
-        LEFT JOIN sites ON s.site_id = sites.id
-        {where_clause}
-        ORDER BY r.start_time DESC
-    """
-
-    results = await db_pool.fetch(query, *params)
-
-    reservations = []
-    for row in results:
-        reservation = {
-            "reservation_id": str(row["reservation_id"]),
-            "space_id": str(row["space_id"]),
-            "start_time": row["start_time"].isoformat(),
-            "end_time": row["end_time"].isoformat(),
-            "status": row["status"],
-            "user_email": row["user_email"],
-            "user_phone": row["user_phone"],
-            "external_booking_id": row["external_booking_id"],
-            "external_system": row["external_system"],
-            "metadata": row["metadata"] if row["metadata"] else {},
-            "created_at": row["created_at"].isoformat(),
-            "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
-            # Embedded space details (no additional query needed)
-            "space": {
-                "code": row["space_code"],
-                "name": row["space_name"],
-                "building": row["building"],
-                "floor": row["floor"],
-                "zone": row["zone"],
-                "state": row["space_state"],
-                "site_name": row["site_name"]
-            }
-        }
-        reservations.append(reservation)
+    params = (tenant_id, date_from, date_to, status_filter or None)
 
-    return reservations
+    async with db_pool.transaction(tenant_id=tenant_id) as conn:
+        async for row in conn.cursor(RESERVATIONS_WITH_SPACE_SQL, *params, prefetch=CURSOR_PREFETCH):
+            yield orjson.Fragment(row["reservation"])
 
 
 # ============================================================================
 # Sites Queries (with aggregates)
 # ============================================================================
 
+SITES_SQL = """
+    SELECT
+        s.id::text AS id,
+        s.tenant_id::text AS tenant_id,
+        s.name,
+        s.timezone,
+        s.location,
+        s.metadata,
+        s.is_active,
+        s.created_at,
+        s.updated_at
+    FROM sites s
+    WHERE s.tenant_id = $1
+      AND ($2::bool OR s.is_active = true)
+    ORDER BY s.name ASC
+"""
+
+# Aggregate space counts by state (live spaces only), one row per site
+SITE_SPACE_STATS_SQL = """
+    SELECT
+        sp.site_id::text AS site_id,
+        COUNT(*) AS total_spaces,
+        COUNT(*) FILTER (WHERE sp.state = 'FREE') AS free_spaces,
+        COUNT(*) FILTER (WHERE sp.state = 'OCCUPIED') AS occupied_spaces,
+        COUNT(*) FILTER (WHERE sp.state = 'RESERVED') AS reserved_spaces
+    FROM spaces sp
+    WHERE sp.tenant_id = $1 AND sp.deleted_at IS NULL
+    GROUP BY sp.site_id
+"""
+
+
+# Dashboards poll the site list with identical arguments; a few seconds of
+# staleness is fine
+SITES_CACHE_TTL_SECONDS = 5.0
+SITES_CACHE_MAXSIZE = 1024
+
+_sites_cache: Dict[Tuple[str, bool], Tuple[float, List[Dict[str, Any]]]] = {}
+# In-flight fetches, so concurrent misses share one pair of queries (no stampede)
+_sites_inflight: Dict[Tuple[str, bool], asyncio.Task] = {}
+
+
+# Bumped on every invalidation; a fetch started under an older generation
+# may have read pre-invalidation data and must not be stored
+_sites_cache_generation = 0
+
+
+def invalidate_sites_cache(tenant_id: Optional[UUID] = None):
+    """Drop cached site listings for one tenant (or all tenants)"""
+    global _sites_cache_generation
+    _sites_cache_generation += 1
+    if tenant_id is None:
+        _sites_cache.clear()
+        _sites_inflight.clear()
+        return
+    tenant_key = str(tenant_id)
+    for key in [key for key in _sites_cache if key[0] == tenant_key]:
+        del _sites_cache[key]
+    # Later callers start a fresh fetch instead of joining a stale one
+    for key in [key for key in _sites_inflight if key[0] == tenant_key]:
+        del _sites_inflight[key]
+
+
 async def get_sites_with_stats(
     db_pool,
     tenant_id: UUID,
     include_inactive: bool = False
 ) -> List[Dict[str, Any]]:
     """
-    Fetch sites with space counts and state aggregations
+    Fetch sites with space counts and state aggregations (cached for
+    SITES_CACHE_TTL_SECONDS; the returned list is shared, do not mutate it)
 
     Args:
         db_pool: Database connection pool
@@ -275,55 +289,82 @@ async def get_sites_with_stats(
 
     Returns:
         List of site dicts with aggregated space statistics
+        (timestamps are datetimes, encoded by the orjson response class)
 
-    Performance: Single query with GROUP BY instead of multiple queries
-    """
-    active_filter = "" if include_inactive else "AND s.is_active = true"
-
-    # Optimized query with aggregations in single query
-    query = f"""
-        SELECT
-            s.id,
-            s.tenant_id,
-            s.name,
-            s.timezone,
-            s.location,
-            s.metadata,
-            s.is_active,
-            s.created_at,
-            s.updated_at,
-            -- Aggregate space counts by state
-            COUNT(sp.id) FILTER (WHERE sp.deleted_at IS NULL) AS total_spaces,
-            COUNT(sp.id) FILTER (WHERE sp.deleted_at IS NULL AND sp.state = 'FREE') AS free_spaces,
-            COUNT(sp.id) FILTER (WHERE sp.deleted_at IS NULL AND sp.state = 'OCCUPIED') AS occupied_spaces,
-            COUNT(sp.id) FILTER (WHERE sp.deleted_at IS NULL AND sp.state = 'RESERVED') AS reserved_spaces
-        FROM sites s
-        LEFT JOIN spaces sp ON s.id = sp.site_id
-        WHERE s.tenant_id = $1 {active_filter}
-        GROUP BY s.id
-        ORDER BY s.name ASC
+    Performance: The site list and the per-site aggregates are independent
+    queries, run concurrently on two pool connections and merged by site id
     """
+    key = (str(tenant_id), include_inactive)
+    cached = _sites_cache.get(key)
+    if cached and time.monotonic() - cached[0] < SITES_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    task = _sites_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(
+            _fetch_and_cache_sites(db_pool, tenant_id, include_inactive, key, _sites_cache_generation)
+        )
+        _sites_inflight[key] = task
+
+        def _forget(done: asyncio.Task):
+            # An invalidation may already have replaced this entry
+            if _sites_inflight.get(key) is done:
+                del _sites_inflight[key]
+
+        task.add_done_callback(_forget)
+
+    # shield: a cancelled caller must not cancel the fetch others await
+    return await asyncio.shield(task)
+
+
+async def _fetch_and_cache_sites(
+    db_pool,
+    tenant_id: UUID,
+    include_inactive: bool,
+    key: Tuple[str, bool],
+    generation: int
+) -> List[Dict[str, Any]]:
+    """Fetch a site listing and cache it once, unless invalidated meanwhile"""
+    sites = await _fetch_sites_with_stats(db_pool, tenant_id, include_inactive)
+
+    if generation == _sites_cache_generation:
+        if len(_sites_cache) >= SITES_CACHE_MAXSIZE:
+            _sites_cache.clear()
+        _sites_cache[key] = (time.monotonic(), sites)
+    return sites
 
-    results = await db_pool.fetch(query, tenant_id)
+
+async def _fetch_sites_with_stats(
+    db_pool,
+    tenant_id: UUID,
+    include_inactive: bool
+) -> List[Dict[str, Any]]:
+    """Query sites and their aggregates and merge them by site id"""
+    site_rows, stats_rows = await asyncio.gather(
+        fetch_explain_if_slow(db_pool, SITES_SQL, tenant_id, include_inactive),
+        fetch_explain_if_slow(db_pool, SITE_SPACE_STATS_SQL, tenant_id)
+    )
+    stats_by_site = {row["site_id"]: row for row in stats_rows}
 
     sites = []
-    for row in results:
+    for row in site_rows:
+        stats = stats_by_site.get(row["id"])
         site = {
-            "id": str(row["id"]),
-            "tenant_id": str(row["tenant_id"]),
+            "id": row["id"],
+            "tenant_id": row["tenant_id"],
             "name": row["name"],
             "timezone": row["timezone"],
             "location": row["location"] if isinstance(row["location"], dict) else None,
             "metadata": row["metadata"] if isinstance(row["metadata"], dict) else {},
             "is_active": row["is_active"],
-            "created_at": row["created_at"].isoformat(),
-            "updated_at": row["updated_at"].isoformat(),
-            # Space statistics (no additional queries needed)
-            "spaces_count": row["total_spaces"] or 0,
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            # Space statistics (sites without spaces have no stats row)
+            "spaces_count": stats["total_spaces"] if stats else 0,
             "spaces_by_state": {
-                "FREE": row["free_spaces"] or 0,
-                "OCCUPIED": row["occupied_spaces"] or 0,
-                "RESERVED": row["reserved_spaces"] or 0
+                "FREE": stats["free_spaces"] if stats else 0,
+                "OCCUPIED": stats["occupied_spaces"] if stats else 0,
+                "RESERVED": stats["reserved_spaces"] if stats else 0
             }
         }
         sites.append(site)
@@ -353,4 +394,26 @@ async def explain_query(db_pool, query: str, params: List[Any]) -> str:
     """
     explain_query = f"EXPLAIN (ANALYZE, BUFFERS, FORMAT TEXT) {query}"
     result = await db_pool.fetch(explain_query, *params)
-    return "\n".join([row[0] for row in result])
+    return "\n".join(row[0] for row in result)
+
+
+async def fetch_explain_if_slow(db_pool, query: str, *params) -> list:
+    """
+    db_pool.fetch() that logs the query plan when the query was slow
+
+    EXPLAIN ANALYZE executes the query a second time, so it only runs when
+    settings.explain_slow_queries is on and this execution took longer than
+    settings.explain_slow_query_threshold_ms. Use for read queries only.
+    """
+    if not settings.explain_slow_queries:
+        return await db_pool.fetch(query, *params)
+
+    start = time.perf_counter()
+    rows = await db_pool.fetch(query, *params)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if elapsed_ms > settings.explain_slow_query_threshold_ms:
+        plan = await explain_query(db_pool, query, list(params))
+        logger.warning(f"Slow query ({elapsed_ms:.1f}ms), plan:\n{plan}")
+
+    return rows
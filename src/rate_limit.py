@@ -6,8 +6,10 @@ Implements token bucket rate limiting using Redis for:
 - Per-IP rate limiting for unauthenticated requests
 - Configurable limits with burst support
 """
+import hashlib
 import logging
 import time
+from functools import lru_cache
 from typing import Optional, Callable
 from dataclasses import dataclass
 
@@ -18,6 +20,31 @@ import redis.asyncio as redis
 
 logger = logging.getLogger(__name__)
 
+# Token bucket refill + consume in one atomic server-side step
+# KEYS[1] = bucket key; ARGV = now, tokens_per_second, max_tokens, ttl_seconds
+# Returns {allowed (0/1), tokens left as string} (Lua numbers truncate to int)
+TOKEN_BUCKET_LUA = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'last_update')
+local now = tonumber(ARGV[1])
+local max_tokens = tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or max_tokens
+local last_update = tonumber(bucket[2]) or now
+tokens = math.min(max_tokens, tokens + math.max(0, now - last_update) * tonumber(ARGV[2]))
+if tokens >= 1 then
+    tokens = tokens - 1
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last_update', ARGV[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    return {1, tostring(tokens)}
+end
+return {0, tostring(tokens)}
+"""
+
+
+@lru_cache(maxsize=4096)
+def _api_key_bucket(api_key: str) -> str:
+    """Fixed-size bucket id for an API key (128-bit BLAKE2b digest, never the key itself)"""
+    return hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest()
+
 
 @dataclass
 class RateLimitConfig:
@@ -39,6 +66,7 @@ class RateLimiter:
     def __init__(self, redis_url: str):
         self.redis_client: Optional[redis.Redis] = None
         self.redis_url = redis_url
+        self._bucket_script = None
 
     async def initialize(self):
         """Initialize Redis connection"""
@@ -47,6 +75,8 @@ class RateLimiter:
             encoding="utf-8",
             decode_responses=True
         )
+        # Runs via EVALSHA, falling back to EVAL/SCRIPT LOAD on NOSCRIPT
+        self._bucket_script = self.redis_client.register_script(TOKEN_BUCKET_LUA)
         logger.info("Rate limiter initialized with Redis")
 
     async def close(self):
@@ -113,36 +143,16 @@ class RateLimiter:
         max_tokens = config.burst_size
 
         try:
-            # Get current bucket state
-            pipe = self.redis_client.pipeline()
-            pipe.hget(redis_key, "tokens")
-            pipe.hget(redis_key, "last_update")
-            results = await pipe.execute()
-
-            current_tokens = float(results[0]) if results[0] else max_tokens
-            last_update = float(results[1]) if results[1] else now
-
-            # Add tokens based on time elapsed
-            time_passed = now - last_update
-            new_tokens = min(
-                max_tokens,
-                current_tokens + (time_passed * tokens_per_second)
+            # One round-trip: refill, consume and persist the bucket atomically
+            allowed, tokens_left = await self._bucket_script(
+                keys=[redis_key],
+                args=[now, tokens_per_second, max_tokens, 120]  # Expire after 2 minutes of inactivity
             )
+            new_tokens = float(tokens_left)
 
-            # Check if we have at least 1 token
-            logger.debug(f"Rate limit check for {key}: current_tokens={current_tokens}, new_tokens={new_tokens}, time_passed={time_passed}")
-
-            if new_tokens >= 1.0:
-                # Consume 1 token
-                new_tokens -= 1.0
-
-                # Update bucket state
-                pipe = self.redis_client.pipeline()
-                pipe.hset(redis_key, "tokens", str(new_tokens))
-                pipe.hset(redis_key, "last_update", str(now))
-                pipe.expire(redis_key, 120)  # Expire after 2 minutes of inactivity
-                await pipe.execute()
+            logger.debug(f"Rate limit check for {key}: allowed={allowed}, new_tokens={new_tokens}")
 
+            if allowed:
                 # Calculate reset time
                 reset_in = int((max_tokens - new_tokens) / tokens_per_second)
 
@@ -205,7 +215,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         if api_key:
             # Rate limit by API key
-            limit_key = f"api_key:{api_key[:16]}"  # Use first 16 chars as key
+            # Hash the whole key: a 16-char prefix is shared by keys with a
+            # common vendor prefix, which would put tenants in one bucket
+            limit_key = f"api_key:{_api_key_bucket(api_key)}"
             config = self.api_key_config
         else:
             # Rate limit by IP for unauthenticated requests
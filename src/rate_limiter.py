@@ -12,10 +12,11 @@ Features:
 - Decorator-based limit overrides for specific endpoints
 - 429 Too Many Requests responses with retry-after headers
 """
-from typing import Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from fastapi import Request, Response, HTTPException
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+import asyncio
 import time
 import structlog
 from datetime import datetime, timedelta
@@ -26,6 +27,113 @@ from .config import get_settings
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Approximated sliding window over fixed-window counters, all windows in one
+# atomic server-side step. Each window keeps two INCR counters (current and
+# previous fixed bucket); the previous bucket's count is weighted by how much
+# of it still overlaps the sliding window: O(1) memory and work per request.
+# KEYS = (current_bucket, previous_bucket) per window
+# ARGV = now, then (limit, window_seconds) per window
+# Returns {1, 0, remaining_1, ...} when allowed (request counted in every window)
+# or {0, retry_after, window_index, estimated_count} when a window is full
+SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local estimates = {}
+for i = 1, #KEYS / 2 do
+    local limit = tonumber(ARGV[2 * i])
+    local window = tonumber(ARGV[2 * i + 1])
+    local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    local elapsed = (now % window) / window
+    local estimated = previous * (1 - elapsed) + current
+    if estimated >= limit then
+        local retry_after
+        if current < limit then
+            -- Wait for the previous bucket's weight to decay below the headroom
+            retry_after = (1 - (limit - current) / previous - elapsed) * window
+        else
+            -- Current bucket alone is full: wait for it to become the previous
+            -- bucket and decay far enough
+            retry_after = (1 - elapsed) * window + (1 - limit / current) * window
+        end
+        return {0, math.max(1, math.ceil(retry_after)), i, math.floor(estimated)}
+    end
+    estimates[i] = estimated
+end
+local remaining = {}
+for i = 1, #KEYS / 2 do
+    -- Buckets must outlive the following bucket, where they are "previous"
+    if redis.call('INCR', KEYS[2 * i - 1]) == 1 then
+        redis.call('EXPIRE', KEYS[2 * i - 1], 2 * tonumber(ARGV[2 * i + 1]))
+    end
+    remaining[i] = math.max(0, math.floor(tonumber(ARGV[2 * i]) - estimates[i] - 1))
+end
+return {1, 0, unpack(remaining)}
+"""
+
+
+def _bucket_keys(tenant_id: str, window_name: str, window_seconds: int, now: float) -> Tuple[str, str]:
+    """Current and previous fixed-bucket counter keys for a window"""
+    bucket = int(now // window_seconds)
+    prefix = f"rate_limit:{tenant_id}:{window_name}"
+    return f"{prefix}:{bucket}", f"{prefix}:{bucket - 1}"
+
+
+# ============================================================================
+# Redis Script Batching
+# ============================================================================
+
+class ScriptBatcher:
+    """
+    Coalesce concurrent calls of one Lua script into pipelined batches
+
+    Every call submitted during the same event-loop tick is sent in one
+    pipeline (max_batch scripts per round-trip), and each caller gets its
+    own reply back through a Future.
+    """
+
+    def __init__(self, redis_client: redis.Redis, script, max_batch: int = 32):
+        self.redis = redis_client
+        self.script = script  # AsyncScript from register_script
+        self.max_batch = max_batch
+        self._pending: List[Tuple[list, list, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def submit(self, keys: list, args: list):
+        """Queue one script call and wait for its reply"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((keys, args, future))
+        if self._flusher is None:
+            self._flusher = loop.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        """Send everything queued so far, max_batch calls per pipeline"""
+        # Yield once so requests scheduled in this tick join the batch
+        await asyncio.sleep(0)
+        batch, self._pending = self._pending, []
+        self._flusher = None
+
+        for start in range(0, len(batch), self.max_batch):
+            chunk = batch[start:start + self.max_batch]
+            pipe = self.redis.pipeline(transaction=False)
+            for keys, args, _ in chunk:
+                # Queues EVALSHA (pipeline reloads the script on NOSCRIPT)
+                await self.script(keys=keys, args=args, client=pipe)
+
+            try:
+                results = await pipe.execute(raise_on_error=False)
+            except Exception as e:
+                results = [e] * len(chunk)
+
+            for (_, _, future), result in zip(chunk, results):
+                if future.done():  # caller was cancelled
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
 
 # ============================================================================
 # Redis-based Rate Limiter
@@ -35,7 +143,8 @@ class RateLimiter:
     """
     Redis-based rate limiter with sliding window algorithm
 
-    Uses Redis sorted sets to track request timestamps within time windows.
+    Approximates a sliding window from two fixed-window INCR counters per
+    window (current + weighted previous bucket).
     Provides tenant-scoped rate limiting with configurable limits.
     """
 
@@ -56,6 +165,17 @@ class RateLimiter:
             "hour": 3600
         }
 
+        # Runs via EVALSHA, falling back to EVAL/SCRIPT LOAD on NOSCRIPT
+        self._window_script = self.redis.register_script(SLIDING_WINDOW_LUA)
+        # Concurrent requests share pipelined round-trips
+        self._batcher = ScriptBatcher(self.redis, self._window_script)
+
+        # Local "deny until" verdicts per (tenant_id, operation_type): a full
+        # window stays full until its oldest entry expires, so repeat requests
+        # from a throttled tenant are rejected without touching Redis
+        self._deny_until: Dict[Tuple[str, str], float] = {}
+        self._deny_until_maxsize = 10_000
+
         logger.info(
             "rate_limiter_initialized",
             enabled=self.enabled,
@@ -67,7 +187,7 @@ class RateLimiter:
         tenant_id: str,
         operation_type: str = "read",
         custom_limits: Optional[dict] = None
-    ) -> tuple[bool, Optional[int]]:
+    ) -> tuple[bool, Optional[int], Dict[str, dict]]:
         """
         Check if request is within rate limits
 
@@ -77,10 +197,21 @@ class RateLimiter:
             custom_limits: Override default limits (e.g. {"minute": 10})
 
         Returns:
-            (allowed: bool, retry_after_seconds: Optional[int])
+            (allowed: bool, retry_after_seconds: Optional[int],
+             limit_info: {window: {"limit", "remaining"}}, empty when denied)
         """
         if not self.enabled:
-            return True, None
+            return True, None, {}
+
+        now = time.time()
+
+        # Still inside a window Redis already reported as full
+        verdict_key = (tenant_id, operation_type)
+        deny_until = self._deny_until.get(verdict_key)
+        if deny_until is not None:
+            if now < deny_until and not custom_limits:
+                return False, int(deny_until - now) + 1, {}
+            del self._deny_until[verdict_key]
 
         # Determine limits based on operation type
         if operation_type == "write":
@@ -92,46 +223,32 @@ class RateLimiter:
         if custom_limits:
             limits.update(custom_limits)
 
-        now = time.time()
-
-        # Check each time window
-        for window_name, limit in limits.items():
+        # Two counters per window: rate_limit:{tenant_id}:{window}:{bucket}
+        window_names = list(limits)
+        keys = []
+        args = [now]
+        for window_name in window_names:
             window_seconds = self.windows[window_name]
+            keys.extend(_bucket_keys(tenant_id, window_name, window_seconds, now))
+            args.extend((limits[window_name], window_seconds))
 
-            # Redis key: rate_limit:{tenant_id}:{window}
-            key = f"rate_limit:{tenant_id}:{window_name}"
-
-            # Remove old entries outside the window
-            window_start = now - window_seconds
-            await self.redis.zremrangebyscore(key, 0, window_start)
-
-            # Count requests in current window
-            request_count = await self.redis.zcard(key)
-
-            # Check if limit exceeded
-            if request_count >= limit:
-                # Calculate retry-after time (when oldest request expires)
-                oldest_requests = await self.redis.zrange(key, 0, 0, withscores=True)
-                if oldest_requests:
-                    oldest_timestamp = oldest_requests[0][1]
-                    retry_after = int(oldest_timestamp + window_seconds - now) + 1
-
-                    logger.warning(
-                        "rate_limit_exceeded",
-                        tenant_id=tenant_id,
-                        window=window_name,
-                        limit=limit,
-                        current=request_count,
-                        retry_after=retry_after
-                    )
-
-                    return False, retry_after
-
-            # Add current request to sorted set
-            await self.redis.zadd(key, {str(now): now})
+        # One round-trip for every window: estimate, and count if allowed
+        reply = await self._batcher.submit(keys=keys, args=args)
 
-            # Set expiration on key (cleanup)
-            await self.redis.expire(key, window_seconds + 60)
+        if not reply[0]:
+            retry_after = int(reply[1])
+            window_name = window_names[int(reply[2]) - 1]
+            logger.warning(
+                "rate_limit_exceeded",
+                tenant_id=tenant_id,
+                window=window_name,
+                limit=limits[window_name],
+                current=int(reply[3]),
+                retry_after=retry_after
+            )
+            if not custom_limits:
+                self._remember_denial(verdict_key, now + retry_after - 1)
+            return False, retry_after, {}
 
         # All windows passed
         logger.debug(
@@ -140,7 +257,22 @@ class RateLimiter:
             operation_type=operation_type
         )
 
-        return True, None
+        # The script reports what is left in each window once counted
+        limit_info = {
+            window_name: {"limit": limits[window_name], "remaining": int(remaining)}
+            for window_name, remaining in zip(window_names, reply[2:])
+        }
+
+        return True, None, limit_info
+
+    def _remember_denial(self, verdict_key: Tuple[str, str], deny_until: float):
+        """Cache a deny verdict (retry_after is rounded up, so back off 1s)"""
+        if len(self._deny_until) >= self._deny_until_maxsize:
+            now = time.time()
+            self._deny_until = {k: v for k, v in self._deny_until.items() if v > now}
+            if len(self._deny_until) >= self._deny_until_maxsize:
+                self._deny_until.clear()
+        self._deny_until[verdict_key] = deny_until
 
     async def get_limit_info(self, tenant_id: str) -> dict:
         """Get current rate limit status for tenant"""
@@ -149,14 +281,12 @@ class RateLimiter:
 
         for window_name, limit in self.default_limits.items():
             window_seconds = self.windows[window_name]
-            key = f"rate_limit:{tenant_id}:{window_name}"
+            current_key, previous_key = _bucket_keys(tenant_id, window_name, window_seconds, now)
 
-            # Remove old entries
-            window_start = now - window_seconds
-            await self.redis.zremrangebyscore(key, 0, window_start)
-
-            # Count current requests
-            current = await self.redis.zcard(key)
+            # Same sliding-window estimate as SLIDING_WINDOW_LUA
+            current_count, previous_count = await self.redis.mget(current_key, previous_key)
+            elapsed = (now % window_seconds) / window_seconds
+            current = int(int(previous_count or 0) * (1 - elapsed) + int(current_count or 0))
 
             info[window_name] = {
                 "limit": limit,
@@ -209,7 +339,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         operation_type = "write" if request.method in ["POST", "PUT", "PATCH", "DELETE"] else "read"
 
         # Check rate limit
-        allowed, retry_after = await self.rate_limiter.check_limit(
+        allowed, retry_after, limit_info = await self.rate_limiter.check_limit(
             tenant_id=tenant_id,
             operation_type=operation_type
         )
@@ -241,15 +371,14 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 }
             )
 
-        # Add rate limit headers to response
+        # Add rate limit headers to response (counts come from check_limit,
+        # so no further Redis round-trip here; none when limiting is disabled)
         response = await call_next(request)
+        minute_info = limit_info.get("minute")
 
-        # Get current limit info
-        limit_info = await self.rate_limiter.get_limit_info(tenant_id)
-        minute_info = limit_info.get("minute", {})
-
-        response.headers["X-RateLimit-Limit"] = str(minute_info.get("limit", 0))
-        response.headers["X-RateLimit-Remaining"] = str(minute_info.get("remaining", 0))
+        if minute_info:
+            response.headers["X-RateLimit-Limit"] = str(minute_info["limit"])
+            response.headers["X-RateLimit-Remaining"] = str(minute_info["remaining"])
 
         return response
 
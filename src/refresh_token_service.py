@@ -9,31 +9,145 @@ Security features:
 - Automatic cleanup of expired tokens
 """
 
-import secrets
+import asyncio
+import base64
+import os
 import hashlib
-from datetime import datetime, timedelta
+import ssl
+from dataclasses import dataclass
 from typing import Optional, Tuple, Dict, Any
 from uuid import UUID
 import logging
 
 logger = logging.getLogger(__name__)
 
+REFRESH_TOKEN_EXPIRY_DAYS = 30
+REUSE_DETECTION_WINDOW_MINUTES = 5  # Grace period for race conditions
 
+_urlsafe_b64encode = base64.urlsafe_b64encode
+
+# Expiry comes from the database clock rather than a bound timestamp
+_EXPIRES_AT = f"NOW() + INTERVAL '{REFRESH_TOKEN_EXPIRY_DAYS} days'"
+
+INSERT_TOKEN_SQL = f"""
+    INSERT INTO refresh_tokens (
+        user_id,
+        token_hash,
+        device_fingerprint,
+        ip_address,
+        user_agent,
+        expires_at
+    ) VALUES ($1, $2, $3, $4, $5, {_EXPIRES_AT})
+    RETURNING id, expires_at
+"""
+
+# Validate, revoke and issue in one round-trip: the old token is only
+# revoked (and the new one only inserted) if it is still active. The
+# revoke re-checks revoked_at on the live row, so two concurrent
+# refreshes with the same token cannot both rotate it.
+ROTATE_TOKEN_SQL = f"""
+    WITH token AS (
+        SELECT id, user_id, device_fingerprint, expires_at, revoked_at
+        FROM refresh_tokens
+        WHERE token_hash = $1
+    ),
+    revoked AS (
+        UPDATE refresh_tokens r
+        SET revoked_at = NOW(), last_used_at = NOW()
+        FROM token t
+        WHERE r.id = t.id
+          AND r.expires_at = t.expires_at  -- full primary key (partitioned table)
+          AND r.revoked_at IS NULL
+          AND r.expires_at > NOW()
+        RETURNING r.id
+    ),
+    issued AS (
+        INSERT INTO refresh_tokens (
+            user_id,
+            token_hash,
+            device_fingerprint,
+            ip_address,
+            user_agent,
+            expires_at
+        )
+        SELECT t.user_id, $2, $3, $4, $5, {_EXPIRES_AT}
+        FROM token t
+        JOIN revoked ON revoked.id = t.id
+        RETURNING id
+    )
+    SELECT
+        t.id,
+        t.user_id,
+        t.device_fingerprint,
+        EXTRACT(EPOCH FROM NOW() - COALESCE(t.revoked_at, NOW()))::float8 / 60 AS revoked_minutes_ago,
+        -- A token revoked by a concurrent refresh of the same token reads
+        -- as revoked "now", i.e. inside the grace period
+        CASE
+            WHEN t.expires_at <= NOW() THEN 'expired'
+            WHEN revoked.id IS NOT NULL THEN 'ok'
+            WHEN COALESCE(t.revoked_at, NOW())
+                 > NOW() - INTERVAL '{REUSE_DETECTION_WINDOW_MINUTES} minutes' THEN 'grace'
+            ELSE 'breach'
+        END AS status,
+        (SELECT id FROM issued) AS new_token_id
+    FROM token t
+    LEFT JOIN revoked ON revoked.id = t.id
+"""
+
+CLEANUP_BATCH_SIZE = 10000
+PARTITION_MONTHS_AHEAD = 2
+
+# refresh_tokens is partitioned by expiry month (migration 019): fully
+# expired months are dropped whole, upcoming months are created ahead
+MAINTAIN_PARTITIONS_SQL = "SELECT created, dropped FROM maintain_refresh_token_partitions($1)"
+
+# One bounded batch of expired tokens still sitting in a live partition
+# (the current month, or the default partition): short lock hold and small WAL per
+# transaction (ctid lookup is the cheapest way back to the selected rows).
+# A ctid is only unique within one partition, so the outer expiry check
+# keeps a same-ctid row of another partition from being hit unless it has
+# expired too.
+DELETE_EXPIRED_BATCH_SQL = """
+    DELETE FROM refresh_tokens
+    WHERE ctid = ANY(ARRAY(
+        SELECT ctid
+        FROM refresh_tokens
+        WHERE expires_at < NOW()
+        LIMIT $1
+    ))
+      AND expires_at < NOW()
+"""
+
+
+def _parse_affected(tag: Optional[str]) -> int:
+    """Row count from an asyncpg command tag ("UPDATE 3", "DELETE 0")"""
+    return int(tag[tag.rfind(' ') + 1:]) if tag else 0
+
+
+@dataclass(frozen=True, slots=True)
 class RefreshTokenService:
-    """Manages refresh tokens with rotation and reuse detection"""
+    """Manages refresh tokens with rotation and reuse detection (stateless)"""
 
-    EXPIRY_DAYS = 30
-    REUSE_DETECTION_WINDOW_MINUTES = 5  # Grace period for race conditions
+    EXPIRY_DAYS = REFRESH_TOKEN_EXPIRY_DAYS
+    REUSE_DETECTION_WINDOW_MINUTES = REUSE_DETECTION_WINDOW_MINUTES
 
     @staticmethod
-    def generate_token() -> str:
-        """Generate cryptographically secure refresh token (32 bytes = 43 chars base64)"""
-        return secrets.token_urlsafe(32)
+    def generate_token() -> Tuple[str, bytes]:
+        """
+        Generate cryptographically secure refresh token (32 bytes = 43 chars base64)
+
+        Returns:
+            (token, token ASCII bytes) - same format as secrets.token_urlsafe(32)
+            (which is os.urandom + urlsafe base64 without padding, inlined here);
+            the bytes let new tokens be hashed without re-encoding the str
+        """
+        token_bytes = _urlsafe_b64encode(os.urandom(32)).rstrip(b'=')
+        return token_bytes.decode('ascii'), token_bytes
 
     @staticmethod
-    def hash_token(token: str) -> str:
-        """Hash token for secure storage (SHA-256)"""
-        return hashlib.sha256(token.encode()).hexdigest()
+    def hash_token(token: str) -> bytes:
+        """Hash token for secure storage (raw 32-byte SHA-256, stored as BYTEA)"""
+        return hashlib.sha256(token.encode()).digest()
 
     async def create_refresh_token(
         self,
@@ -56,42 +170,28 @@ class RefreshTokenService:
         Returns:
             Plaintext refresh token (only returned once, never stored in plaintext)
         """
-        token = self.generate_token()
-        token_hash = self.hash_token(token)
-        expires_at = datetime.utcnow() + timedelta(days=self.EXPIRY_DAYS)
-
-        query = """
-            INSERT INTO refresh_tokens (
-                user_id,
-                token_hash,
-                device_fingerprint,
-                ip_address,
-                user_agent,
-                expires_at
-            ) VALUES ($1, $2, $3, $4, $5, $6)
-            RETURNING id
-        """
+        token, token_bytes = self.generate_token()
+        token_hash = hashlib.sha256(token_bytes).digest()
 
         try:
             result = await db.fetchrow(
-                query,
+                INSERT_TOKEN_SQL,
                 user_id,
                 token_hash,
                 device_fingerprint,
                 ip_address,
-                user_agent,
-                expires_at
+                user_agent
             )
 
             logger.info(
-                f"Created refresh token for user_id={user_id}, "
-                f"token_id={result['id']}, expires_at={expires_at}"
+                "Created refresh token for user_id=%s, token_id=%s, expires_at=%s",
+                user_id, result['id'], result['expires_at']
             )
 
             return token  # Return plaintext token (only time it's available)
 
         except Exception as e:
-            logger.error(f"Failed to create refresh token for user_id={user_id}: {e}")
+            logger.error("Failed to create refresh token for user_id=%s: %s", user_id, e)
             raise
 
     async def validate_and_rotate(
@@ -121,91 +221,73 @@ class RefreshTokenService:
             Tuple of (user_id, new_refresh_token) or (None, None) if invalid
         """
         token_hash = self.hash_token(token)
-
-        # Fetch token details
-        query = """
-            SELECT
-                id,
-                user_id,
-                device_fingerprint,
-                expires_at,
-                revoked_at,
-                last_used_at
-            FROM refresh_tokens
-            WHERE token_hash = $1
-        """
-
-        token_record = await db.fetchrow(query, token_hash)
+        new_token, new_token_bytes = self.generate_token()
+
+        token_record = await db.fetchrow(
+            ROTATE_TOKEN_SQL,
+            token_hash,
+            hashlib.sha256(new_token_bytes).digest(),
+            device_fingerprint,
+            ip_address,
+            user_agent
+        )
 
         if not token_record:
-            logger.warning(f"Refresh token not found (hash={token_hash[:16]}...)")
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning("Refresh token not found (hash=%s...)", token_hash[:8].hex())
             return None, None
 
         token_id = token_record['id']
         user_id = token_record['user_id']
         stored_fingerprint = token_record['device_fingerprint']
-        expires_at = token_record['expires_at']
-        revoked_at = token_record['revoked_at']
-        last_used_at = token_record['last_used_at']
+        status = token_record['status']
 
-        # Check if token is expired
-        if datetime.utcnow() > expires_at:
-            logger.warning(f"Refresh token expired for user_id={user_id}, token_id={token_id}")
+        if status == 'expired':
+            logger.warning("Refresh token expired for user_id=%s, token_id=%s", user_id, token_id)
             return None, None
 
-        # REUSE DETECTION: Token is revoked but being used again (possible attack)
-        if revoked_at:
-            time_since_revoke = (datetime.utcnow() - revoked_at).total_seconds() / 60
-
-            # If token was revoked recently (within grace period), might be race condition
-            if time_since_revoke < self.REUSE_DETECTION_WINDOW_MINUTES:
-                logger.warning(
-                    f"Refresh token reuse detected (within grace period) for user_id={user_id}, "
-                    f"token_id={token_id}, revoked {time_since_revoke:.1f}m ago"
-                )
-                return None, None
-            else:
-                # Token reuse detected outside grace period - SECURITY BREACH
-                logger.error(
-                    f"SECURITY ALERT: Refresh token reuse detected for user_id={user_id}, "
-                    f"token_id={token_id}, revoked {time_since_revoke:.1f}m ago. "
-                    f"Revoking all tokens for this user/device."
-                )
-
-                # Revoke all tokens for this user + device fingerprint
-                await self.revoke_token_family(
-                    db,
-                    user_id=user_id,
-                    device_fingerprint=stored_fingerprint
-                )
-
-                return None, None
+        # REUSE DETECTION: Token is revoked but being used again (possible attack).
+        # If token was revoked recently (within grace period), might be race condition
+        if status == 'grace':
+            logger.warning(
+                "Refresh token reuse detected (within grace period) for user_id=%s, "
+                "token_id=%s, revoked %.1fm ago",
+                user_id, token_id, token_record['revoked_minutes_ago']
+            )
+            return None, None
+
+        if status == 'breach':
+            # Token reuse detected outside grace period - SECURITY BREACH
+            logger.error(
+                "SECURITY ALERT: Refresh token reuse detected for user_id=%s, "
+                "token_id=%s, revoked %.1fm ago. "
+                "Revoking all tokens for this user/device.",
+                user_id, token_id, token_record['revoked_minutes_ago']
+            )
+
+            # Revoke all tokens for this user + device fingerprint
+            await self.revoke_token_family(
+                db,
+                user_id=user_id,
+                device_fingerprint=stored_fingerprint
+            )
+
+            return None, None
 
         # Check device fingerprint mismatch (possible token theft)
         if stored_fingerprint and device_fingerprint and stored_fingerprint != device_fingerprint:
             logger.warning(
-                f"Device fingerprint mismatch for user_id={user_id}, token_id={token_id}. "
-                f"Expected: {stored_fingerprint[:16]}..., Got: {device_fingerprint[:16]}..."
+                "Device fingerprint mismatch for user_id=%s, token_id=%s. "
+                "Expected: %.16s..., Got: %.16s...",
+                user_id, token_id, stored_fingerprint, device_fingerprint
             )
             # Don't auto-revoke on fingerprint mismatch (user might have new device)
             # But log it for security monitoring
 
-        # Token is valid - rotate it
-        # 1. Revoke old token
-        await self.revoke_token(db, token_id)
-
-        # 2. Create new token
-        new_token = await self.create_refresh_token(
-            db,
-            user_id=user_id,
-            device_fingerprint=device_fingerprint,
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
-
+        # Token was valid - the statement above already rotated it
         logger.info(
-            f"Rotated refresh token for user_id={user_id}, "
-            f"old_token_id={token_id}, new_token_id=(new)"
+            "Rotated refresh token for user_id=%s, old_token_id=%s, new_token_id=%s",
+            user_id, token_id, token_record['new_token_id']
         )
 
         return user_id, new_token
@@ -218,7 +300,7 @@ class RefreshTokenService:
             WHERE id = $1
         """
         await db.execute(query, token_id)
-        logger.info(f"Revoked refresh token_id={token_id}")
+        logger.info("Revoked refresh token_id=%s", token_id)
 
     async def revoke_token_family(
         self,
@@ -255,34 +337,55 @@ class RefreshTokenService:
             """
             result = await db.execute(query, user_id)
 
-        # Extract count from result (format: "UPDATE N")
-        count = int(result.split()[-1]) if result else 0
+        count = _parse_affected(result)
 
         logger.warning(
-            f"Revoked {count} refresh tokens for user_id={user_id}, "
-            f"device_fingerprint={device_fingerprint[:16] + '...' if device_fingerprint else 'all'}"
+            "Revoked %s refresh tokens for user_id=%s, device_fingerprint=%s",
+            count, user_id, f"{device_fingerprint:.16}..." if device_fingerprint else "all"
         )
 
         return count
 
-    async def cleanup_expired_tokens(self, db) -> int:
+    async def maintain_partitions(self, db) -> None:
+        """
+        Create upcoming monthly refresh_tokens partitions and drop fully
+        expired ones
+
+        Runs first in cleanup_expired_tokens (at startup, then hourly); a
+        token expiring past the created months lands in the default
+        partition until the next run.
+        """
+        partitions = await db.fetchrow(MAINTAIN_PARTITIONS_SQL, PARTITION_MONTHS_AHEAD)
+        if partitions['created'] or partitions['dropped']:
+            logger.info(
+                "Refresh token partitions: created %s, dropped %s expired",
+                partitions['created'], partitions['dropped']
+            )
+
+    async def cleanup_expired_tokens(self, db, batch_size: int = CLEANUP_BATCH_SIZE) -> int:
         """
         Delete expired refresh tokens (housekeeping task)
 
-        Should be run periodically (e.g., daily cron job or background task)
+        Should be run periodically (e.g., daily cron job or background task).
+        Drops fully expired monthly partitions (and creates upcoming ones),
+        then deletes the remaining expired rows in batches of batch_size
+        rows, one transaction each.
 
         Returns:
-            Number of tokens deleted
-        """
-        query = """
-            DELETE FROM refresh_tokens
-            WHERE expires_at < NOW()
+            Number of tokens deleted row by row (dropped partitions not counted)
         """
+        await self.maintain_partitions(db)
 
-        result = await db.execute(query)
-        count = int(result.split()[-1]) if result else 0
+        count = 0
+        while True:
+            result = await db.execute(DELETE_EXPIRED_BATCH_SQL, batch_size)
+            deleted = _parse_affected(result)
+            count += deleted
+            if deleted < batch_size:
+                break
+            await asyncio.sleep(0)  # Let other tasks use the pool between batches
 
-        logger.info(f"Cleaned up {count} expired refresh tokens")
+        logger.info("Cleaned up %s expired refresh tokens", count)
 
         return count
 
@@ -340,13 +443,19 @@ class RefreshTokenService:
         return [dict(row) for row in results]
 
 
-# Global singleton instance
-_refresh_token_service: Optional[RefreshTokenService] = None
+def token_hash_backend() -> str:
+    """Describe the SHA-256 implementation behind hash_token (for startup logs)"""
+    # OpenSSL-backed hashes come from _hashlib and use SHA-NI/ARMv8 SHA
+    # instructions where the CPU has them
+    if type(hashlib.sha256()).__module__ == "_hashlib":
+        return ssl.OPENSSL_VERSION
+    return "builtin"
+
+
+# Global singleton instance (stateless, so created at import)
+_REFRESH_TOKEN_SERVICE = RefreshTokenService()
 
 
 def get_refresh_token_service() -> RefreshTokenService:
     """Get global RefreshTokenService instance"""
-    global _refresh_token_service
-    if _refresh_token_service is None:
-        _refresh_token_service = RefreshTokenService()
-    return _refresh_token_service
+    return _REFRESH_TOKEN_SERVICE
@@ -0,0 +1,30 @@
+"""
+JSON response classes backed by orjson
+
+orjson serializes datetime and UUID values natively in C, so endpoints
+returning raw asyncpg values can skip per-row str()/isoformat() calls.
+"""
+from typing import Any, AsyncIterator
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+# Naive datetimes are treated as UTC and UTC offsets are rendered as "Z"
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONResponse(ORJSONResponse):
+    """Default API response class (orjson with UTC datetime handling)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+async def iter_json_array(items: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Encode an async stream of items as a JSON array, one element at a time"""
+    yield b"["
+    separator = b""
+    async for item in items:
+        yield separator + orjson.dumps(item, option=ORJSON_OPTIONS)
+        separator = b","
+    yield b"]"
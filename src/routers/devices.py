@@ -3,23 +3,398 @@ Devices Router - CRUD API for sensor and display devices
 Manages both sensor_devices and display_devices tables
 Multi-tenancy enabled with tenant scoping
 Device profiles are read from ChirpStack (source of truth)
+
+Listing indexes: migration 023 (enabled devices by created_at, id and
+orphan devices per table), 020 (tenant scoping join) and 022 (assigned
+space by EUI)
 """
-from fastapi import APIRouter, HTTPException, Query, Request, Depends
+from fastapi import APIRouter, HTTPException, Query, Request, Depends, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Awaitable, Callable
+import base64
 import logging
+import time
+from contextlib import AsyncExitStack
+from functools import lru_cache
 from uuid import UUID
 from datetime import datetime
 
 from ..models import TenantContext
+from ..responses import FastJSONResponse, iter_json_array
 from ..tenant_auth import get_current_tenant, require_viewer, require_admin
 from ..api_scopes import require_scopes
 
 router = APIRouter(prefix="/api/v1/devices", tags=["devices"])
 logger = logging.getLogger(__name__)
 
+# One dependency instance for the router. Like require_viewer, it resolves
+# the tenant through get_current_tenant, which FastAPI caches per request,
+# so the scope and role checks share a single tenant lookup
+require_devices_read = require_scopes("devices:read")
+
+# Rows per round-trip when streaming the full device metadata listing
+METADATA_PREFETCH = 1000
+
+# Paged listings (limit given) return the keyset of the page's last row in
+# this header; the body stays a plain JSON array for existing clients
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+# Devices per round-trip when streaming list_devices (one ChirpStack lookup each)
+LIST_DEVICES_BATCH_SIZE = 100
+
+# ChirpStack name/description/profile for a batch of EUIs. ChirpStack
+# stores dev_eui as bytea; matching the raw bytes (not an encode()
+# expression) lets each EUI probe the device primary key
+CHIRPSTACK_DEVICES_SQL = """
+    SELECT
+        d.dev_eui,
+        d.name,
+        COALESCE(d.description, '') AS description,
+        dp.name as device_profile_name
+    FROM device d
+    LEFT JOIN device_profile dp ON d.device_profile_id = dp.id
+    WHERE d.dev_eui = ANY($1::bytea[])
+"""
+
+# list_devices / get_device select both categories' columns; these belong
+# to the other one
+_OTHER_CATEGORY_COLUMNS = {
+    "sensor": ("display_codes", "fport", "confirmed_downlinks"),
+    "display": ("payload_decoder", "capabilities"),
+}
+
+# device_types is reference data that changes with deployments, not traffic;
+# a trigger (migration 021) also clears the cache on writes via
+# BackgroundTaskManager, so the TTL only bounds staleness across processes
+# that missed a notification
+DEVICE_TYPES_CACHE_TTL_SECONDS = 300.0
+
+DEVICE_CATEGORIES = ("sensor", "display")
+
+# Keyed by None (all) or one of DEVICE_CATEGORIES
+_device_types_cache: Dict[Optional[str], tuple[float, List[Dict[str, Any]]]] = {}
+
+# ChirpStack device profiles are edited by hand in the ChirpStack admin UI
+# (no change notification); POST /cache/invalidate clears them early
+CHIRPSTACK_PROFILES_CACHE_TTL_SECONDS = 60.0
+
+_chirpstack_profiles_cache: Optional[tuple[float, List[Dict[str, Any]]]] = None
+
+# One statement text whether or not a category is given, so every call
+# reuses the same prepared statement
+DEVICE_TYPES_SQL = """
+    SELECT
+        id::text AS id,
+        type_code,
+        category,
+        name,
+        manufacturer,
+        handler_class,
+        default_config,
+        capabilities,
+        enabled,
+        status,
+        chirpstack_profile_name,
+        created_at,
+        updated_at
+    FROM device_types
+    WHERE enabled = true
+      AND ($1::text IS NULL OR category = $1)
+    ORDER BY category, name
+"""
+
+GET_DEVICE_SQL = """
+    WITH dev AS (
+        SELECT
+            id::text AS id,
+            dev_eui as deveui,
+            'sensor' as category,
+            device_type,
+            device_model,
+            manufacturer,
+            payload_decoder,
+            capabilities,
+            NULL as display_codes,
+            NULL as fport,
+            NULL as confirmed_downlinks,
+            enabled,
+            status,
+            last_seen_at,
+            created_at,
+            updated_at
+        FROM sensor_devices
+        WHERE dev_eui = $1
+        UNION ALL
+        SELECT
+            id::text AS id,
+            dev_eui as deveui,
+            'display' as category,
+            device_type,
+            device_model,
+            manufacturer,
+            NULL as payload_decoder,
+            NULL as capabilities,
+            display_codes,
+            fport,
+            confirmed_downlinks,
+            enabled,
+            status,
+            last_seen_at,
+            created_at,
+            updated_at
+        FROM display_devices
+        WHERE dev_eui = $1
+        -- UNION results sort by output column only: 'sensor' > 'display'
+        ORDER BY category DESC
+        LIMIT 1
+    )
+    SELECT dev.*, sp.id::text AS space_id, sp.name AS space_name, sp.code AS space_code
+    FROM dev
+    -- Per-column equality (not a CASE expression) so each side can use
+    -- its spaces EUI index
+    LEFT JOIN LATERAL (
+        SELECT id, name, code
+        FROM spaces
+        WHERE deleted_at IS NULL
+          AND ((dev.category = 'sensor' AND sensor_eui = dev.deveui)
+               OR (dev.category = 'display' AND display_eui = dev.deveui))
+        LIMIT 1
+    ) sp ON true
+"""
+
+# Columns update_device may set, in SET clause order
+UPDATABLE_DEVICE_FIELDS = ("device_type", "device_model", "manufacturer", "enabled", "status")
+
+
+@lru_cache(maxsize=64)
+def _update_device_sql(fields: tuple) -> str:
+    """
+    Writable-CTE UPDATE for one set of UPDATABLE_DEVICE_FIELDS ($1 = dev_eui,
+    then one parameter per field). Sensor first, display only if no sensor
+    matched. The text is identical for identical field sets, so asyncpg's
+    statement cache reuses the prepared statement across requests.
+    """
+    set_clause = ", ".join(
+        ["updated_at = NOW()"] + [f"{f} = ${i}" for i, f in enumerate(fields, start=2)]
+    )
+    return f"""
+        WITH s AS (
+            UPDATE sensor_devices
+            SET {set_clause}
+            WHERE dev_eui = $1
+            RETURNING dev_eui, 'sensor' AS category
+        ),
+        d AS (
+            UPDATE display_devices
+            SET {set_clause}
+            WHERE dev_eui = $1
+              AND NOT EXISTS (SELECT 1 FROM s)
+            RETURNING dev_eui, 'display' AS category
+        )
+        SELECT dev_eui, category FROM s
+        UNION ALL
+        SELECT dev_eui, category FROM d
+    """
+
+
+ARCHIVE_DEVICE_SQL = """
+    WITH s AS (
+        UPDATE sensor_devices
+        SET enabled = false, updated_at = NOW()
+        WHERE dev_eui = $1
+        RETURNING dev_eui, 'sensor' AS category
+    ),
+    d AS (
+        UPDATE display_devices
+        SET enabled = false, updated_at = NOW()
+        WHERE dev_eui = $1
+          AND NOT EXISTS (SELECT 1 FROM s)
+        RETURNING dev_eui, 'display' AS category
+    )
+    SELECT dev_eui, category FROM s
+    UNION ALL
+    SELECT dev_eui, category FROM d
+"""
+
+
+def _encode_cursor(created_at: datetime, device_id) -> str:
+    """Opaque keyset cursor for the (created_at, id) of a page's last row"""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{device_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of _encode_cursor; 400 on anything it did not produce"""
+    try:
+        created_at, device_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(device_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _keyset_clause(cursor: Optional[str], params: list, alias: str) -> Optional[str]:
+    """Append the cursor's keyset to params; returns the matching condition"""
+    if cursor is None:
+        return None
+    params.extend(_decode_cursor(cursor))
+    return f"({alias}.created_at, {alias}.id) < (${len(params) - 1}, ${len(params)})"
+
+
+@lru_cache(maxsize=128)
+def _list_devices_sql(
+    categories: tuple,
+    tenant_placeholder: Optional[str],
+    include_orphans: bool,
+    conditions: tuple,
+    ordered: bool = True,
+) -> str:
+    """
+    list_devices statement for one filter shape. The caller numbers the
+    placeholders as it appends the parameters (tenant_placeholder and the
+    WHERE conditions), so identical filter shapes give identical text: the
+    string is built once and asyncpg's statement cache reuses the prepared
+    plan across requests. Unordered statements leave out the ORDER BY and
+    return rows as they are scanned.
+    """
+    # Both categories share one parameter list; each branch formats in its
+    # space column
+    join_clause = ""
+    conditions = list(conditions)
+
+    # Platform admin sees ALL devices (no tenant scoping)
+    if tenant_placeholder:
+        # Tenant scoping: include devices assigned to tenant's spaces or orphans.
+        # A join (rather than a correlated EXISTS under OR) lets the planner
+        # hash the tenant's spaces once; an EUI is on at most one active
+        # space (unique_sensor_eui, 001; uq_spaces_display_eui, 008), so the
+        # join never duplicates devices
+        tenant_join = f"""JOIN spaces s
+            ON s.{{eui_column}} = d.dev_eui
+            AND s.tenant_id = {tenant_placeholder}
+            AND s.deleted_at IS NULL"""
+        if include_orphans:
+            join_clause = "LEFT " + tenant_join
+            conditions.insert(0, "(d.status = 'orphan' OR s.id IS NOT NULL)")
+        else:
+            join_clause = tenant_join
+
+    scope_clause = join_clause + ("\n WHERE " + " AND ".join(conditions) if conditions else "")
+
+    # Aligned column lists; the other category's columns are NULL (typed
+    # by the UNION from the branch that has them)
+    branches = []
+    if 'sensor' in categories:
+        branches.append(f"""
+            SELECT
+                d.id,
+                d.dev_eui as deveui,
+                d.device_type,
+                d.device_model,
+                d.manufacturer,
+                d.payload_decoder,
+                d.capabilities,
+                NULL as display_codes,
+                NULL as fport,
+                NULL as confirmed_downlinks,
+                d.enabled,
+                d.last_seen_at,
+                d.created_at,
+                d.updated_at,
+                d.status,
+                'sensor' as category
+            FROM sensor_devices d
+            {scope_clause.format(eui_column="sensor_eui")}
+        """)
+
+    if 'display' in categories:
+        branches.append(f"""
+            SELECT
+                d.id,
+                d.dev_eui as deveui,
+                d.device_type,
+                d.device_model,
+                d.manufacturer,
+                NULL as payload_decoder,
+                NULL as capabilities,
+                d.display_codes,
+                d.fport,
+                d.confirmed_downlinks,
+                d.enabled,
+                d.last_seen_at,
+                d.created_at,
+                d.updated_at,
+                d.status,
+                'display' as category
+            FROM display_devices d
+            {scope_clause.format(eui_column="display_eui")}
+        """)
+
+    # One statement (one round-trip, one parse/plan) for both categories
+    query = "SELECT * FROM (" + " UNION ALL ".join(branches) + ") devices"
+    if not ordered:
+        return query
+    # id breaks created_at ties so pages never skip or repeat a device.
+    # Enabled-only listings can merge the per-table index order (migration
+    # 023) instead of sorting the combined set
+    return query + " ORDER BY created_at DESC, id DESC"
+
+
+async def _stream_json_rows(
+    db_pool,
+    query: str,
+    params: list,
+    batch_size: int,
+    build: Callable[[list], Awaitable[List[Dict[str, Any]]]],
+    on_done: Callable[[int], None],
+) -> StreamingResponse:
+    """
+    Stream query results as a JSON array from a server-side cursor, one
+    batch of rows (built into response items by build) at a time.
+
+    The transaction, the cursor and the first batch are set up before the
+    response is returned, so a database or ChirpStack failure there still
+    raises into the endpoint (and becomes a 500). Once the 200 and the
+    opening bracket are sent, a later failure can only cut the body short.
+    """
+    # Cursors need a transaction, held open until the stream ends
+    stack = AsyncExitStack()
+    conn = await stack.enter_async_context(db_pool.transaction())
+    try:
+        rows_cursor = await conn.cursor(query, *params)
+        rows = await rows_cursor.fetch(batch_size)
+        first_batch = await build(rows) if rows else []
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    async def items():
+        count = 0
+        async with stack:
+            batch = first_batch
+            while batch:
+                for item in batch:
+                    yield item
+                count += len(batch)
+                rows = await rows_cursor.fetch(batch_size)
+                batch = await build(rows) if rows else []
+        on_done(count)
+
+    return StreamingResponse(iter_json_array(items()), media_type="application/json")
+
+
+def invalidate_device_types_cache():
+    """Drop cached device type listings (all categories)"""
+    _device_types_cache.clear()
 
-@router.get("/device-types", response_model=List[Dict[str, Any]])
+
+def invalidate_chirpstack_profiles_cache():
+    """Drop the cached ChirpStack device profile listing"""
+    global _chirpstack_profiles_cache
+    _chirpstack_profiles_cache = None
+
+
+@router.get("/device-types")
 async def list_device_types(
     request: Request,
     category: Optional[str] = Query(None, description="Filter by category: 'sensor' or 'display'")
@@ -28,68 +403,36 @@ async def list_device_types(
     List all device types
 
     Returns device type definitions from device_types table
+    (cached per category for DEVICE_TYPES_CACHE_TTL_SECONDS)
     """
-    try:
-        db_pool = request.app.state.db_pool
+    # Only known categories reach the cache, so its size stays bounded
+    category = category or None
+    if category is not None and category not in DEVICE_CATEGORIES:
+        raise HTTPException(status_code=400, detail="category must be 'sensor' or 'display'")
 
-        conditions = ["enabled = true"]
-        params = []
+    cached = _device_types_cache.get(category)
+    if cached and time.monotonic() - cached[0] < DEVICE_TYPES_CACHE_TTL_SECONDS:
+        return FastJSONResponse(content=cached[1])
 
-        if category:
-            conditions.append(f"category = ${len(params) + 1}")
-            params.append(category)
-
-        where_clause = "WHERE " + " AND ".join(conditions)
+    try:
+        db_pool = request.app.state.db_pool
 
-        query = f"""
-            SELECT
-                id,
-                type_code,
-                category,
-                name,
-                manufacturer,
-                handler_class,
-                default_config,
-                capabilities,
-                enabled,
-                status,
-                chirpstack_profile_name,
-                created_at,
-                updated_at
-            FROM device_types
-            {where_clause}
-            ORDER BY category, name
-        """
+        results = await db_pool.fetch(DEVICE_TYPES_SQL, category)
 
-        results = await db_pool.fetch(query, *params)
-
-        device_types = []
-        for row in results:
-            device_types.append({
-                "id": str(row["id"]),
-                "type_code": row["type_code"],
-                "category": row["category"],
-                "name": row["name"],
-                "manufacturer": row["manufacturer"],
-                "handler_class": row["handler_class"],
-                "default_config": row["default_config"],
-                "capabilities": row["capabilities"],
-                "enabled": row["enabled"],
-                "status": row["status"],
-                "chirpstack_profile_name": row["chirpstack_profile_name"],
-                "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
-            })
+        # Columns are selected in response order and shape (id cast in SQL)
+        device_types = [dict(row) for row in results]
+        _device_types_cache[category] = (time.monotonic(), device_types)
 
         logger.info(f"List device types: count={len(device_types)} category={category}")
-        return device_types
+        # Returned as a response so FastAPI skips its jsonable_encoder pass
+        return FastJSONResponse(content=device_types)
 
     except Exception as e:
         logger.error(f"Error listing device types: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/chirpstack-profiles", response_model=List[Dict[str, Any]])
+@router.get("/chirpstack-profiles")
 async def list_chirpstack_device_profiles(request: Request):
     """
     List all device profiles from ChirpStack
@@ -97,18 +440,25 @@ async def list_chirpstack_device_profiles(request: Request):
     Device profiles are the source of truth for device types in ChirpStack.
     This is read-only data - device profiles must be managed in ChirpStack admin interface.
 
-    Returns list of device profiles with id and name.
+    Returns list of device profiles with id and name
+    (cached for CHIRPSTACK_PROFILES_CACHE_TTL_SECONDS).
     """
+    global _chirpstack_profiles_cache
+    cached = _chirpstack_profiles_cache
+    if cached and time.monotonic() - cached[0] < CHIRPSTACK_PROFILES_CACHE_TTL_SECONDS:
+        return FastJSONResponse(content=cached[1])
+
     try:
         chirpstack_pool = request.app.state.chirpstack_client.pool
 
+        # Columns in response order and shape; orjson encodes the UUID id
         query = """
             SELECT
                 id,
                 name,
-                description,
-                region,
-                mac_version,
+                COALESCE(description, '') AS description,
+                COALESCE(region, '') AS region,
+                COALESCE(mac_version, '') AS mac_version,
                 supports_otaa,
                 supports_class_b,
                 supports_class_c
@@ -117,29 +467,34 @@ async def list_chirpstack_device_profiles(request: Request):
         """
 
         results = await chirpstack_pool.fetch(query)
-
-        profiles = []
-        for row in results:
-            profiles.append({
-                "id": str(row["id"]),
-                "name": row["name"],
-                "description": row["description"] if row["description"] else "",
-                "region": row["region"] if row["region"] else "",
-                "mac_version": row["mac_version"] if row["mac_version"] else "",
-                "supports_otaa": row["supports_otaa"],
-                "supports_class_b": row["supports_class_b"],
-                "supports_class_c": row["supports_class_c"]
-            })
+        profiles = [dict(row) for row in results]
+        _chirpstack_profiles_cache = (time.monotonic(), profiles)
 
         logger.info(f"List ChirpStack device profiles: count={len(profiles)}")
-        return profiles
+        return FastJSONResponse(content=profiles)
 
     except Exception as e:
         logger.error(f"Error listing ChirpStack device profiles: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch device profiles from ChirpStack: {str(e)}")
 
 
-@router.get("/", response_model=List[Dict[str, Any]], dependencies=[Depends(require_scopes("devices:read"))])
+@router.post("/cache/invalidate")
+async def invalidate_device_caches(tenant: TenantContext = Depends(require_admin)):
+    """
+    Clear the cached device type and ChirpStack profile listings
+
+    Use after editing device profiles in ChirpStack; device_types writes
+    already clear their cache through a database notification.
+
+    Requires: ADMIN role or higher
+    """
+    invalidate_device_types_cache()
+    invalidate_chirpstack_profiles_cache()
+    logger.info(f"[{tenant.tenant_id}] Device listing caches invalidated")
+    return {"status": "invalidated"}
+
+
+@router.get("/", dependencies=[Depends(require_devices_read)])
 async def list_devices(
     request: Request,
     device_type: Optional[str] = Query(None, description="Filter by device_type (sensor/display)"),
@@ -148,6 +503,9 @@ async def list_devices(
     enabled: Optional[bool] = Query(None, description="Filter by enabled flag"),
     include_archived: bool = Query(False, description="Include disabled devices"),
     include_orphans: bool = Query(True, description="Include orphan (unassigned) devices"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit for all devices)"),
+    cursor: Optional[str] = Query(None, description=f"{NEXT_CURSOR_HEADER} of the previous page"),
+    unordered: bool = Query(False, description="Skip newest-first ordering (ignored when paginating)"),
     tenant: TenantContext = Depends(require_viewer)
 ):
     """
@@ -160,6 +518,12 @@ async def list_devices(
 
     Each device has a 'category' field indicating 'sensor' or 'display'
 
+    Pagination: with limit, returns at most limit devices (newest first) and,
+    if more remain, their continuation in the X-Next-Cursor header; pass it
+    back as cursor for the next page. Without limit, all devices are
+    streamed; unordered=true streams them in storage order, skipping the
+    sort.
+
     Requires: VIEWER role or higher, API key requires devices:read scope
     """
     try:
@@ -168,7 +532,6 @@ async def list_devices(
 
         db_pool = request.app.state.db_pool
         chirpstack_pool = request.app.state.chirpstack_client.pool
-        devices = []
 
         # Check if user is platform admin
         PLATFORM_TENANT_ID = UUID('00000000-0000-0000-0000-000000000000')
@@ -178,250 +541,108 @@ async def list_devices(
         )
 
         # Determine which device categories to fetch
-        categories_to_fetch = []
-        if device_category == 'sensor':
-            categories_to_fetch = ['sensor']
-        elif device_category == 'display':
-            categories_to_fetch = ['display']
+        if device_category in ('sensor', 'display'):
+            categories = (device_category,)
         else:
-            categories_to_fetch = ['sensor', 'display']
-
-        # Fetch sensor devices (tenant-scoped OR platform admin)
-        if 'sensor' in categories_to_fetch:
-            sensor_conditions = []
-            sensor_params = []
-            param_count = 1
-
-            # Platform admin sees ALL devices
-            if is_platform_admin:
-                # No tenant scoping for platform admin
-                pass
-            else:
-                # Regular tenant scoping
-                sensor_params.append(tenant.tenant_id)
-                # Tenant scoping: include devices assigned to tenant's spaces or orphans
-                if include_orphans:
-                    sensor_conditions.append("""(
-                        sd.status = 'orphan' OR
-                        EXISTS (
-                            SELECT 1 FROM spaces s
-                            WHERE s.sensor_eui = sd.dev_eui
-                            AND s.tenant_id = $1
-                            AND s.deleted_at IS NULL
-                        )
-                    )""")
-                    param_count = 2
-                else:
-                    sensor_conditions.append("""EXISTS (
-                        SELECT 1 FROM spaces s
-                        WHERE s.sensor_eui = sd.dev_eui
-                        AND s.tenant_id = $1
-                        AND s.deleted_at IS NULL
-                    )""")
-                    param_count = 2
-
-            if device_type is not None:
-                sensor_conditions.append(f"sd.device_type = ${param_count}")
-                sensor_params.append(device_type)
-                param_count += 1
-
-            if status is not None:
-                sensor_conditions.append(f"sd.status = ${param_count}")
-                sensor_params.append(status)
-                param_count += 1
-
-            if enabled is not None:
-                sensor_conditions.append(f"sd.enabled = ${param_count}")
-                sensor_params.append(enabled)
-                param_count += 1
-            elif not include_archived:
-                sensor_conditions.append("sd.enabled = true")
-
-            where_clause = "WHERE " + " AND ".join(sensor_conditions)
-
-            sensor_query = f"""
-                SELECT
-                    sd.id,
-                    sd.dev_eui as deveui,
-                    sd.device_type,
-                    sd.device_model,
-                    sd.manufacturer,
-                    sd.payload_decoder,
-                    sd.capabilities,
-                    sd.enabled,
-                    sd.last_seen_at,
-                    sd.created_at,
-                    sd.updated_at,
-                    sd.status,
-                    'sensor' as category
-                FROM sensor_devices sd
-                {where_clause}
-                ORDER BY sd.created_at DESC
-            """
-
-            sensor_results = await db_pool.fetch(sensor_query, *sensor_params)
-            access_type = "PLATFORM_ADMIN" if is_platform_admin else "TENANT"
-            logger.info(f"[{access_type}:{tenant.tenant_id}] Found {len(sensor_results)} sensor devices")
-
-            for row in sensor_results:
-                dev_eui_upper = row["deveui"].upper()
-
-                # Fetch device name, description, and device profile from ChirpStack
-                cs_device = await chirpstack_pool.fetchrow("""
-                    SELECT
-                        d.name,
-                        d.description,
-                        dp.name as device_profile_name
-                    FROM device d
-                    LEFT JOIN device_profile dp ON d.device_profile_id = dp.id
-                    WHERE UPPER(encode(d.dev_eui, 'hex')) = $1
-                """, dev_eui_upper)
-
-                # Use ChirpStack device profile name as device_type (authoritative)
-                # Fall back to parking_v5 device_type if not in ChirpStack
-                device_type = cs_device["device_profile_name"] if (cs_device and cs_device["device_profile_name"]) else row["device_type"]
-
-                devices.append({
-                    "id": str(row["id"]),
-                    "deveui": row["deveui"],
-                    "category": "sensor",
-                    "device_type": device_type,  # From ChirpStack device profile (authoritative)
-                    "device_model": row["device_model"],
-                    "manufacturer": row["manufacturer"],
-                    "payload_decoder": row["payload_decoder"],
-                    "capabilities": row["capabilities"],
-                    "enabled": row["enabled"],
-                    "status": row["status"],
-                    "name": cs_device["name"] if cs_device else row["deveui"],  # From ChirpStack
-                    "description": cs_device["description"] if (cs_device and cs_device["description"]) else "",  # From ChirpStack (for site assignment)
-                    "last_seen_at": row["last_seen_at"].isoformat() if row["last_seen_at"] else None,
-                    "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                    "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
-                })
-
-        # Fetch display devices (tenant-scoped OR platform admin)
-        if 'display' in categories_to_fetch:
-            display_conditions = []
-            display_params = []
-            param_count = 1
-
-            # Platform admin sees ALL devices
-            if is_platform_admin:
-                # No tenant scoping for platform admin
-                pass
-            else:
-                # Regular tenant scoping
-                display_params.append(tenant.tenant_id)
-                # Tenant scoping: include devices assigned to tenant's spaces or orphans
-                if include_orphans:
-                    display_conditions.append("""(
-                        dd.status = 'orphan' OR
-                        EXISTS (
-                            SELECT 1 FROM spaces s
-                            WHERE s.display_eui = dd.dev_eui
-                            AND s.tenant_id = $1
-                            AND s.deleted_at IS NULL
-                        )
-                    )""")
-                    param_count = 2
+            categories = ('sensor', 'display')
+
+        # Each filter appends its parameter and its condition together, so
+        # the placeholder numbers always match the parameter list
+        params = []
+        conditions = []
+        tenant_placeholder = None
+        if not is_platform_admin:
+            params.append(tenant.tenant_id)
+            tenant_placeholder = f"${len(params)}"
+
+        if device_type is not None:
+            params.append(device_type)
+            conditions.append(f"d.device_type = ${len(params)}")
+
+        if status is not None:
+            params.append(status)
+            conditions.append(f"d.status = ${len(params)}")
+
+        if enabled is not None:
+            params.append(enabled)
+            conditions.append(f"d.enabled = ${len(params)}")
+        elif not include_archived:
+            conditions.append("d.enabled = true")
+
+        keyset = _keyset_clause(cursor, params, "d")
+        if keyset:
+            conditions.append(keyset)
+
+        query = _list_devices_sql(
+            categories,
+            tenant_placeholder,
+            include_orphans,
+            tuple(conditions),
+            # Pages are only well-defined in (created_at, id) order
+            ordered=not unordered or limit is not None or cursor is not None,
+        )
+
+        access_type = "PLATFORM_ADMIN" if is_platform_admin else "TENANT"
+
+        async def build_devices(rows) -> List[Dict[str, Any]]:
+            # Name, description and device profile for the whole batch from
+            # ChirpStack in one query
+            # Platform EUIs are validated, upper-case hex (DevEUIMixin, migration 011)
+            euis = [bytes.fromhex(row["deveui"]) for row in rows]
+            cs_rows = await chirpstack_pool.fetch(CHIRPSTACK_DEVICES_SQL, euis)
+            cs_devices = {cs_row["dev_eui"]: cs_row for cs_row in cs_rows}
+
+            devices = []
+            for row, eui in zip(rows, euis):
+                cs_device = cs_devices.get(eui)
+                # Copy the whole record in one C-level pass (columns are already
+                # named for the response; orjson encodes the UUID id) and only
+                # patch the derived fields
+                device = dict(row)
+                # Drop the other category's (NULL) columns
+                for column in _OTHER_CATEGORY_COLUMNS[device["category"]]:
+                    del device[column]
+                if cs_device:
+                    # Use ChirpStack device profile name as device_type (authoritative)
+                    # Fall back to parking_v5 device_type if not in ChirpStack
+                    if cs_device["device_profile_name"]:
+                        device["device_type"] = cs_device["device_profile_name"]
+                    # Name and description (for site assignment) from ChirpStack
+                    device["name"] = cs_device["name"]
+                    device["description"] = cs_device["description"]
                 else:
-                    display_conditions.append("""EXISTS (
-                        SELECT 1 FROM spaces s
-                        WHERE s.display_eui = dd.dev_eui
-                        AND s.tenant_id = $1
-                        AND s.deleted_at IS NULL
-                    )""")
-                    param_count = 2
-
-            if device_type is not None:
-                display_conditions.append(f"dd.device_type = ${param_count}")
-                display_params.append(device_type)
-                param_count += 1
-
-            if status is not None:
-                display_conditions.append(f"dd.status = ${param_count}")
-                display_params.append(status)
-                param_count += 1
-
-            if enabled is not None:
-                display_conditions.append(f"dd.enabled = ${param_count}")
-                display_params.append(enabled)
-                param_count += 1
-            elif not include_archived:
-                display_conditions.append("dd.enabled = true")
-
-            where_clause = "WHERE " + " AND ".join(display_conditions)
-
-            display_query = f"""
-                SELECT
-                    dd.id,
-                    dd.dev_eui as deveui,
-                    dd.device_type,
-                    dd.device_model,
-                    dd.manufacturer,
-                    dd.display_codes,
-                    dd.fport,
-                    dd.confirmed_downlinks,
-                    dd.enabled,
-                    dd.last_seen_at,
-                    dd.created_at,
-                    dd.updated_at,
-                    dd.status,
-                    'display' as category
-                FROM display_devices dd
-                {where_clause}
-                ORDER BY dd.created_at DESC
-            """
-
-            display_results = await db_pool.fetch(display_query, *display_params)
-            logger.info(f"[{access_type}:{tenant.tenant_id}] Found {len(display_results)} display devices")
-
-            for row in display_results:
-                dev_eui_upper = row["deveui"].upper()
-
-                # Fetch device name, description, and device profile from ChirpStack
-                cs_device = await chirpstack_pool.fetchrow("""
-                    SELECT
-                        d.name,
-                        d.description,
-                        dp.name as device_profile_name
-                    FROM device d
-                    LEFT JOIN device_profile dp ON d.device_profile_id = dp.id
-                    WHERE UPPER(encode(d.dev_eui, 'hex')) = $1
-                """, dev_eui_upper)
-
-                # Use ChirpStack device profile name as device_type (authoritative)
-                # Fall back to parking_v5 device_type if not in ChirpStack
-                device_type = cs_device["device_profile_name"] if (cs_device and cs_device["device_profile_name"]) else row["device_type"]
-
-                devices.append({
-                    "id": str(row["id"]),
-                    "deveui": row["deveui"],
-                    "category": "display",
-                    "device_type": device_type,  # From ChirpStack device profile (authoritative)
-                    "device_model": row["device_model"],
-                    "manufacturer": row["manufacturer"],
-                    "display_codes": row["display_codes"],
-                    "fport": row["fport"],
-                    "confirmed_downlinks": row["confirmed_downlinks"],
-                    "enabled": row["enabled"],
-                    "status": row["status"],
-                    "name": cs_device["name"] if cs_device else row["deveui"],  # From ChirpStack
-                    "description": cs_device["description"] if (cs_device and cs_device["description"]) else "",  # From ChirpStack (for site assignment)
-                    "last_seen_at": row["last_seen_at"].isoformat() if row["last_seen_at"] else None,
-                    "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                    "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
-                })
-
-        logger.info(f"[{access_type}:{tenant.tenant_id}] List devices: count={len(devices)} category_filter={device_category}")
-        return devices
+                    device["name"] = device["deveui"]
+                    device["description"] = ""
+                devices.append(device)
+            return devices
+
+        if limit is not None:
+            # One extra row tells whether another page follows
+            rows = await db_pool.fetch(f"{query} LIMIT ${len(params) + 1}", *params, limit + 1)
+            devices = await build_devices(rows[:limit]) if rows else []
+            headers = None
+            if len(rows) > limit:
+                last = rows[limit - 1]
+                headers = {NEXT_CURSOR_HEADER: _encode_cursor(last["created_at"], last["id"])}
+
+            logger.info(f"[{access_type}:{tenant.tenant_id}] List devices: count={len(devices)} category_filter={device_category}")
+            return FastJSONResponse(content=devices, headers=headers)
+
+        # Stream the array so memory stays bounded to one batch of rows (one
+        # ChirpStack query each); orjson serializes the raw datetime values
+        return await _stream_json_rows(
+            db_pool, query, params, LIST_DEVICES_BATCH_SIZE, build_devices,
+            lambda count: logger.info(f"[{access_type}:{tenant.tenant_id}] List devices: count={count} category_filter={device_category}")
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing devices: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{deveui}", response_model=Dict[str, Any])
+@router.get("/{deveui}")
 async def get_device(
     request: Request,
     deveui: str
@@ -434,111 +655,23 @@ async def get_device(
     try:
         db_pool = request.app.state.db_pool
 
-        # Try sensor_devices first
-        sensor_query = """
-            SELECT
-                id,
-                dev_eui as deveui,
-                device_type,
-                device_model,
-                manufacturer,
-                payload_decoder,
-                capabilities,
-                enabled,
-                last_seen_at,
-                created_at,
-                updated_at,
-                status,
-                'sensor' as category
-            FROM sensor_devices
-            WHERE dev_eui = $1
-        """
-
-        device = await db_pool.fetchrow(sensor_query, deveui)
+        # Both tables and the assigned space in one round-trip; sensor wins if
+        # the EUI is (unexpectedly) in both tables
+        device = await db_pool.fetchrow(GET_DEVICE_SQL, deveui)
 
         if device:
-            # Check if assigned to a space
-            space_query = """
-                SELECT id, name, code
-                FROM spaces
-                WHERE sensor_eui = $1 AND deleted_at IS NULL
-            """
-            space = await db_pool.fetchrow(space_query, deveui)
-
-            return {
-                "id": str(device["id"]),
-                "deveui": device["deveui"],
-                "category": "sensor",
-                "device_type": device["device_type"],
-                "device_model": device["device_model"],
-                "manufacturer": device["manufacturer"],
-                "payload_decoder": device["payload_decoder"],
-                "capabilities": device["capabilities"],
-                "enabled": device["enabled"],
-                "status": device["status"],
-                "last_seen_at": device["last_seen_at"].isoformat() if device["last_seen_at"] else None,
-                "created_at": device["created_at"].isoformat() if device["created_at"] else None,
-                "updated_at": device["updated_at"].isoformat() if device["updated_at"] else None,
-                "assigned_space": {
-                    "id": str(space["id"]),
-                    "name": space["name"],
-                    "code": space["code"]
-                } if space else None
-            }
-
-        # Try display_devices
-        display_query = """
-            SELECT
-                id,
-                dev_eui as deveui,
-                device_type,
-                device_model,
-                manufacturer,
-                display_codes,
-                fport,
-                confirmed_downlinks,
-                enabled,
-                last_seen_at,
-                created_at,
-                updated_at,
-                status,
-                'display' as category
-            FROM display_devices
-            WHERE dev_eui = $1
-        """
-
-        device = await db_pool.fetchrow(display_query, deveui)
-
-        if device:
-            # Check if assigned to a space
-            space_query = """
-                SELECT id, name, code
-                FROM spaces
-                WHERE display_eui = $1 AND deleted_at IS NULL
-            """
-            space = await db_pool.fetchrow(space_query, deveui)
-
-            return {
-                "id": str(device["id"]),
-                "deveui": device["deveui"],
-                "category": "display",
-                "device_type": device["device_type"],
-                "device_model": device["device_model"],
-                "manufacturer": device["manufacturer"],
-                "display_codes": device["display_codes"],
-                "fport": device["fport"],
-                "confirmed_downlinks": device["confirmed_downlinks"],
-                "enabled": device["enabled"],
-                "status": device["status"],
-                "last_seen_at": device["last_seen_at"].isoformat() if device["last_seen_at"] else None,
-                "created_at": device["created_at"].isoformat() if device["created_at"] else None,
-                "updated_at": device["updated_at"].isoformat() if device["updated_at"] else None,
-                "assigned_space": {
-                    "id": str(space["id"]),
-                    "name": space["name"],
-                    "code": space["code"]
-                } if space else None
-            }
+            device = dict(device)
+            for column in _OTHER_CATEGORY_COLUMNS[device["category"]]:
+                del device[column]
+            space_id = device.pop("space_id")
+            space_name = device.pop("space_name")
+            space_code = device.pop("space_code")
+            device["assigned_space"] = {
+                "id": space_id,
+                "name": space_name,
+                "code": space_code
+            } if space_id else None
+            return FastJSONResponse(content=device)
 
         raise HTTPException(status_code=404, detail=f"Device {deveui} not found")
 
@@ -549,103 +682,117 @@ async def get_device(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/full-metadata", response_model=List[Dict[str, Any]])
-async def get_device_metadata(request: Request):
+@router.get("/full-metadata")
+async def get_device_metadata(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit for all devices)"),
+    cursor: Optional[str] = Query(None, description=f"{NEXT_CURSOR_HEADER} of the previous page")
+):
     """
     Get full metadata for all devices including assignment status
 
-    Compatible with V4 API format
+    Compatible with V4 API format. Paginated like list_devices (limit,
+    cursor, X-Next-Cursor header); without limit, all devices are streamed.
     """
     try:
         db_pool = request.app.state.db_pool
 
-        # Get all sensors with space assignments
-        sensor_query = """
-            SELECT
-                sd.dev_eui as deveui,
-                sd.device_type,
-                sd.device_model,
-                sd.manufacturer,
-                sd.enabled,
-                sd.status,
-                sd.last_seen_at,
-                s.id as space_id,
-                s.name as space_name,
-                s.code as space_code,
-                'sensor' as category
-            FROM sensor_devices sd
-            LEFT JOIN spaces s ON s.sensor_eui = sd.dev_eui AND s.deleted_at IS NULL
-            WHERE sd.enabled = true
-            ORDER BY sd.created_at DESC
-        """
-
-        sensors = await db_pool.fetch(sensor_query)
+        params = []
+        keyset = _keyset_clause(cursor, params, "dev")
 
-        # Get all displays with space assignments
-        display_query = """
-            SELECT
-                dd.dev_eui as deveui,
-                dd.device_type,
-                dd.device_model,
-                dd.manufacturer,
-                dd.enabled,
-                dd.status,
-                dd.last_seen_at,
-                s.id as space_id,
-                s.name as space_name,
-                s.code as space_code,
-                'display' as category
-            FROM display_devices dd
-            LEFT JOIN spaces s ON s.display_eui = dd.dev_eui AND s.deleted_at IS NULL
-            WHERE dd.enabled = true
-            ORDER BY dd.created_at DESC
+        # Sensors and displays with their space assignments, newest first.
+        # Each assignment is a one-row probe of the covering spaces EUI
+        # indexes (migration 022) rather than a join over all spaces.
+        # created_at/id are the pagination key and are not part of the V4 shape
+        query = f"""
+            SELECT * FROM (
+                SELECT
+                    sd.dev_eui as deveui,
+                    'sensor' as category,
+                    sd.device_type,
+                    sd.device_model,
+                    sd.manufacturer,
+                    sd.enabled,
+                    sd.status,
+                    sd.status as lifecycle_state,  -- V4 compatibility
+                    sd.last_seen_at,
+                    s.id::text as location_id,
+                    s.name as location_name,
+                    s.id IS NOT NULL as assigned,
+                    sd.created_at,
+                    sd.id
+                FROM sensor_devices sd
+                LEFT JOIN LATERAL (
+                    SELECT id, name
+                    FROM spaces
+                    WHERE sensor_eui = sd.dev_eui AND deleted_at IS NULL
+                    LIMIT 1
+                ) s ON true
+                WHERE sd.enabled = true
+                UNION ALL
+                SELECT
+                    dd.dev_eui as deveui,
+                    'display' as category,
+                    dd.device_type,
+                    dd.device_model,
+                    dd.manufacturer,
+                    dd.enabled,
+                    dd.status,
+                    dd.status as lifecycle_state,  -- V4 compatibility
+                    dd.last_seen_at,
+                    s.id::text as location_id,
+                    s.name as location_name,
+                    s.id IS NOT NULL as assigned,
+                    dd.created_at,
+                    dd.id
+                FROM display_devices dd
+                LEFT JOIN LATERAL (
+                    SELECT id, name
+                    FROM spaces
+                    WHERE display_eui = dd.dev_eui AND deleted_at IS NULL
+                    LIMIT 1
+                ) s ON true
+                WHERE dd.enabled = true
+            ) dev
+            {"WHERE " + keyset if keyset else ""}
+            ORDER BY created_at DESC, id DESC
         """
 
-        displays = await db_pool.fetch(display_query)
-
-        devices = []
-
-        for row in sensors:
-            devices.append({
-                "deveui": row["deveui"],
-                "category": "sensor",
-                "device_type": row["device_type"],
-                "device_model": row["device_model"],
-                "manufacturer": row["manufacturer"],
-                "enabled": row["enabled"],
-                "status": row["status"],
-                "lifecycle_state": row["status"],  # V4 compatibility
-                "last_seen_at": row["last_seen_at"].isoformat() if row["last_seen_at"] else None,
-                "location_id": str(row["space_id"]) if row["space_id"] else None,
-                "location_name": row["space_name"],
-                "assigned": row["space_id"] is not None
-            })
-
-        for row in displays:
-            devices.append({
-                "deveui": row["deveui"],
-                "category": "display",
-                "device_type": row["device_type"],
-                "device_model": row["device_model"],
-                "manufacturer": row["manufacturer"],
-                "enabled": row["enabled"],
-                "status": row["status"],
-                "lifecycle_state": row["status"],  # V4 compatibility
-                "last_seen_at": row["last_seen_at"].isoformat() if row["last_seen_at"] else None,
-                "location_id": str(row["space_id"]) if row["space_id"] else None,
-                "location_name": row["space_name"],
-                "assigned": row["space_id"] is not None
-            })
-
-        logger.info(f"Device metadata: count={len(devices)}")
-        return devices
+        def to_metadata(row) -> Dict[str, Any]:
+            # Rows already have the V4 response shape (derived fields computed in SQL)
+            device = dict(row)
+            del device["created_at"], device["id"]
+            return device
+
+        if limit is not None:
+            # One extra row tells whether another page follows
+            rows = await db_pool.fetch(f"{query} LIMIT ${len(params) + 1}", *params, limit + 1)
+            headers = None
+            if len(rows) > limit:
+                last = rows[limit - 1]
+                headers = {NEXT_CURSOR_HEADER: _encode_cursor(last["created_at"], last["id"])}
+
+            logger.info(f"Device metadata: count={min(len(rows), limit)}")
+            return FastJSONResponse(content=[to_metadata(row) for row in rows[:limit]], headers=headers)
+
+        async def build_metadata(rows) -> List[Dict[str, Any]]:
+            return [to_metadata(row) for row in rows]
+
+        # A server-side cursor pages the rows in, so memory stays at one
+        # page however many devices there are
+        return await _stream_json_rows(
+            db_pool, query, params, METADATA_PREFETCH, build_metadata,
+            lambda count: logger.info(f"Device metadata: count={count}")
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting device metadata: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.put("/{deveui}", response_model=Dict[str, Any])
+@router.put("/{deveui}")
 async def update_device(
     request: Request,
     deveui: str,
@@ -659,122 +806,21 @@ async def update_device(
     try:
         db_pool = request.app.state.db_pool
 
-        # Check if it's a sensor
-        sensor_exists = await db_pool.fetchval(
-            "SELECT id FROM sensor_devices WHERE dev_eui = $1",
-            deveui
-        )
+        fields = tuple(f for f in UPDATABLE_DEVICE_FIELDS if f in update_data)
+        if not fields:
+            raise HTTPException(status_code=400, detail="No fields to update")
 
-        if sensor_exists:
-            # Update sensor device
-            updates = []
-            params = []
-            param_count = 1
-
-            updates.append("updated_at = NOW()")
-
-            if "device_type" in update_data:
-                updates.append(f"device_type = ${param_count}")
-                params.append(update_data["device_type"])
-                param_count += 1
-
-            if "device_model" in update_data:
-                updates.append(f"device_model = ${param_count}")
-                params.append(update_data["device_model"])
-                param_count += 1
-
-            if "manufacturer" in update_data:
-                updates.append(f"manufacturer = ${param_count}")
-                params.append(update_data["manufacturer"])
-                param_count += 1
-
-            if "enabled" in update_data:
-                updates.append(f"enabled = ${param_count}")
-                params.append(update_data["enabled"])
-                param_count += 1
-
-            if "status" in update_data:
-                updates.append(f"status = ${param_count}")
-                params.append(update_data["status"])
-                param_count += 1
-
-            if not updates or updates == ["updated_at = NOW()"]:
-                raise HTTPException(status_code=400, detail="No fields to update")
-
-            params.append(deveui)
-            update_query = f"""
-                UPDATE sensor_devices
-                SET {", ".join(updates)}
-                WHERE dev_eui = ${param_count}
-                RETURNING dev_eui
-            """
-
-            result = await db_pool.fetchrow(update_query, *params)
-            logger.info(f"Updated sensor device: {deveui}")
+        update_query = _update_device_sql(fields)
+        params = [update_data[f] for f in fields]
 
-            return {
-                "status": "updated",
-                "deveui": result["dev_eui"],
-                "category": "sensor"
-            }
-
-        # Check if it's a display
-        display_exists = await db_pool.fetchval(
-            "SELECT id FROM display_devices WHERE dev_eui = $1",
-            deveui
-        )
-
-        if display_exists:
-            # Update display device
-            updates = []
-            params = []
-            param_count = 1
-
-            updates.append("updated_at = NOW()")
-
-            if "device_type" in update_data:
-                updates.append(f"device_type = ${param_count}")
-                params.append(update_data["device_type"])
-                param_count += 1
-
-            if "device_model" in update_data:
-                updates.append(f"device_model = ${param_count}")
-                params.append(update_data["device_model"])
-                param_count += 1
-
-            if "manufacturer" in update_data:
-                updates.append(f"manufacturer = ${param_count}")
-                params.append(update_data["manufacturer"])
-                param_count += 1
-
-            if "enabled" in update_data:
-                updates.append(f"enabled = ${param_count}")
-                params.append(update_data["enabled"])
-                param_count += 1
-
-            if "status" in update_data:
-                updates.append(f"status = ${param_count}")
-                params.append(update_data["status"])
-                param_count += 1
-
-            if not updates or updates == ["updated_at = NOW()"]:
-                raise HTTPException(status_code=400, detail="No fields to update")
-
-            params.append(deveui)
-            update_query = f"""
-                UPDATE display_devices
-                SET {", ".join(updates)}
-                WHERE dev_eui = ${param_count}
-                RETURNING dev_eui
-            """
-
-            result = await db_pool.fetchrow(update_query, *params)
-            logger.info(f"Updated display device: {deveui}")
+        result = await db_pool.fetchrow(update_query, deveui, *params)
 
+        if result:
+            logger.info(f"Updated {result['category']} device: {deveui}")
             return {
                 "status": "updated",
                 "deveui": result["dev_eui"],
-                "category": "display"
+                "category": result["category"]
             }
 
         raise HTTPException(status_code=404, detail=f"Device {deveui} not found")
@@ -786,7 +832,7 @@ async def update_device(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.patch("/{deveui}/archive", response_model=Dict[str, Any])
+@router.patch("/{deveui}/archive")
 async def archive_device(
     request: Request,
     deveui: str,
@@ -800,36 +846,15 @@ async def archive_device(
     try:
         db_pool = request.app.state.db_pool
 
-        # Try sensor first
-        sensor_result = await db_pool.fetchrow("""
-            UPDATE sensor_devices
-            SET enabled = false, updated_at = NOW()
-            WHERE dev_eui = $1
-            RETURNING dev_eui
-        """, deveui)
+        # Sensor first, display only if no sensor matched: one statement
+        result = await db_pool.fetchrow(ARCHIVE_DEVICE_SQL, deveui)
 
-        if sensor_result:
-            logger.info(f"Archived sensor device: {deveui}")
+        if result:
+            logger.info(f"Archived {result['category']} device: {deveui}")
             return {
                 "status": "archived",
-                "deveui": sensor_result["dev_eui"],
-                "category": "sensor"
-            }
-
-        # Try display
-        display_result = await db_pool.fetchrow("""
-            UPDATE display_devices
-            SET enabled = false, updated_at = NOW()
-            WHERE dev_eui = $1
-            RETURNING dev_eui
-        """, deveui)
-
-        if display_result:
-            logger.info(f"Archived display device: {deveui}")
-            return {
-                "status": "archived",
-                "deveui": display_result["dev_eui"],
-                "category": "display"
+                "deveui": result["dev_eui"],
+                "category": result["category"]
             }
 
         raise HTTPException(status_code=404, detail=f"Device {deveui} not found")
@@ -847,7 +872,7 @@ class DeviceUpdate(BaseModel):
     tags: Optional[Dict[str, Any]] = None
 
 
-@router.patch("/{deveui}/description", response_model=Dict[str, Any])
+@router.patch("/{deveui}/description")
 async def update_device_description(
     request: Request,
     deveui: str,
@@ -872,17 +897,23 @@ async def update_device_description(
     try:
         chirpstack_pool = request.app.state.chirpstack_client.pool
 
-        # Convert hex EUI to bytea for query
-        deveui_upper = deveui.upper()
+        # Convert hex EUI to bytea for query (primary key lookup)
+        try:
+            dev_eui = bytes.fromhex(deveui)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid device EUI: {deveui}"
+            )
 
         # Check device exists
         check_query = """
             SELECT tags, description
             FROM device
-            WHERE encode(dev_eui, 'hex') = $1
+            WHERE dev_eui = $1
         """
 
-        current = await chirpstack_pool.fetchrow(check_query, deveui_upper.lower())
+        current = await chirpstack_pool.fetchrow(check_query, dev_eui)
 
         if not current:
             raise HTTPException(
@@ -917,12 +948,12 @@ async def update_device_description(
 
         # Always update updated_at
         update_fields.append("updated_at = NOW()")
-        params.append(deveui_upper.lower())
+        params.append(dev_eui)
 
         update_query = f"""
             UPDATE device
             SET {', '.join(update_fields)}
-            WHERE encode(dev_eui, 'hex') = ${param_count}
+            WHERE dev_eui = ${param_count}
             RETURNING
                 encode(dev_eui, 'hex') as dev_eui,
                 name,
@@ -940,7 +971,7 @@ async def update_device_description(
             "name": result["name"],
             "description": result["description"],
             "tags": result["tags"] if result["tags"] else {},
-            "updated_at": result["updated_at"].isoformat()
+            "updated_at": result["updated_at"]
         }
 
     except HTTPException:
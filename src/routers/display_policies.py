@@ -2,7 +2,7 @@
 # Display Policy Management API for V5.3 Smart Parking Platform
 
 from fastapi import APIRouter, Request, HTTPException, status, Depends
-from typing import Optional, Dict, Any, List
+from typing import Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
@@ -81,7 +81,7 @@ class AdminOverrideCreate(BaseModel):
 # Display Policy Endpoints
 # ============================================================
 
-@router.get("/", response_model=List[Dict[str, Any]])
+@router.get("/")
 async def list_display_policies(
     request: Request,
     tenant_id: Optional[uuid.UUID] = None
@@ -161,7 +161,7 @@ async def list_display_policies(
         )
 
 
-@router.get("/{policy_id}", response_model=Dict[str, Any])
+@router.get("/{policy_id}")
 async def get_display_policy(
     request: Request,
     policy_id: uuid.UUID
@@ -506,7 +506,7 @@ async def delete_admin_override(
         )
 
 
-@router.get("/spaces/{space_id}/computed-state", response_model=Dict[str, Any])
+@router.get("/spaces/{space_id}/computed-state")
 async def get_computed_display_state(
     request: Request,
     space_id: uuid.UUID
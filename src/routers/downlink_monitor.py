@@ -2,7 +2,7 @@
 # Downlink Queue Monitoring API
 
 from fastapi import APIRouter, Request, HTTPException, status
-from typing import Dict, Any, List
+from typing import List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,7 +10,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/downlinks", tags=["downlinks"])
 
 
-@router.get("/queue/metrics", response_model=Dict[str, Any])
+@router.get("/queue/metrics")
 async def get_queue_metrics(request: Request):
     """
     Get downlink queue metrics
@@ -62,7 +62,7 @@ async def get_queue_metrics(request: Request):
         )
 
 
-@router.get("/queue/health", response_model=Dict[str, Any])
+@router.get("/queue/health")
 async def get_queue_health(request: Request):
     """
     Get downlink queue health status
@@ -3,10 +3,12 @@
 # Queries ChirpStack database for gateway information
 
 from fastapi import APIRouter, Request, Query, HTTPException, status, Body
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any
 from datetime import datetime
 from pydantic import BaseModel
 
+from ..responses import FastJSONResponse
+
 router = APIRouter(prefix="/api/v1/gateways", tags=["gateways"])
 
 
@@ -15,7 +17,7 @@ class GatewayUpdate(BaseModel):
     description: Optional[str] = None
     tags: Optional[Dict[str, Any]] = None
 
-@router.get("/", response_model=List[Dict[str, Any]])
+@router.get("/")
 async def list_gateways(
     request: Request,
     includeArchived: Optional[bool] = Query(False, description="Include archived gateways")
@@ -66,9 +68,9 @@ async def list_gateways(
                 "latitude": row["latitude"],
                 "longitude": row["longitude"],
                 "altitude": row["altitude"],
-                "last_seen_at": row["last_seen_at"].isoformat() if row["last_seen_at"] else None,
-                "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
+                "last_seen_at": row["last_seen_at"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
                 "tags": row["tags"] if row["tags"] else {},
                 "properties": row["properties"] if row["properties"] else {},
                 "is_online": is_online,
@@ -76,7 +78,8 @@ async def list_gateways(
             }
             gateways.append(gateway)
 
-        return gateways
+        # Return the response directly so orjson serializes the raw datetimes
+        return FastJSONResponse(content=gateways)
 
     except Exception as e:
         raise HTTPException(
@@ -84,7 +87,7 @@ async def list_gateways(
             detail=f"Failed to fetch gateways from ChirpStack: {str(e)}"
         )
 
-@router.get("/{gw_eui}", response_model=Dict[str, Any])
+@router.get("/{gw_eui}")
 async def get_gateway(
     request: Request,
     gw_eui: str
@@ -159,7 +162,7 @@ async def get_gateway(
             detail=f"Failed to fetch gateway: {str(e)}"
         )
 
-@router.get("/stats/summary", response_model=Dict[str, Any])
+@router.get("/stats/summary")
 async def get_gateway_stats(request: Request):
     """
     Get summary statistics about gateways
@@ -195,7 +198,7 @@ async def get_gateway_stats(request: Request):
         )
 
 
-@router.patch("/{gw_eui}", response_model=Dict[str, Any])
+@router.patch("/{gw_eui}")
 async def update_gateway(
     request: Request,
     gw_eui: str,
@@ -4,7 +4,7 @@ Metrics Router - Prometheus Endpoint
 Exposes /metrics endpoint for Prometheus scraping
 """
 from fastapi import APIRouter, Response
-from ..metrics import get_metrics_text, get_metrics_content_type
+from ..metrics import get_metrics_text, METRICS_CONTENT_TYPE
 
 router = APIRouter(tags=["Observability"])
 
@@ -22,5 +22,5 @@ async def prometheus_metrics():
     """
     return Response(
         content=get_metrics_text(),
-        media_type=get_metrics_content_type()
+        media_type=METRICS_CONTENT_TYPE
     )
@@ -4,7 +4,7 @@
 # Multi-tenancy enabled with tenant scoping
 
 from fastapi import APIRouter, Request, Query, HTTPException, status, Depends
-from typing import Optional, Dict, Any, List
+from typing import Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
@@ -31,7 +31,7 @@ class ReservationCreate(BaseModel):
     user_email: Optional[str] = None
     user_phone: Optional[str] = None
 
-@router.get("/", response_model=Dict[str, Any], dependencies=[Depends(require_scopes("reservations:read"))])
+@router.get("/", dependencies=[Depends(require_scopes("reservations:read"))])
 async def list_reservations(
     request: Request,
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by status: active, completed, cancelled, no_show"),
@@ -379,7 +379,7 @@ async def cancel_reservation(
             detail=f"Failed to cancel reservation: {str(e)}"
         )
 
-@router.get("/{reservation_id}", response_model=Dict[str, Any], dependencies=[Depends(require_scopes("reservations:read"))])
+@router.get("/{reservation_id}", dependencies=[Depends(require_scopes("reservations:read"))])
 async def get_reservation(
     request: Request,
     reservation_id: uuid.UUID,
@@ -3,7 +3,7 @@ Spaces Router - Full CRUD API for parking spaces
 Ported from V4 and adapted to V5 schema
 """
 from fastapi import APIRouter, HTTPException, Query, Request
-from typing import Optional, List, Dict, Any
+from typing import Optional, List
 import logging
 from uuid import UUID
 from datetime import datetime
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/api/v1/spaces", tags=["spaces"])
 logger = logging.getLogger(__name__)
 
 
-@router.get("/", response_model=Dict[str, Any])
+@router.get("/")
 async def list_spaces(
     request: Request,
     building: Optional[str] = Query(None, description="Filter by building"),
@@ -100,8 +100,8 @@ async def list_spaces(
                 "state": row["state"],
                 "sensor_eui": row["sensor_eui"],
                 "display_eui": row["display_eui"],
-                "gps_latitude": float(row["gps_latitude"]) if row["gps_latitude"] else None,
-                "gps_longitude": float(row["gps_longitude"]) if row["gps_longitude"] else None,
+                "gps_latitude": row["gps_latitude"],
+                "gps_longitude": row["gps_longitude"],
                 "metadata": row["metadata"],
                 "created_at": row["created_at"].isoformat() if row["created_at"] else None,
                 "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
@@ -116,7 +116,7 @@ async def list_spaces(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/sensor-list", response_model=Dict[str, Any])
+@router.get("/sensor-list")
 async def get_sensor_list(request: Request):
     """
     Get list of active sensor DevEUIs mapped to space IDs
@@ -157,7 +157,7 @@ async def get_sensor_list(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{space_id}/availability", response_model=Dict[str, Any])
+@router.get("/{space_id}/availability")
 async def get_space_availability(
     request: Request,
     space_id: UUID,
@@ -274,7 +274,7 @@ async def get_space_availability(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{space_id}", response_model=Dict[str, Any])
+@router.get("/{space_id}")
 async def get_space(
     request: Request,
     space_id: UUID
@@ -410,8 +410,8 @@ async def get_space(
             "building": space["building"],
             "floor": space["floor"],
             "zone": space["zone"],
-            "gps_latitude": float(space["gps_latitude"]) if space["gps_latitude"] else None,
-            "gps_longitude": float(space["gps_longitude"]) if space["gps_longitude"] else None,
+            "gps_latitude": space["gps_latitude"],
+            "gps_longitude": space["gps_longitude"],
             "sensor_eui": space["sensor_eui"],
             "display_eui": space["display_eui"],
             "sensor_details": sensor_details,
@@ -432,7 +432,7 @@ async def get_space(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/", response_model=Dict[str, Any])
+@router.post("/")
 async def create_space(
     request: Request,
     space_data: SpaceCreate
@@ -495,7 +495,7 @@ async def create_space(
             space_data.display_eui,
             sensor_device_id,
             display_device_id,
-            space_data.state.value,
+            space_data.state,
             space_data.metadata
         )
 
@@ -515,8 +515,8 @@ async def create_space(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.put("/{space_id}", response_model=Dict[str, Any])
-@router.patch("/{space_id}", response_model=Dict[str, Any])
+@router.put("/{space_id}")
+@router.patch("/{space_id}")
 async def update_space(
     request: Request,
     space_id: UUID,
@@ -573,7 +573,7 @@ async def update_space(
 
         if space_data.state is not None:
             updates.append(f"state = ${param_count}")
-            params.append(space_data.state.value)
+            params.append(space_data.state)
             param_count += 1
 
         if space_data.metadata is not None:
@@ -653,7 +653,7 @@ async def update_space(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.delete("/{space_id}", response_model=Dict[str, Any])
+@router.delete("/{space_id}")
 async def delete_space(
     request: Request,
     space_id: UUID,
@@ -728,7 +728,7 @@ async def delete_space(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/{space_id}/restore", response_model=Dict[str, Any])
+@router.post("/{space_id}/restore")
 async def restore_space(
     request: Request,
     space_id: UUID
@@ -775,7 +775,7 @@ async def restore_space(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{space_id}/availability", response_model=Dict[str, Any])
+@router.get("/{space_id}/availability")
 async def get_space_availability(
     request: Request,
     space_id: UUID,
@@ -3,7 +3,7 @@ Spaces Router - Tenant-scoped CRUD API for parking spaces
 Multi-tenancy enabled with RBAC
 """
 from fastapi import APIRouter, HTTPException, Query, Request, Depends
-from typing import Optional, List, Dict, Any
+from typing import Optional, List
 import logging
 import hashlib
 import json
@@ -23,7 +23,7 @@ router = APIRouter(prefix="/api/v1/spaces", tags=["spaces"])
 logger = logging.getLogger(__name__)
 
 
-@router.get("/", response_model=Dict[str, Any], dependencies=[Depends(require_scopes("spaces:read"))])
+@router.get("/", dependencies=[Depends(require_scopes("spaces:read"))])
 async def list_spaces(
     request: Request,
     building: Optional[str] = Query(None, description="Filter by building"),
@@ -156,8 +156,8 @@ async def list_spaces(
                 "tenant_id": str(row["tenant_id"]) if row["tenant_id"] else None,
                 "sensor_eui": row["sensor_eui"],
                 "display_eui": row["display_eui"],
-                "gps_latitude": float(row["gps_latitude"]) if row["gps_latitude"] else None,
-                "gps_longitude": float(row["gps_longitude"]) if row["gps_longitude"] else None,
+                "gps_latitude": row["gps_latitude"],
+                "gps_longitude": row["gps_longitude"],
                 "metadata": row["metadata"],
                 "created_at": row["created_at"].isoformat() if row["created_at"] else None,
                 "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
@@ -185,7 +185,7 @@ async def list_spaces(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{space_id}", response_model=Dict[str, Any], dependencies=[Depends(require_scopes("spaces:read"))])
+@router.get("/{space_id}", dependencies=[Depends(require_scopes("spaces:read"))])
 async def get_space(
     request: Request,
     space_id: UUID,
@@ -242,8 +242,8 @@ async def get_space(
             "tenant_id": str(row["tenant_id"]),
             "sensor_eui": row["sensor_eui"],
             "display_eui": row["display_eui"],
-            "gps_latitude": float(row["gps_latitude"]) if row["gps_latitude"] else None,
-            "gps_longitude": float(row["gps_longitude"]) if row["gps_longitude"] else None,
+            "gps_latitude": row["gps_latitude"],
+            "gps_longitude": row["gps_longitude"],
             "metadata": row["metadata"],
             "created_at": row["created_at"].isoformat() if row["created_at"] else None,
             "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None
@@ -258,7 +258,7 @@ async def get_space(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/", response_model=Dict[str, Any], status_code=201, dependencies=[Depends(require_scopes("spaces:write"))])
+@router.post("/", status_code=201, dependencies=[Depends(require_scopes("spaces:write"))])
 async def create_space(
     request: Request,
     space: SpaceCreate,
@@ -312,7 +312,7 @@ async def create_space(
             query,
             space.name, space.code, space.building, space.floor, space.zone,
             space.site_id, space.sensor_eui, space.display_eui,
-            space.state.value, space.gps_latitude, space.gps_longitude, space.metadata
+            space.state, space.gps_latitude, space.gps_longitude, space.metadata
         )
 
         result = {
@@ -327,8 +327,8 @@ async def create_space(
             "tenant_id": str(row["tenant_id"]),
             "sensor_eui": row["sensor_eui"],
             "display_eui": row["display_eui"],
-            "gps_latitude": float(row["gps_latitude"]) if row["gps_latitude"] else None,
-            "gps_longitude": float(row["gps_longitude"]) if row["gps_longitude"] else None,
+            "gps_latitude": row["gps_latitude"],
+            "gps_longitude": row["gps_longitude"],
             "metadata": row["metadata"],
             "created_at": row["created_at"].isoformat(),
             "updated_at": row["updated_at"].isoformat()
@@ -351,7 +351,7 @@ async def create_space(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.patch("/{space_id}", response_model=Dict[str, Any], dependencies=[Depends(require_scopes("spaces:write"))])
+@router.patch("/{space_id}", dependencies=[Depends(require_scopes("spaces:write"))])
 async def update_space(
     request: Request,
     space_id: UUID,
@@ -418,8 +418,8 @@ async def update_space(
             "tenant_id": str(row["tenant_id"]),
             "sensor_eui": row["sensor_eui"],
             "display_eui": row["display_eui"],
-            "gps_latitude": float(row["gps_latitude"]) if row["gps_latitude"] else None,
-            "gps_longitude": float(row["gps_longitude"]) if row["gps_longitude"] else None,
+            "gps_latitude": row["gps_latitude"],
+            "gps_longitude": row["gps_longitude"],
             "metadata": row["metadata"],
             "created_at": row["created_at"].isoformat(),
             "updated_at": row["updated_at"].isoformat()
@@ -483,7 +483,7 @@ async def delete_space(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/stats/summary", response_model=Dict[str, Any], dependencies=[Depends(require_scopes("spaces:read"))])
+@router.get("/stats/summary", dependencies=[Depends(require_scopes("spaces:read"))])
 async def get_space_stats(
     request: Request,
     site_id: Optional[UUID] = Query(None, description="Filter by site"),
@@ -538,7 +538,7 @@ async def get_space_stats(
 # Device Assignment Convenience Endpoints
 # ============================================================
 
-@router.post("/{space_id}/assign-sensor", response_model=Dict[str, Any], dependencies=[Depends(require_scopes("spaces:write"))])
+@router.post("/{space_id}/assign-sensor", dependencies=[Depends(require_scopes("spaces:write"))])
 async def assign_sensor_to_space(
     request: Request,
     space_id: UUID,
@@ -605,7 +605,7 @@ async def assign_sensor_to_space(
         logger.error(f"[Tenant:{tenant.tenant_id}] Error assigning sensor to space: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/{space_id}/assign-display", response_model=Dict[str, Any], dependencies=[Depends(require_scopes("spaces:write"))])
+@router.post("/{space_id}/assign-display", dependencies=[Depends(require_scopes("spaces:write"))])
 async def assign_display_to_space(
     request: Request,
     space_id: UUID,
@@ -672,7 +672,7 @@ async def assign_display_to_space(
         logger.error(f"[Tenant:{tenant.tenant_id}] Error assigning display to space: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.delete("/{space_id}/unassign-sensor", response_model=Dict[str, Any], dependencies=[Depends(require_scopes("spaces:write"))])
+@router.delete("/{space_id}/unassign-sensor", dependencies=[Depends(require_scopes("spaces:write"))])
 async def unassign_sensor_from_space(
     request: Request,
     space_id: UUID,
@@ -718,7 +718,7 @@ async def unassign_sensor_from_space(
         logger.error(f"[Tenant:{tenant.tenant_id}] Error unassigning sensor from space: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.delete("/{space_id}/unassign-display", response_model=Dict[str, Any], dependencies=[Depends(require_scopes("spaces:write"))])
+@router.delete("/{space_id}/unassign-display", dependencies=[Depends(require_scopes("spaces:write"))])
 async def unassign_display_from_space(
     request: Request,
     space_id: UUID,
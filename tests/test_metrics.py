@@ -0,0 +1,44 @@
+"""
+Tests for Prometheus metrics helpers
+
+Coverage:
+- Tenant label cardinality cap
+- Ring-buffered counter increments
+"""
+import pytest
+from prometheus_client import CollectorRegistry, Counter
+
+from src import metrics
+from src.metrics import MetricsRing, bounded_tenant_label
+
+
+class TestBoundedTenantLabel:
+    """Test tenant_id label cardinality guard"""
+
+    @pytest.mark.unit
+    def test_folds_new_tenants_past_cap(self, monkeypatch):
+        """Known tenants keep their label, new ones fall back to _other"""
+        monkeypatch.setattr(metrics, "MAX_TENANTS_TRACKED", 2)
+        monkeypatch.setattr(metrics, "_tracked_tenants", set())
+
+        assert bounded_tenant_label("tenant-a") == "tenant-a"
+        assert bounded_tenant_label("tenant-b") == "tenant-b"
+        assert bounded_tenant_label("tenant-c") == "_other"
+        assert bounded_tenant_label("tenant-a") == "tenant-a"
+
+
+class TestMetricsRing:
+    """Test MetricsRing counter batching"""
+
+    @pytest.mark.unit
+    def test_drain_aggregates_increments(self):
+        """Queued events are applied as one increment per label set"""
+        counter = Counter("ring_events", "test counter", ["tenant_id"], registry=CollectorRegistry())
+        ring = MetricsRing(maxlen=4)
+
+        for tenant in ["a", "a", "b", "a", "b"]:
+            ring.push(counter, tenant)
+        ring.drain()
+
+        assert counter.labels("a")._value.get() == 3
+        assert counter.labels("b")._value.get() == 2
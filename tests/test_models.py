@@ -0,0 +1,104 @@
+"""
+Tests for Pydantic request/response models
+
+Coverage:
+- Email validation (UserBase)
+- DevEUI validation (DevEUIMixin)
+- Scope frozensets (APIKey, TenantContext)
+"""
+import pytest
+from datetime import datetime
+from uuid import uuid4
+from pydantic import ValidationError
+
+from src.models import APIKey, SpaceUpdate, TenantContext, UserBase
+
+
+class TestEmailValidation:
+    """Test UserBase.validate_email"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("email", [
+        "user@example.com",
+        "first.last+tag@sub.example-domain.org",
+        "a_b%c@x.io",
+    ])
+    def test_accepts_valid_emails(self, email):
+        """Valid addresses are accepted unchanged (already lowercase)"""
+        assert UserBase(email=email, name="Test").email == email
+
+    @pytest.mark.unit
+    def test_lowercases_email(self):
+        """Mixed-case addresses are normalized to lowercase"""
+        assert UserBase(email="User@Example.COM", name="Test").email == "user@example.com"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("email", [
+        "",
+        "user",
+        "@example.com",
+        "user@",
+        "user@example",
+        "user@.com",
+        "user@example.c",
+        "user@example.c0m",
+        "user@@example.com",
+        "us er@example.com",
+        "usér@example.com",
+    ])
+    def test_rejects_invalid_emails(self, email):
+        """Malformed addresses raise a validation error"""
+        with pytest.raises(ValidationError):
+            UserBase(email=email, name="Test")
+
+
+class TestDevEUIValidation:
+    """Test DevEUIMixin.validate_deveui"""
+
+    @pytest.mark.unit
+    def test_normalizes_to_uppercase(self):
+        """Valid DevEUIs are returned uppercase"""
+        assert SpaceUpdate(sensor_eui="0011aabbccddeeff").sensor_eui == "0011AABBCCDDEEFF"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("deveui", ["0011AABBCCDDEEFF", "0011223344556677"])
+    def test_keeps_uppercase_and_numeric(self, deveui):
+        """Already-normalized DevEUIs are returned unchanged"""
+        assert SpaceUpdate(display_eui=deveui).display_eui == deveui
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("deveui", [
+        "0011aabbccddee",
+        "0011aabbccddeeff00",
+        "0011aabbccddeefg",
+        "00 11aabbccddeef",
+    ])
+    def test_rejects_invalid_deveui(self, deveui):
+        """Wrong length or non-hex characters raise a validation error"""
+        with pytest.raises(ValidationError):
+            SpaceUpdate(display_eui=deveui)
+
+
+class TestScopesSet:
+    """Test frozenset scope caches used for authorization"""
+
+    @pytest.mark.unit
+    def test_api_key_scopes_set(self):
+        """APIKey exposes its scopes as a frozenset"""
+        key = APIKey(
+            id=uuid4(), name="ingest", tenant_id=uuid4(),
+            scopes=["spaces:read", "webhook:ingest"], created_at=datetime.utcnow()
+        )
+        assert key.scopes_set == frozenset({"spaces:read", "webhook:ingest"})
+
+    @pytest.mark.unit
+    def test_tenant_context_scopes_set(self):
+        """API key contexts carry scopes; JWT contexts get an empty set"""
+        api_key_ctx = TenantContext(
+            tenant_id=uuid4(), tenant_name="Acme", tenant_slug="acme",
+            api_key_scopes=["spaces:write"], source="api_key"
+        )
+        jwt_ctx = TenantContext(tenant_id=uuid4(), tenant_name="Acme", tenant_slug="acme", source="jwt")
+
+        assert "spaces:write" in api_key_ctx.scopes_set
+        assert jwt_ctx.scopes_set == frozenset()
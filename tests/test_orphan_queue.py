@@ -0,0 +1,53 @@
+"""
+Tests for batched orphan device tracking
+
+Coverage:
+- Repeated uplinks collapse into one row per device
+- Batches are split at max_batch_size
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from src.orphan_queue import OrphanUplinkQueue
+
+
+@pytest.fixture
+def db():
+    """Pool stub recording upsert batches"""
+    pool = AsyncMock()
+    pool.fetch.return_value = []
+    return pool
+
+
+class TestOrphanUplinkQueue:
+    """Test OrphanUplinkQueue flushing"""
+
+    @pytest.mark.unit
+    async def test_flush_collapses_uplinks_per_device(self, db):
+        """Latest uplink wins for last_* columns, counts accumulate"""
+        queue = OrphanUplinkQueue(db)
+        queue.put("AAAAAAAAAAAAAAAA", b"\x01", -80, 5.0)
+        queue.put("BBBBBBBBBBBBBBBB", None, -90, 1.5)
+        queue.put("AAAAAAAAAAAAAAAA", b"\x02", -70, 7.5)
+
+        await queue.flush()
+
+        db.fetch.assert_awaited_once()
+        _, dev_euis, payloads, rssis, snrs, counts = db.fetch.await_args.args
+        assert dev_euis == ["AAAAAAAAAAAAAAAA", "BBBBBBBBBBBBBBBB"]
+        assert payloads == [b"\x02", None]
+        assert rssis == [-70, -90]
+        assert snrs == [7.5, 1.5]
+        assert counts == [2, 1]
+
+    @pytest.mark.unit
+    async def test_flush_splits_large_batches(self, db):
+        """More than max_batch_size uplinks are written in several statements"""
+        queue = OrphanUplinkQueue(db, max_batch_size=2)
+        for i in range(5):
+            queue.put(f"{i:016X}")
+
+        await queue.flush()
+
+        assert db.fetch.await_count == 3
+        assert queue.queue.empty()
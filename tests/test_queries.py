@@ -0,0 +1,84 @@
+"""
+Tests for eager-loading query helpers
+
+Coverage:
+- Site list caching (TTL, single-flight, invalidation)
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from src import queries
+from src.queries import get_sites_with_stats, invalidate_sites_cache
+
+
+@pytest.fixture
+def db_pool():
+    """Pool stub returning no sites"""
+    pool = AsyncMock()
+    pool.fetch.return_value = []
+    return pool
+
+
+@pytest.fixture(autouse=True)
+def clear_sites_cache():
+    """Isolate the module-level cache between tests"""
+    invalidate_sites_cache()
+    yield
+    invalidate_sites_cache()
+
+
+class TestSitesCache:
+    """Test get_sites_with_stats caching"""
+
+    @pytest.mark.unit
+    async def test_concurrent_misses_share_one_fetch(self, db_pool):
+        """Concurrent callers trigger a single sites + stats query pair"""
+        tenant_id = uuid4()
+
+        await asyncio.gather(*(get_sites_with_stats(db_pool, tenant_id) for _ in range(5)))
+        await get_sites_with_stats(db_pool, tenant_id)
+
+        assert db_pool.fetch.await_count == 2
+
+    @pytest.mark.unit
+    async def test_invalidation_forces_refetch(self, db_pool):
+        """Invalidating a tenant drops its cached listing"""
+        tenant_id = uuid4()
+
+        await get_sites_with_stats(db_pool, tenant_id)
+        invalidate_sites_cache(tenant_id)
+        await get_sites_with_stats(db_pool, tenant_id)
+
+        assert db_pool.fetch.await_count == 4
+
+    @pytest.mark.unit
+    async def test_cache_keyed_by_include_inactive(self, db_pool):
+        """Active-only and all-sites listings are cached separately"""
+        tenant_id = uuid4()
+
+        await get_sites_with_stats(db_pool, tenant_id)
+        await get_sites_with_stats(db_pool, tenant_id, include_inactive=True)
+
+        assert len(queries._sites_cache) == 2
+
+    @pytest.mark.unit
+    async def test_invalidation_during_fetch_skips_store(self, db_pool):
+        """A fetch overtaken by an invalidation does not repopulate the cache"""
+        tenant_id = uuid4()
+        release = asyncio.Event()
+
+        async def slow_fetch(*args):
+            await release.wait()
+            return []
+
+        db_pool.fetch.side_effect = slow_fetch
+
+        pending = asyncio.create_task(get_sites_with_stats(db_pool, tenant_id))
+        await asyncio.sleep(0)
+        invalidate_sites_cache()
+        release.set()
+        await pending
+
+        assert queries._sites_cache == {}
@@ -0,0 +1,117 @@
+"""
+Tests for tenant-aware rate limiting
+
+Coverage:
+- Sliding-window script arguments (fixed-bucket counter keys)
+- Local deny-verdict caching
+- Script call batching
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.rate_limiter import RateLimiter, ScriptBatcher, _bucket_keys
+
+
+@pytest.fixture
+def limiter():
+    """RateLimiter with the batched Lua script replaced by a mock"""
+    rate_limiter = RateLimiter(MagicMock())
+    rate_limiter.enabled = True
+    rate_limiter._batcher = MagicMock(submit=AsyncMock())
+    return rate_limiter
+
+
+class TestRateLimiter:
+    """Test RateLimiter.check_limit"""
+
+    @pytest.mark.unit
+    async def test_checks_all_windows_in_one_call(self, limiter):
+        """Minute and hour windows go to Redis in a single script call"""
+        limiter._batcher.submit.return_value = [1, 0, 99, 999]
+
+        allowed, retry_after, limit_info = await limiter.check_limit("tenant-a")
+
+        assert allowed is True
+        assert retry_after is None
+        assert limit_info["minute"]["remaining"] == 99
+        assert limit_info["hour"]["remaining"] == 999
+        limiter._batcher.submit.assert_awaited_once()
+        keys = limiter._batcher.submit.await_args.kwargs["keys"]
+        assert len(keys) == 4
+        assert [key.rsplit(":", 1)[0] for key in keys] == [
+            "rate_limit:tenant-a:minute", "rate_limit:tenant-a:minute",
+            "rate_limit:tenant-a:hour", "rate_limit:tenant-a:hour",
+        ]
+
+    @pytest.mark.unit
+    def test_bucket_keys_are_consecutive(self):
+        """Current and previous counters are adjacent fixed buckets"""
+        current, previous = _bucket_keys("tenant-a", "minute", 60, 125.0)
+
+        assert current == "rate_limit:tenant-a:minute:2"
+        assert previous == "rate_limit:tenant-a:minute:1"
+
+    @pytest.mark.unit
+    async def test_denial_is_cached_locally(self, limiter):
+        """Requests inside a known-full window are rejected without Redis"""
+        limiter._batcher.submit.return_value = [0, 30, 1, 100]
+
+        first = await limiter.check_limit("tenant-a")
+        second = await limiter.check_limit("tenant-a")
+
+        assert first == (False, 30, {})
+        assert second[0] is False
+        assert limiter._batcher.submit.await_count == 1
+
+    @pytest.mark.unit
+    async def test_denial_is_scoped_per_tenant_and_operation(self, limiter):
+        """A throttled tenant does not affect other tenants or operation types"""
+        limiter._batcher.submit.return_value = [0, 30, 1, 100]
+        await limiter.check_limit("tenant-a")
+
+        limiter._batcher.submit.return_value = [1, 0, 9, 99]
+        assert (await limiter.check_limit("tenant-b"))[0] is True
+        assert (await limiter.check_limit("tenant-a", operation_type="write"))[0] is True
+
+
+class TestScriptBatcher:
+    """Test ScriptBatcher pipelining"""
+
+    @pytest.mark.unit
+    async def test_concurrent_calls_share_one_pipeline(self):
+        """Calls made in the same tick go out in a single pipeline execute"""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[["a"], ["b"], ["c"]])
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value = pipe
+        script = AsyncMock()
+
+        batcher = ScriptBatcher(redis_client, script)
+        replies = await asyncio.gather(
+            batcher.submit(keys=["k1"], args=[1]),
+            batcher.submit(keys=["k2"], args=[2]),
+            batcher.submit(keys=["k3"], args=[3]),
+        )
+
+        assert replies == [["a"], ["b"], ["c"]]
+        assert script.await_count == 3
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_errors_reach_their_caller(self):
+        """A failed script call raises only in the request that made it"""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[["ok"], ValueError("boom")])
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value = pipe
+
+        batcher = ScriptBatcher(redis_client, AsyncMock())
+        results = await asyncio.gather(
+            batcher.submit(keys=["k1"], args=[]),
+            batcher.submit(keys=["k2"], args=[]),
+            return_exceptions=True
+        )
+
+        assert results[0] == ["ok"]
+        assert isinstance(results[1], ValueError)
@@ -0,0 +1,122 @@
+"""
+Tests for refresh token rotation
+
+Coverage:
+- Single-statement validate + rotate
+- Reuse detection outcomes
+- Token hashing
+- Batched expired-token cleanup
+"""
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from src.refresh_token_service import RefreshTokenService
+
+
+@pytest.fixture
+def db():
+    """Pool stub for the rotation statement"""
+    pool = AsyncMock()
+    pool.execute.return_value = "UPDATE 2"
+    return pool
+
+
+def token_row(status, revoked_minutes_ago=0.0):
+    """Row shape returned by the validate + rotate statement"""
+    return {
+        "id": 1,
+        "user_id": uuid4(),
+        "device_fingerprint": "device-a",
+        "revoked_minutes_ago": revoked_minutes_ago,
+        "status": status,
+        "new_token_id": 2 if status == "ok" else None,
+    }
+
+
+class TestValidateAndRotate:
+    """Test RefreshTokenService.validate_and_rotate"""
+
+    @pytest.mark.unit
+    async def test_valid_token_rotates_in_one_round_trip(self, db):
+        """A valid token yields its user and a fresh token from one query"""
+        row = token_row("ok")
+        db.fetchrow.return_value = row
+
+        user_id, new_token = await RefreshTokenService().validate_and_rotate(db, "old-token")
+
+        assert user_id == row["user_id"]
+        assert new_token and new_token != "old-token"
+        db.fetchrow.assert_awaited_once()
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_unknown_token_is_rejected(self, db):
+        """No matching row means no rotation"""
+        db.fetchrow.return_value = None
+
+        assert await RefreshTokenService().validate_and_rotate(db, "nope") == (None, None)
+
+    @pytest.mark.unit
+    async def test_reuse_within_grace_period_does_not_revoke_family(self, db):
+        """A recently revoked token (race between tabs) is only rejected"""
+        db.fetchrow.return_value = token_row("grace", 0.5)
+
+        assert await RefreshTokenService().validate_and_rotate(db, "old-token") == (None, None)
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_reuse_after_grace_period_revokes_family(self, db):
+        """Replaying a long-revoked token revokes every token of that device"""
+        db.fetchrow.return_value = token_row("breach", 60.0)
+
+        assert await RefreshTokenService().validate_and_rotate(db, "old-token") == (None, None)
+        db.execute.assert_awaited_once()
+
+
+class TestHashToken:
+    """Test RefreshTokenService.hash_token"""
+
+    @pytest.mark.unit
+    def test_hash_is_raw_sha256(self):
+        """Hashes are the raw 32-byte digest stored in the BYTEA column"""
+        token, _ = RefreshTokenService.generate_token()
+
+        token_hash = RefreshTokenService.hash_token(token)
+
+        assert isinstance(token_hash, bytes)
+        assert len(token_hash) == 32
+        assert token_hash == RefreshTokenService.hash_token(token)
+
+    @pytest.mark.unit
+    def test_generated_bytes_match_token(self):
+        """Tokens are 43 URL-safe chars and come with their ASCII bytes"""
+        token, token_bytes = RefreshTokenService.generate_token()
+
+        assert len(token) == 43
+        assert token_bytes == token.encode("ascii")
+        assert "=" not in token
+
+
+class TestCleanupExpiredTokens:
+    """Test RefreshTokenService.cleanup_expired_tokens"""
+
+    @pytest.mark.unit
+    async def test_deletes_in_batches_until_short_batch(self, db):
+        """Full batches repeat; a short batch means nothing is left"""
+        db.fetchrow.return_value = {"created": 0, "dropped": 0}
+        db.execute.side_effect = ["DELETE 2", "DELETE 2", "DELETE 1"]
+
+        count = await RefreshTokenService().cleanup_expired_tokens(db, batch_size=2)
+
+        assert count == 5
+        assert db.execute.await_count == 3
+
+    @pytest.mark.unit
+    async def test_maintains_partitions_first(self, db):
+        """Expired monthly partitions are dropped before any row DELETE"""
+        db.fetchrow.return_value = {"created": 1, "dropped": 1}
+        db.execute.return_value = "DELETE 0"
+
+        assert await RefreshTokenService().cleanup_expired_tokens(db) == 0
+        assert "maintain_refresh_token_partitions" in db.fetchrow.await_args.args[0]